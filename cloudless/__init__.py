@@ -15,11 +15,13 @@ automatically cross cloud.
 The main entry point to this module is through the `cloudless.Client` object, and all calls that
 interact with a backing cloud provider go through this object.
 """
+import io
 import logging
 import os
 import lazy_import
 from cloudless.util.exceptions import DisallowedOperationException, ProfileNotFoundException
 import cloudless.profile
+from cloudless.util import graph_export
 from cloudless.providers import get_provider
 
 # Lazily import these so the import and command line is fast unless we are actually creating a
@@ -29,6 +31,7 @@ network = lazy_import.lazy_module("cloudless.network")
 service = lazy_import.lazy_module("cloudless.service")
 paths = lazy_import.lazy_module("cloudless.paths")
 image = lazy_import.lazy_module("cloudless.image")
+snapshots = lazy_import.lazy_module("cloudless.types.snapshot")
 
 
 def set_level(level):
@@ -115,102 +118,57 @@ class Client:
         self.paths = paths.PathsClient(self.provider, self.credentials)
         self.image = image.ImageClient(self.provider, self.credentials)
 
-    # pylint: disable=too-many-locals
-    def graph(self):
+    def snapshot(self):
+        """
+        Return a `cloudless.types.snapshot.Snapshot` of all networks, services and paths on the
+        current provider.
+
+        Each kind of resource is listed once, and the snapshot can be passed to the service, paths
+        and graph calls so they use it instead of fetching everything again.
+
+        Example:
+
+            snapshot = client.snapshot()
+            client.service.list(snapshot=snapshot)
+            client.paths.list(snapshot=snapshot)
+            client.graph(snapshot=snapshot)
+
+        """
+        networks_info = self.network.list()
+        services_info = self.service.list()
+        paths_info = self.paths.list(services=services_info)
+        return snapshots.Snapshot.create(self.provider, networks_info, services_info, paths_info)
+
+    def graph(self, out=None, output_format="dot", snapshot=None):
         """
         Return a [DOT](https://graphviz.gitlab.io/_pages/doc/info/lang.html) formatted graph string
         containing all resources on the current provider.
 
         This string can be passed to a program like graphviz to generate a graph visualization.
-        """
 
-        def start_graph():
-            return "digraph services {\n\n"
-
-        def end_graph(graph_string):
-            graph_string += "\n}\n"
-            return graph_string
-
-        def start_cluster(graph_string, cluster_id, cluster_name):
-            graph_string += "subgraph cluster_%s {\n" % cluster_id
-            graph_string += "    label = \"%s\";\n" % cluster_name
-            return graph_string
-
-        def end_cluster(graph_string):
-            graph_string += "\n}\n"
-            return graph_string
-
-        def add_path(graph_string, from_node, to_node, protocol, port):
-            if not from_node.name:
-                cidr_blocks = [subnetwork.cidr_block for subnetwork in from_node.subnetworks]
-                from_name = ",".join(cidr_blocks)
-                from_network_name = "external"
-            else:
-                from_name = from_node.name
-                from_network_name = from_node.network.name
-            path_template = "\"%s (%s)\" -> \"%s (%s)\" [ label=\"(%s:%s)\" ];\n"
-            graph_string += path_template % (from_name, from_network_name, to_node.name,
-                                             to_node.network.name, protocol, port)
-            return graph_string
-
-        def add_node(graph_string, node_name, network_name):
-            graph_string += "    \"%s (%s)\";\n" % (node_name, network_name)
-            return graph_string
-
-        def group_paths_by_network(paths_info):
-            net_to_path = {}
-            for path in paths_info:
-                if path.network.name not in net_to_path:
-                    net_to_path[path.network.name] = []
-                net_to_path[path.network.name].append(path)
-            return net_to_path
-
-        def group_services_by_network(services_info):
-            net_to_service = {}
-            for service_info in services_info:
-                if service_info.network.name not in net_to_service:
-                    net_to_service[service_info.network.name] = []
-                net_to_service[service_info.network.name].append(service_info)
-            return net_to_service
-
-        # First group paths and services by network
-        paths_info = self.paths.list()
-        net_to_path = group_paths_by_network(paths_info)
-        services_info = self.service.list()
-        net_to_service = group_services_by_network(services_info)
-        networks_info = self.network.list()
+        If "out" is a file like object, the graph is written to it as it's generated and nothing is
+        returned.  Set "output_format" to "json" to get JSON adjacency lists instead of DOT.  If
+        "snapshot" is set, the graph is built from it rather than from the provider.
 
-        graph_string = start_graph()
-        cluster_id = 0
-        for network_info in networks_info:
-
-            # Skip networks with no name for now
-            if not network_info.name:
-                continue
-
-            # Each network is a "cluster" in graphviz terms
-            graph_string = start_cluster(graph_string, cluster_id, network_info.name)
-            cluster_id += 1
-
-            # If the network is empty just make a placeholder node
-            if network_info.name not in net_to_service and network_info.name not in net_to_path:
-                graph_string = add_node(graph_string, "Empty Network", network_info.name)
-                graph_string = end_cluster(graph_string)
-                continue
-
-            # Otherwise, add all the services and path in this network
-            if network_info.name in net_to_service:
-                for service_info in net_to_service[network_info.name]:
-                    graph_string = add_node(graph_string, service_info.name,
-                                            service_info.network.name)
-            graph_string = end_cluster(graph_string)
-
-            # We do all paths outside the cluster so that public CIDRs will show up outside the
-            # networks.
-            if network_info.name in net_to_path:
-                for path_info in net_to_path[network_info.name]:
-                    graph_string = add_path(graph_string, path_info.source, path_info.destination,
-                                            path_info.protocol, path_info.port)
-
-        graph_string = end_graph(graph_string)
-        return graph_string
+        Networks and paths are read from the provider iterators as the graph is built.  The
+        services are listed up front, since paths are matched against them, and each network's
+        services and paths are grouped in memory so they can be written together.
+        """
+        if output_format not in graph_export.FORMATS:
+            raise DisallowedOperationException(
+                "Unsupported graph format: %s, must be one of %s" % (
+                    output_format, sorted(graph_export.FORMATS)))
+
+        if snapshot is None:
+            services = self.service.list()
+            inventory = (self.network.iterate(), services, self.paths.iterate(services=services))
+        else:
+            inventory = (snapshot.networks, snapshot.services, snapshot.paths)
+
+        write_graph = graph_export.FORMATS[output_format]
+        if out is not None:
+            write_graph(out, *inventory)
+            return None
+        graph_out = io.StringIO()
+        write_graph(graph_out, *inventory)
+        return graph_out.getvalue()
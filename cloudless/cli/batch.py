@@ -0,0 +1,183 @@
+"""
+Cloudless batch command line interface.
+
+Runs a file of `cldls` commands in one process.  The commands share clients and a cache of what
+they've looked up, and commands that don't depend on each other run concurrently.
+
+Each line of the file is one command, written the same way as on the command line but without the
+leading "cldls", for example:
+
+    # Let the load balancer reach the web service
+    service create dev web blueprint.yml
+    paths allow_service dev web web-lb 80
+
+Commands that change a network run in order with respect to every earlier command in that network,
+while commands that only read from the same network, or work on different networks, run at the same
+time.  Commands that can't be tied to a particular network, like "list" commands, wait for
+everything before them and block everything after them.
+"""
+import concurrent.futures
+import shlex
+import sys
+import threading
+import traceback
+import click
+import cloudless
+from cloudless.cli.client_cache import CachedClient, ResultCache
+
+DEFAULT_JOBS = 4
+
+# Commands that can't run inside a batch.
+DISALLOWED_COMMANDS = ["batch", "daemon", "init", "repl"]
+
+# Commands that only read, and so can run alongside other reads in the same network.  Anything that
+# changes a network has to run on its own, since creating or destroying services in the same network
+# shares things like subnet allocation and security group rules.
+READ_COMMANDS = {
+    "network": ["get"],
+    "service": ["get"],
+    "paths": ["service_has_access", "network_block_has_access", "is_internet_accessible"],
+}
+WRITE_COMMANDS = {
+    "network": ["create", "destroy"],
+    "service": ["create", "destroy"],
+    "paths": ["allow_service", "allow_network_block", "revoke_service", "revoke_network_block"],
+}
+
+
+def parse_batch(lines):
+    """
+    Parses the lines of a batch file into a list of (line number, arguments) tuples, skipping blank
+    lines and comments.
+    """
+    commands = []
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as exc:
+            raise click.UsageError("Line %s: %s" % (line_number, exc))
+        if not args:
+            continue
+        if args[0] == "cldls":
+            args = args[1:]
+        if not args or args[0].startswith("-"):
+            raise click.UsageError("Line %s: expected a command, not \"%s\"" % (
+                line_number, line.strip()))
+        if args[0] in DISALLOWED_COMMANDS:
+            raise click.UsageError("Line %s: \"%s\" can't be run in a batch" % (
+                line_number, args[0]))
+        commands.append((line_number, args))
+    return commands
+
+
+def get_touched(args):
+    """
+    Returns what the command "args" touches, as a tuple of the network it works on and whether it
+    changes anything.  Returns None if it can't tell, in which case the command has to run on its
+    own.
+    """
+    # Only look at arguments before the first option, since an option's value can't be told apart
+    # from an argument without the command's definition.
+    positional = []
+    for arg in args:
+        if arg.startswith("-"):
+            break
+        positional.append(arg)
+    if len(positional) < 3:
+        return None
+    group, command, network = positional[0], positional[1], positional[2]
+    if command in READ_COMMANDS.get(group, []):
+        return network, False
+    if command in WRITE_COMMANDS.get(group, []):
+        return network, True
+    return None
+
+
+def _conflicts(first, second):
+    if first is None or second is None:
+        return True
+    return first[0] == second[0] and (first[1] or second[1])
+
+
+def get_dependencies(commands):
+    """
+    Returns, for each of "commands", the indexes of the earlier commands it has to wait for.
+    """
+    touched = [get_touched(args) for _, args in commands]
+    return [[earlier for earlier in range(index) if _conflicts(touched[earlier], touched[index])]
+            for index in range(len(commands))]
+
+
+def run_batch(cldls, profile, commands, jobs):
+    """
+    Runs "commands" with "jobs" threads, and returns the line numbers of the ones that failed.
+    Commands that depend on a failed command are skipped and count as failed.
+    """
+    cache = ResultCache(ttl=float("inf"))
+    clients = threading.local()
+
+    def get_client(provider, credentials):
+        # Each thread gets its own client, since provider sessions aren't safe to share between
+        # threads, but they all share the same cache.
+        if not hasattr(clients, "client"):
+            clients.client = CachedClient(
+                cloudless.Client(provider=provider, credentials=credentials), cache)
+        return clients.client
+
+    dependencies = get_dependencies(commands)
+    futures = []
+
+    def run_command(index):
+        line_number, args = commands[index]
+        if not all(futures[dependency].result() for dependency in dependencies[index]):
+            click.echo("Line %s: skipped since an earlier command failed" % line_number,
+                       err=True)
+            return False
+        try:
+            exit_code = cldls.main(["--profile", profile] + args, prog_name="cldls",
+                                   standalone_mode=False, obj={"CLIENT_CACHE": get_client})
+        except SystemExit as exc:
+            exit_code = exc.code
+        except click.ClickException as exc:
+            exc.show()
+            exit_code = exc.exit_code
+        # pylint: disable=broad-except
+        except Exception:
+            click.echo("Line %s: %s" % (line_number, traceback.format_exc()), err=True)
+            exit_code = 1
+        if exit_code:
+            click.echo("Line %s: failed: %s" % (line_number, " ".join(args)), err=True)
+            return False
+        return True
+
+    # Every command only waits on commands submitted before it, which a worker has already
+    # picked up, so this can't deadlock no matter how many jobs there are.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        for index in range(len(commands)):
+            futures.append(executor.submit(run_command, index))
+    return [commands[index][0] for index, future in enumerate(futures) if not future.result()]
+
+
+def add_batch_command(cldls):
+    """
+    Add the command to run a batch of commands.
+    """
+    @cldls.command(name="batch")
+    @click.argument('batch_file', type=click.File('r'))
+    @click.option('--jobs', '-j', type=click.IntRange(min=1), default=DEFAULT_JOBS,
+                  show_default=True, help="Number of commands to run at once.")
+    @click.pass_context
+    # pylint:disable=unused-variable
+    def batch(ctx, batch_file, jobs):
+        """
+        Run a file of commands in one process.
+
+        Each line of BATCH_FILE is a cldls command without the leading "cldls".  Use "-" to read
+        from standard input.  Commands that work on different networks, or only read, run at the
+        same time, so their output can be interleaved.
+        """
+        commands = parse_batch(batch_file)
+        failed = run_batch(ctx.find_root().command, ctx.obj['PROFILE'], commands, jobs)
+        click.echo("Ran %s commands, %s failed" % (len(commands), len(failed)), err=True)
+        if failed:
+            sys.exit(1)
@@ -2,27 +2,46 @@
 Cloudless command line interface definitions.
 """
 import logging
+from collections import OrderedDict
 import click
-from click_repl import register_repl
-from cloudless.cli.init import add_init_group
-from cloudless.cli.network import add_network_group
-from cloudless.cli.service import add_service_group
-from cloudless.cli.service_test import add_service_test_group
-from cloudless.cli.paths import add_paths_group
-from cloudless.cli.image import add_image_group
-from cloudless.cli.image_build import add_image_build_group
-from cloudless.cli.utils import NaturalOrderGroup
+from cloudless.cli.utils import LazyGroup
 import cloudless
 import cloudless.profile
 
 cloudless.set_level(logging.INFO)
 cloudless.set_global_level(logging.WARN)
 
+# The modules for these are only imported when the subcommand is used, since some of them, like the
+# testing framework and the interactive shell, take a long time to import.  The short help here is
+# what's shown in "cldls --help", and should match the docstring of each group.
+SUBCOMMANDS = OrderedDict([
+    ("init", ("cloudless.cli.init", "add_init_group",
+              "Initialize credentials for the command line.")),
+    ("network", ("cloudless.cli.network", "add_network_group",
+                 "Create, list, get, destroy networks.")),
+    ("service", ("cloudless.cli.service", "add_service_group",
+                 "Create, list, get, destroy services.")),
+    ("service-test", ("cloudless.cli.service_test", "add_service_test_group",
+                      "Service testing framework.")),
+    ("paths", ("cloudless.cli.paths", "add_paths_group",
+               "Control access to and from services.")),
+    ("image", ("cloudless.cli.image", "add_image_group",
+               "Tools to build and test instance images.")),
+    ("image-build", ("cloudless.cli.image_build", "add_image_build_group",
+                     "Tools to build and test instance images.")),
+    ("repl", ("cloudless.cli.repl", "add_repl_command",
+              "Start an interactive shell.")),
+    ("daemon", ("cloudless.cli.daemon", "add_daemon_group",
+                "Run a local server that keeps clients warm.")),
+    ("batch", ("cloudless.cli.batch", "add_batch_command",
+               "Run a file of commands in one process.")),
+])
+
 def get_cldls():
     """
     Does all the work to initialize the cldls command line and subcommands.
     """
-    @click.group(name='cldls', cls=NaturalOrderGroup)
+    @click.group(name='cldls', cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
     @click.option('--debug/--no-debug', default=False)
     @click.option('--profile', help="The profile to use.")
     @click.pass_context
@@ -41,12 +60,4 @@ def get_cldls():
             cloudless.set_level(logging.DEBUG)
         ctx.obj['PROFILE'] = cloudless.profile.select_profile(profile)
 
-    add_init_group(cldls)
-    add_network_group(cldls)
-    add_service_group(cldls)
-    add_service_test_group(cldls)
-    add_paths_group(cldls)
-    add_image_group(cldls)
-    add_image_build_group(cldls)
-    register_repl(cldls)
     return cldls
@@ -0,0 +1,102 @@
+"""
+Cached clients for the command line.
+
+Wrappers around `cloudless.Client` that cache the results of calls that only read, for when one
+process runs many commands, like the daemon or a batch.  Any call that changes something clears the
+cache.
+"""
+import threading
+import time
+
+# Calls on the network, service and paths clients that only read, and so can be cached.
+READ_METHODS = ["list", "list_for", "get", "get_instances", "has_access", "internet_accessible",
+                "node_types"]
+
+# Calls that return an iterator, which can't be cached, mapped to the read call that returns the
+# same items as a list.
+ITERATE_METHODS = {"iterate": "list"}
+
+
+class ResultCache:
+    """
+    Results of read calls, kept for "ttl" seconds.  Can be shared by clients on different threads.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.results = {}
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def call(self, key, function, args, kwargs):
+        """
+        Returns the cached result for "key" if it hasn't expired, otherwise calls "function".
+        """
+        with self.lock:
+            entry = self.results.get(key)
+            generation = self.generation
+        if entry and entry[0] > time.time():
+            return entry[1]
+        result = function(*args, **kwargs)
+        with self.lock:
+            # Don't save the result if something changed while we were reading, since it might
+            # be from before the change.
+            if self.generation == generation:
+                self.results[key] = (time.time() + self.ttl, result)
+        return result
+
+    def clear(self):
+        """
+        Clears all cached results.
+        """
+        with self.lock:
+            self.generation += 1
+            self.results = {}
+
+
+class CachedComponent:
+    """
+    Wraps one of the components of a client, like `client.service`, caching the results of calls
+    that only read.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, name, component, cache):
+        self.name = name
+        self.component = component
+        self.cache = cache
+
+    def __getattr__(self, attribute_name):
+        attribute = getattr(self.component, attribute_name)
+        if not callable(attribute):
+            return attribute
+        if attribute_name in ITERATE_METHODS:
+            list_call = getattr(self, ITERATE_METHODS[attribute_name])
+            return lambda *args, **kwargs: iter(list_call(*args, **kwargs))
+        if attribute_name in READ_METHODS:
+            def cached_call(*args, **kwargs):
+                key = (self.name, attribute_name, repr(args), repr(sorted(kwargs.items())))
+                return self.cache.call(key, attribute, args, kwargs)
+            return cached_call
+
+        def changing_call(*args, **kwargs):
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self.cache.clear()
+        return changing_call
+
+
+class CachedClient:
+    """
+    Wraps a `cloudless.Client`, caching the results of list and get calls in "cache", which is a
+    `ResultCache`.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+        self.network = CachedComponent("network", client.network, cache)
+        self.service = CachedComponent("service", client.service, cache)
+        self.paths = CachedComponent("paths", client.paths, cache)
+
+    def __getattr__(self, attribute_name):
+        return getattr(self.client, attribute_name)
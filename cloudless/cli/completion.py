@@ -0,0 +1,189 @@
+"""
+Cloudless command line completion.
+
+Shell completion for network and service names, backed by a small index file per profile in
+"~/.cloudless/completion".  Completing a name only reads that file, so it's fast no matter how many
+services there are.
+
+The index is written whenever a list command runs, since the names are already at hand, and is
+refreshed by a background process after a create or destroy, or when it's older than
+`INDEX_MAX_AGE` seconds.  Run `python -m cloudless.cli.completion <profile>` to refresh it by hand.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import cloudless.profile
+
+INDEX_DIR_ENVIRONMENT_VARIABLE = "CLOUDLESS_COMPLETION_DIR"
+
+# In seconds.
+INDEX_MAX_AGE = 300
+REFRESH_TIMEOUT = 120
+
+# The mock provider only keeps state in memory, so another process can't see its resources.
+UNINDEXED_PROVIDERS = ["mock-aws"]
+
+
+def get_index_dir():
+    """
+    Returns the directory holding the completion indexes.
+    """
+    return os.environ.get(INDEX_DIR_ENVIRONMENT_VARIABLE,
+                          os.path.expanduser("~/.cloudless/completion"))
+
+
+def get_index_path(profile):
+    """
+    Returns the path of the completion index for "profile".
+    """
+    return os.path.join(get_index_dir(), "%s.json" % profile)
+
+
+def load_index(profile):
+    """
+    Returns the completion index for "profile", or an empty index if there isn't one.
+    """
+    try:
+        with open(get_index_path(profile)) as index_file:
+            return json.load(index_file)
+    except (OSError, ValueError):
+        return {"networks": [], "services": {}}
+
+
+def save_index(profile, networks=None, services=None):
+    """
+    Updates the completion index for "profile" with the given network and service names.
+    "networks" is a list of names, and "services" is a map from network name to a list of service
+    names.  Anything not given is left as it was.
+    """
+    index = load_index(profile)
+    if networks is not None:
+        index["networks"] = sorted(networks)
+    if services is not None:
+        index["services"] = {network: sorted(names) for network, names in services.items()}
+    index_dir = get_index_dir()
+    if not os.path.exists(index_dir):
+        os.makedirs(index_dir)
+    # Write to a temporary file and rename it, so completion never reads a partial index.
+    index_fd, temporary_path = tempfile.mkstemp(dir=index_dir, suffix=".tmp")
+    with os.fdopen(index_fd, "w") as index_file:
+        json.dump(index, index_file)
+    os.replace(temporary_path, get_index_path(profile))
+
+
+def _should_index(ctx):
+    return ctx.obj.get('PROVIDER') not in UNINDEXED_PROVIDERS
+
+
+def record_networks(ctx, network_names):
+    """
+    Saves "network_names", the names from listing every network, to the completion index.
+    """
+    if _should_index(ctx):
+        save_index(ctx.obj['PROFILE'], networks=[name for name in network_names if name])
+
+
+def record_services(ctx, service_names):
+    """
+    Saves "service_names", the (network name, service name) pairs from listing every service, to
+    the completion index.
+    """
+    if _should_index(ctx):
+        services_by_network = {}
+        for network_name, service_name in service_names:
+            services_by_network.setdefault(network_name, []).append(service_name)
+        save_index(ctx.obj['PROFILE'], services=services_by_network)
+
+
+def refresh_index(profile):
+    """
+    Starts a background process to rebuild the completion index for "profile", unless one is
+    already running.
+    """
+    refresh_marker = get_index_path(profile) + ".refreshing"
+    try:
+        if time.time() - os.path.getmtime(refresh_marker) < REFRESH_TIMEOUT:
+            return
+    except OSError:
+        pass
+    index_dir = get_index_dir()
+    if not os.path.exists(index_dir):
+        os.makedirs(index_dir)
+    with open(refresh_marker, "w"):
+        pass
+    subprocess.Popen([sys.executable, "-m", "cloudless.cli.completion", profile],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                     stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def refresh_index_after_change(ctx):
+    """
+    Refreshes the completion index in the background after a command created or destroyed
+    something.
+    """
+    if _should_index(ctx):
+        refresh_index(ctx.obj['PROFILE'])
+
+
+def _load_index_for_completion(ctx):
+    profile = cloudless.profile.select_profile(ctx.find_root().params.get("profile"))
+    try:
+        age = time.time() - os.path.getmtime(get_index_path(profile))
+    except OSError:
+        age = None
+    if age is None or age > INDEX_MAX_AGE:
+        profile_data = cloudless.profile.load_profile(profile) or {}
+        if profile_data.get("provider") and profile_data["provider"] not in UNINDEXED_PROVIDERS:
+            refresh_index(profile)
+    return load_index(profile)
+
+
+# pylint: disable=unused-argument
+def complete_network(ctx, args, incomplete):
+    """
+    Completes network names.  Meant to be passed as "autocompletion" to a click argument.
+    """
+    index = _load_index_for_completion(ctx)
+    return [name for name in index["networks"] if name.startswith(incomplete)]
+
+
+# pylint: disable=unused-argument
+def complete_service(ctx, args, incomplete):
+    """
+    Completes service names in the network given by the "network" argument of the command.  Meant to
+    be passed as "autocompletion" to a click argument.
+    """
+    index = _load_index_for_completion(ctx)
+    network = ctx.params.get("network")
+    if network:
+        names = index["services"].get(network, [])
+    else:
+        names = sorted({name for names in index["services"].values() for name in names})
+    return [name for name in names if name.startswith(incomplete)]
+
+
+def main():
+    """
+    Rebuilds the completion index for the profile given on the command line.
+    """
+    profile = sys.argv[1]
+    try:
+        client = cloudless.Client(profile=profile)
+        services_by_network = {}
+        for service in client.service.iterate():
+            services_by_network.setdefault(service.network.name, []).append(service.name)
+        save_index(profile, networks=[network.name for network in client.network.iterate()
+                                      if network.name],
+                   services=services_by_network)
+    finally:
+        try:
+            os.remove(get_index_path(profile) + ".refreshing")
+        except OSError:
+            pass
+
+
+if __name__ == '__main__':
+    main()
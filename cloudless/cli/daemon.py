@@ -0,0 +1,173 @@
+"""
+Cloudless command line daemon.
+
+A local server that runs `cldls` commands on behalf of the command line, so that scripts running
+many commands back to back only pay for importing cloudless, creating clients, and discovering
+resources once.  Start it with `cldls daemon start`, and any `cldls` command run while it's up is
+sent to it over a unix socket.
+
+The daemon keeps one client per provider and credentials, and caches the results of list and get
+calls for a few seconds.  Any call that changes something, like creating or destroying a service,
+clears the cache for that client.
+"""
+import json
+import os
+import socketserver
+import sys
+import threading
+import traceback
+import click
+from click.testing import CliRunner
+import cloudless
+from cloudless.cli.cldls import get_cldls
+from cloudless.cli.client_cache import CachedClient, ResultCache
+from cloudless.cli.daemon_client import get_socket_path, send_request
+from cloudless.cli.utils import NaturalOrderAliasedGroup
+
+DEFAULT_CACHE_TTL = 10
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one request, which is a single line of JSON, and writes back a single line of JSON.
+    """
+    def handle(self):
+        request = json.loads(self.rfile.readline().decode("utf-8"))
+        if request.get("command") == "stop":
+            response = {"stopping": True}
+            # This has to happen on another thread, since shutdown waits for this request.
+            threading.Thread(target=self.server.shutdown).start()
+        elif request.get("command") == "status":
+            response = {"pid": os.getpid(), "clients": len(self.server.clients)}
+        else:
+            response = self.server.run_command(request)
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Runs `cldls` commands sent over a unix socket at "socket_path".  Commands run one at a time,
+    since they change the working directory and capture standard output.
+    """
+    def __init__(self, socket_path, ttl=DEFAULT_CACHE_TTL):
+        self.socket_path = socket_path
+        self.ttl = ttl
+        self.clients = {}
+        self.cldls = get_cldls()
+        socketserver.UnixStreamServer.__init__(self, socket_path, DaemonRequestHandler)
+
+    def server_bind(self):
+        # Create the socket so that only its owner can connect, rather than changing its mode after
+        # it's created, which would leave a moment where anyone could connect.
+        old_umask = os.umask(0o077)
+        try:
+            socketserver.UnixStreamServer.server_bind(self)
+        finally:
+            os.umask(old_umask)
+
+    def get_client(self, provider, credentials):
+        """
+        Returns the warm client for "provider" and "credentials", creating it if necessary.
+        """
+        key = (provider, json.dumps(credentials, sort_keys=True))
+        if key not in self.clients:
+            self.clients[key] = CachedClient(
+                cloudless.Client(provider=provider, credentials=credentials),
+                ResultCache(self.ttl))
+        return self.clients[key]
+
+    def run_command(self, request):
+        """
+        Runs the command line in "request" and returns its output and exit code.
+        """
+        runner = CliRunner(mix_stderr=False)
+        previous_cwd = os.getcwd()
+        try:
+            os.chdir(request["cwd"])
+            result = runner.invoke(self.cldls, request["args"], env=request.get("env"),
+                                   obj={"CLIENT_CACHE": self.get_client})
+        finally:
+            os.chdir(previous_cwd)
+        stderr = result.stderr
+        if result.exception and not isinstance(result.exception, SystemExit):
+            stderr += "".join(traceback.format_exception(*result.exc_info))
+        return {"stdout": result.stdout, "stderr": stderr, "exit_code": result.exit_code}
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+def add_daemon_group(cldls):
+    """
+    Add commands for the daemon command group.
+    """
+    @cldls.group(name='daemon', cls=NaturalOrderAliasedGroup)
+    def daemon_group():
+        """
+        Run a local server that keeps clients warm.
+
+        While the daemon is running, other cldls commands are sent to it instead of starting from
+        scratch.  Set "CLOUDLESS_NO_DAEMON" to run a command locally anyway.
+        """
+
+    @daemon_group.command(name="start")
+    @click.option('--ttl', type=float, default=DEFAULT_CACHE_TTL, show_default=True,
+                  help="Seconds to cache list and get results for.")
+    @click.option('--socket', 'socket_path', help="Path of the unix socket to listen on.")
+    # pylint:disable=unused-variable
+    def daemon_start(ttl, socket_path):
+        """
+        Start the daemon in the foreground.
+        """
+        socket_path = socket_path or get_socket_path()
+        if os.path.exists(socket_path):
+            try:
+                send_request({"command": "status"}, socket_path)
+                click.echo("Daemon already running on: %s" % socket_path)
+                sys.exit(1)
+            except OSError:
+                # Left behind by a daemon that didn't exit cleanly.
+                os.remove(socket_path)
+        socket_dir = os.path.dirname(socket_path)
+        if socket_dir and not os.path.exists(socket_dir):
+            os.makedirs(socket_dir, 0o700)
+        server = DaemonServer(socket_path, ttl)
+        click.echo("Daemon listening on: %s" % socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        click.echo("Daemon stopped")
+
+    @daemon_group.command(name="stop")
+    @click.option('--socket', 'socket_path', help="Path of the daemon's unix socket.")
+    # pylint:disable=unused-variable
+    def daemon_stop(socket_path):
+        """
+        Stop the running daemon.
+        """
+        try:
+            send_request({"command": "stop"}, socket_path)
+        except OSError:
+            click.echo("Daemon not running")
+            sys.exit(1)
+        click.echo("Daemon stopping")
+
+    @daemon_group.command(name="status")
+    @click.option('--socket', 'socket_path', help="Path of the daemon's unix socket.")
+    # pylint:disable=unused-variable
+    def daemon_status(socket_path):
+        """
+        Show whether the daemon is running.
+        """
+        try:
+            status = send_request({"command": "status"}, socket_path)
+        except OSError:
+            click.echo("Daemon not running")
+            sys.exit(1)
+        click.echo("Daemon running with pid %s and %s warm clients" % (status["pid"],
+                                                                       status["clients"]))
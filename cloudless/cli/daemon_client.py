@@ -0,0 +1,87 @@
+"""
+Cloudless command line daemon client.
+
+Sends a command line invocation to a running `cldls daemon`, if there is one, and prints its output.
+This only uses the standard library so that forwarding a command doesn't pay for importing click,
+the providers, or anything else the daemon already has loaded.
+"""
+import json
+import os
+import socket
+import sys
+
+SOCKET_ENVIRONMENT_VARIABLE = "CLOUDLESS_DAEMON_SOCKET"
+DISABLE_ENVIRONMENT_VARIABLE = "CLOUDLESS_NO_DAEMON"
+
+# These either prompt for input, run for a long time while logging their progress, or manage the
+# daemon itself, so they always run in the calling process.
+LOCAL_COMMANDS = ["init", "repl", "daemon", "batch", "service-test", "image-build"]
+
+
+def get_socket_path():
+    """
+    Returns the path of the daemon's unix socket.
+    """
+    return os.environ.get(SOCKET_ENVIRONMENT_VARIABLE,
+                          os.path.expanduser("~/.cloudless/cldls.sock"))
+
+
+def should_forward(args):
+    """
+    Returns true if the command line "args" can be run by the daemon.
+    """
+    if os.environ.get(DISABLE_ENVIRONMENT_VARIABLE):
+        return False
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        if arg == "--profile":
+            args = args[1:]
+        elif arg == "--debug":
+            # Debug logging goes to the daemon's own output, so run locally to see it.
+            return False
+        elif not arg.startswith("-"):
+            return arg not in LOCAL_COMMANDS
+    return False
+
+
+def send_request(request, socket_path=None):
+    """
+    Sends "request" to the daemon and returns its response.  Raises OSError if there is no daemon
+    listening.
+    """
+    daemon_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        daemon_socket.connect(socket_path or get_socket_path())
+        daemon_socket.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with daemon_socket.makefile("rb") as response_file:
+            response = response_file.readline()
+    finally:
+        daemon_socket.close()
+    if not response:
+        raise ConnectionError("Daemon closed the connection without responding")
+    return json.loads(response.decode("utf-8"))
+
+
+def run_in_daemon(args, socket_path=None):
+    """
+    Runs the command line "args" in the daemon and prints its output.  Returns the exit code of the
+    command, or None if the command must run locally or no daemon is running.
+    """
+    if not should_forward(args):
+        return None
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    request = {"args": list(args), "cwd": os.getcwd(),
+               "env": {"CLOUDLESS_PROFILE": os.environ.get("CLOUDLESS_PROFILE")}}
+    try:
+        response = send_request(request, socket_path)
+    except OSError:
+        # A daemon that's exited can leave its socket behind, so just run locally.
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stdout.flush()
+    sys.stderr.write(response["stderr"])
+    sys.stderr.flush()
+    return response["exit_code"]
@@ -20,7 +20,7 @@ def add_image_group(cldls):
         Commands to interact with machine images.
         """
         handle_profile_for_cli(ctx)
-        click.echo('image group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('image group with provider: %s' % ctx.obj['PROVIDER'], err=True)
         ctx.obj['DEV'] = dev
 
     @image_group.command(name="get")
@@ -23,7 +23,7 @@ def add_image_build_group(cldls):
         Commands to interact with machine images.
         """
         handle_profile_for_cli(ctx)
-        click.echo('image group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('image group with provider: %s' % ctx.obj['PROVIDER'], err=True)
         ctx.obj['DEV'] = dev
 
     @image_build_group.command(name="deploy")
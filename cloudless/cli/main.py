@@ -1,12 +1,18 @@
 """
 Cloudless command line entry point.
 """
-from cloudless.cli.cldls import get_cldls
+import sys
+from cloudless.cli.daemon_client import run_in_daemon
 
 def main():
     """
-    Main entry point.
+    Main entry point.  Runs the command in the daemon if one is running, and locally otherwise.
     """
+    exit_code = run_in_daemon(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+    # Only import the command line when running locally, since it's slow to import.
+    from cloudless.cli.cldls import get_cldls
     cldls_cli = get_cldls()
     # pylint: disable=no-value-for-parameter
     cldls_cli()
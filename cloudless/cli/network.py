@@ -4,6 +4,9 @@ Cloudless network command line interface.
 import click
 from cloudless.cli.utils import NaturalOrderAliasedGroup
 from cloudless.cli.utils import handle_profile_for_cli, get_network_for_cli
+from cloudless.cli.output import output_options, write_items
+from cloudless.cli.completion import complete_network, record_networks, refresh_index_after_change
+from cloudless.types.snapshot import network_to_dict, NETWORK_FIELDS
 
 def add_network_group(cldls):
     """
@@ -19,7 +22,7 @@ def add_network_group(cldls):
         deploy services into.
         """
         handle_profile_for_cli(ctx)
-        click.echo('Network group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('Network group with provider: %s' % ctx.obj['PROVIDER'], err=True)
 
     @network_group.command(name="create")
     @click.argument('name')
@@ -31,20 +34,29 @@ def add_network_group(cldls):
         Create a network in this profile.
         """
         network = ctx.obj['CLIENT'].network.create(name, blueprint)
+        refresh_index_after_change(ctx)
         click.echo('Created network: %s' % network.name)
 
     @network_group.command(name="list")
+    @output_options
     @click.pass_context
     # pylint:disable=unused-variable
-    def network_list(ctx):
+    def network_list(ctx, output, fields):
         """
         List all networks in this profile.
         """
-        networks = ctx.obj['CLIENT'].network.list()
-        click.echo('Networks: %s' % [network.name for network in networks])
+        if output == "text" and not fields:
+            network_names = [network.name for network in ctx.obj['CLIENT'].network.list()]
+            click.echo('Networks: %s' % network_names)
+        else:
+            network_names = write_items(ctx.obj['CLIENT'].network.iterate(), output, fields,
+                                        NETWORK_FIELDS, network_to_dict,
+                                        lambda network: network.name,
+                                        to_key=lambda network: network.name)
+        record_networks(ctx, network_names)
 
     @network_group.command(name="get")
-    @click.argument('name')
+    @click.argument('name', autocompletion=complete_network)
     @click.pass_context
     # pylint:disable=unused-variable
     def network_get(ctx, name):
@@ -58,7 +70,7 @@ def add_network_group(cldls):
         click.echo('Region: %s' % network.region)
 
     @network_group.command(name="destroy")
-    @click.argument('name')
+    @click.argument('name', autocompletion=complete_network)
     @click.pass_context
     # pylint:disable=unused-variable
     def network_destroy(ctx, name):
@@ -67,4 +79,5 @@ def add_network_group(cldls):
         """
         network = get_network_for_cli(ctx, name)
         ctx.obj['CLIENT'].network.destroy(network)
+        refresh_index_after_change(ctx)
         click.echo('Destroyed network: %s' % name)
@@ -0,0 +1,88 @@
+"""
+Output formats for the cloudless command line.
+
+List commands print human readable text by default, but can instead print machine readable JSON,
+JSON lines or YAML with "--output", and can print only some fields with "--fields".  Items are
+read from an iterator and each one is written as soon as the provider returns it, so with JSON lines
+a consumer can start on the first item before the last one is fetched.
+"""
+import json
+import click
+import yaml
+
+OUTPUT_FORMATS = ["text", "json", "jsonl", "yaml"]
+
+
+def output_options(command):
+    """
+    Decorator that adds the "--output" and "--fields" options to a list command.
+    """
+    command = click.option(
+        '--fields', help="Comma separated list of the top level fields to print.")(command)
+    command = click.option(
+        '--output', '-o', type=click.Choice(OUTPUT_FORMATS), default="text", show_default=True,
+        help="Output format.")(command)
+    return command
+
+
+def parse_fields(fields, known_fields):
+    """
+    Returns the comma separated "fields" as a list, checking that they're all in "known_fields".
+    """
+    fields = [field.strip() for field in fields.split(",")] if fields else []
+    unknown = [field for field in fields if field not in known_fields]
+    if unknown:
+        raise click.UsageError("Unknown fields: %s, must be one of: %s" % (
+            ", ".join(unknown), ", ".join(known_fields)))
+    return fields
+
+
+def select_fields(record, fields):
+    """
+    Returns only the given "fields" of the dictionary "record", in the order given.
+    """
+    if not fields:
+        return record
+    return {field: record[field] for field in fields}
+
+
+# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments
+def write_items(items, output, fields, known_fields, to_record, to_text, to_key=None):
+    """
+    Writes each of "items", which can be an iterator, to standard output in the "output" format as
+    soon as it's read.  If "to_key" is set, returns the list of what it returns for each item
+    written, so callers can keep what they need without holding on to every item.
+
+    "to_record" converts an item to a dictionary with the keys in "known_fields" for the machine
+    readable formats, and "to_text" converts it to a line of text for the default format.  If
+    "fields" is set, only those fields are printed, and the text format prints their values
+    separated by tabs.  "fields" is checked before anything is written, so a bad field never leaves
+    half written output.
+    """
+    fields = parse_fields(fields, known_fields)
+    keys = []
+    if output == "json":
+        click.echo("[", nl=False)
+    index = -1
+    for index, item in enumerate(items):
+        if to_key:
+            keys.append(to_key(item))
+        if output == "text" and not fields:
+            click.echo(to_text(item))
+            continue
+        record = select_fields(to_record(item), fields)
+        if output == "text":
+            click.echo("\t".join([str(value) for value in record.values()]))
+        elif output == "jsonl":
+            click.echo(json.dumps(record))
+        elif output == "json":
+            click.echo("%s\n  %s" % ("," if index else "", json.dumps(record)), nl=False)
+        elif output == "yaml":
+            click.echo(yaml.safe_dump([record], default_flow_style=False, sort_keys=False),
+                       nl=False)
+    if output == "json":
+        click.echo("\n]")
+    elif output == "yaml" and index < 0:
+        click.echo("[]")
+    return keys if to_key else None
@@ -5,6 +5,9 @@ import click
 import cloudless
 from cloudless.cli.utils import NaturalOrderAliasedGroup
 from cloudless.cli.utils import handle_profile_for_cli, get_service_for_cli
+from cloudless.cli.output import output_options, write_items
+from cloudless.cli.completion import complete_network, complete_service
+from cloudless.types.snapshot import path_to_dict, PATH_FIELDS
 
 # pylint:disable=too-many-statements
 def add_paths_group(cldls):
@@ -20,12 +23,12 @@ def add_paths_group(cldls):
         Commands to interact with paths, which are allowed connections between services.
         """
         handle_profile_for_cli(ctx)
-        click.echo('Paths group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('Paths group with provider: %s' % ctx.obj['PROVIDER'], err=True)
 
     @paths_group.command(name="allow_service")
-    @click.argument('network')
-    @click.argument('destination')
-    @click.argument('source')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
+    @click.argument('source', autocompletion=complete_service)
     @click.argument('port')
     @click.pass_context
     # pylint:disable=unused-variable
@@ -40,8 +43,8 @@ def add_paths_group(cldls):
                                                                            network, port))
 
     @paths_group.command(name="allow_network_block")
-    @click.argument('network')
-    @click.argument('destination')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
     @click.argument('source')
     @click.argument('port')
     @click.pass_context
@@ -60,9 +63,9 @@ def add_paths_group(cldls):
                                                                            network, port))
 
     @paths_group.command(name="revoke_service")
-    @click.argument('network')
-    @click.argument('destination')
-    @click.argument('source')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
+    @click.argument('source', autocompletion=complete_service)
     @click.argument('port')
     @click.pass_context
     # pylint:disable=unused-variable
@@ -77,8 +80,8 @@ def add_paths_group(cldls):
                                                                              network, port))
 
     @paths_group.command(name="revoke_network_block")
-    @click.argument('network')
-    @click.argument('destination')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
     @click.argument('source')
     @click.argument('port')
     @click.pass_context
@@ -98,9 +101,9 @@ def add_paths_group(cldls):
                                                                              network, port))
 
     @paths_group.command(name="service_has_access")
-    @click.argument('network')
-    @click.argument('destination')
-    @click.argument('source')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
+    @click.argument('source', autocompletion=complete_service)
     @click.argument('port')
     @click.pass_context
     # pylint:disable=unused-variable
@@ -118,8 +121,8 @@ def add_paths_group(cldls):
                 source, destination, network, port))
 
     @paths_group.command(name="network_block_has_access")
-    @click.argument('network')
-    @click.argument('destination')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
     @click.argument('source')
     @click.argument('port')
     @click.pass_context
@@ -138,8 +141,8 @@ def add_paths_group(cldls):
                 source, destination, network, port))
 
     @paths_group.command(name="is_internet_accessible")
-    @click.argument('network')
-    @click.argument('destination')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('destination', autocompletion=complete_service)
     @click.argument('port')
     @click.pass_context
     # pylint:disable=unused-variable
@@ -156,13 +159,14 @@ def add_paths_group(cldls):
                 destination, network, port))
 
     @paths_group.command(name="list")
+    @output_options
     @click.pass_context
     # pylint:disable=unused-variable
-    def paths_list(ctx):
+    def paths_list(ctx, output, fields):
         """
         List all pathss in this profile.
         """
-        for path in ctx.obj['CLIENT'].paths.list():
+        def path_to_text(path):
             if not path.source.name:
                 cidr_blocks = [subnetwork.cidr_block for subnetwork in path.source.subnetworks]
                 source_name = ",".join(cidr_blocks)
@@ -170,5 +174,7 @@ def add_paths_group(cldls):
             else:
                 source_name = path.source.name
                 network_name = path.source.network.name
-            click.echo("%s:%s -(%s)-> %s:%s" % (network_name, source_name, path.port,
-                                                path.network.name, path.destination.name))
+            return "%s:%s -(%s)-> %s:%s" % (network_name, source_name, path.port,
+                                            path.network.name, path.destination.name)
+        write_items(ctx.obj['CLIENT'].paths.iterate(), output, fields, PATH_FIELDS, path_to_dict,
+                    path_to_text)
@@ -0,0 +1,10 @@
+"""
+Cloudless interactive shell.
+"""
+from click_repl import register_repl
+
+def add_repl_command(cldls):
+    """
+    Add the command to start an interactive shell.
+    """
+    register_repl(cldls)
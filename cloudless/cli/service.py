@@ -6,6 +6,10 @@ import yaml
 import click
 from cloudless.cli.utils import NaturalOrderAliasedGroup
 from cloudless.cli.utils import handle_profile_for_cli, get_network_for_cli, get_service_for_cli
+from cloudless.cli.output import output_options, write_items
+from cloudless.cli.completion import (complete_network, complete_service, record_services,
+                                      refresh_index_after_change)
+from cloudless.types.snapshot import service_to_dict, SERVICE_FIELDS
 
 # pylint:disable=too-many-statements
 def add_service_group(cldls):
@@ -22,10 +26,10 @@ def add_service_group(cldls):
         in cloudless.
         """
         handle_profile_for_cli(ctx)
-        click.echo('Service group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('Service group with provider: %s' % ctx.obj['PROVIDER'], err=True)
 
     @service_group.command(name="create")
-    @click.argument('network')
+    @click.argument('network', autocompletion=complete_network)
     @click.argument('name')
     @click.argument('blueprint')
     @click.option('--var-file')
@@ -44,21 +48,27 @@ def add_service_group(cldls):
         network_object = get_network_for_cli(ctx, network)
         service = ctx.obj['CLIENT'].service.create(network_object, name, blueprint,
                                                    var_file_contents, count)
+        refresh_index_after_change(ctx)
         click.echo('Created service: %s in network: %s' % (name, network))
 
     @service_group.command(name="list")
+    @output_options
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_list(ctx):
+    def service_list(ctx, output, fields):
         """
         List all services in this profile.
         """
-        for service in ctx.obj['CLIENT'].service.list():
-            click.echo("Network: %s, Service: %s" % (service.network.name, service.name))
+        service_names = write_items(ctx.obj['CLIENT'].service.iterate(), output, fields,
+                                    SERVICE_FIELDS, service_to_dict,
+                                    lambda service: "Network: %s, Service: %s" % (
+                                        service.network.name, service.name),
+                                    to_key=lambda service: (service.network.name, service.name))
+        record_services(ctx, service_names)
 
     @service_group.command(name="get")
-    @click.argument('network')
-    @click.argument('name')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('name', autocompletion=complete_service)
     @click.pass_context
     # pylint:disable=unused-variable
     def service_get(ctx, network, name):
@@ -81,7 +91,7 @@ def add_service_group(cldls):
         yaml.add_representer(OrderedDict, represent_ordereddict)
 
         def get_paths_info_for_service(service):
-            paths = ctx.obj['CLIENT'].paths.list()
+            paths = ctx.obj['CLIENT'].paths.list_for(service)
             has_access_to = ["default-all-outgoing-allowed"]
             is_accessible_from = []
             for path in paths:
@@ -135,8 +145,8 @@ def add_service_group(cldls):
         click.echo(yaml.dump(service_info, default_flow_style=False))
 
     @service_group.command(name="destroy")
-    @click.argument('network')
-    @click.argument('name')
+    @click.argument('network', autocompletion=complete_network)
+    @click.argument('name', autocompletion=complete_service)
     @click.pass_context
     # pylint:disable=unused-variable
     def service_destroy(ctx, network, name):
@@ -145,4 +155,5 @@ def add_service_group(cldls):
         """
         service = get_service_for_cli(ctx, network, name)
         ctx.obj['CLIENT'].service.destroy(service)
+        refresh_index_after_change(ctx)
         click.echo('Destroyed service: %s in network: %s' % (name, network))
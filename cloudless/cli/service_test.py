@@ -11,8 +11,12 @@ from cloudless.testutils.blueprint_tester import verify as do_verify
 from cloudless.testutils.blueprint_tester import teardown as do_teardown
 from cloudless.testutils.blueprint_tester import run_all
 from cloudless.testutils.blueprint_tester import load_config_for_cli
+from cloudless.testutils.blueprint_matrix import run_blueprint_matrix, write_junit_xml
+from cloudless.testutils.blueprint_matrix import DEFAULT_JOBS
 from cloudless.cli.utils import handle_profile_for_cli
+import cloudless.profile
 
+# pylint:disable=too-many-statements
 def add_service_test_group(cldls):
     """
     Add commands for the service_test command group.
@@ -25,17 +29,19 @@ def add_service_test_group(cldls):
         Service testing framework.
 
         Test framework to make sure the service behaves as expected.  Manages the lifecycle of the
-        service being tested.  Saves state into <config_path>/blueprint-test-state.json.
+        service being tested.  Saves state into <config_path>/.cloudless/blueprint-test-state.json,
+        or into the directory given by "--state-dir".
         """
         ctx.obj['DEV'] = dev
         handle_profile_for_cli(ctx)
-        click.echo('Service test group with provider: %s' % ctx.obj['PROVIDER'])
+        click.echo('Service test group with provider: %s' % ctx.obj['PROVIDER'], err=True)
 
     @service_test_group.command(name="deploy")
     @click.argument('config')
+    @click.option('--state-dir', help="Directory to save test state in.")
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_test_deploy(ctx, config):
+    def service_test_deploy(ctx, config, state_dir):
         """
         Deploy test service.
 
@@ -45,7 +51,7 @@ def add_service_test_group(cldls):
         if os.path.isdir(config):
             click.echo("Configuration must be a file, not a directory!")
             sys.exit(1)
-        service, ssh_username, private_key_path = do_setup(ctx.obj['CLIENT'], config)
+        service, ssh_username, private_key_path = do_setup(ctx.obj['CLIENT'], config, state_dir)
         click.echo("Deploy complete!")
         click.echo("To log in, run:")
         for instance in ctx.obj['CLIENT'].service.get_instances(service):
@@ -53,9 +59,10 @@ def add_service_test_group(cldls):
 
     @service_test_group.command(name="credentials")
     @click.argument('config')
+    @click.option('--state-dir', help="Directory test state was saved in.")
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_test_credentials(ctx, config):
+    def service_test_credentials(ctx, config, state_dir):
         """
         Get credentials for test service.
 
@@ -65,7 +72,7 @@ def add_service_test_group(cldls):
         if os.path.isdir(config):
             click.echo("Configuration must be a file, not a directory!")
             sys.exit(1)
-        config = load_config_for_cli(ctx.obj['CLIENT'], config)
+        config = load_config_for_cli(ctx.obj['CLIENT'], config, state_dir)
         if not config:
             click.echo("No configuration found! Run deploy first.")
             sys.exit(1)
@@ -77,9 +84,10 @@ def add_service_test_group(cldls):
 
     @service_test_group.command(name="check")
     @click.argument('config')
+    @click.option('--state-dir', help="Directory test state was saved in.")
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_test_check(ctx, config):
+    def service_test_check(ctx, config, state_dir):
         """
         Check test service is behaving as expected.
 
@@ -88,14 +96,15 @@ def add_service_test_group(cldls):
         if os.path.isdir(config):
             click.echo("Configuration must be a file, not a directory!")
             sys.exit(1)
-        service, ssh_username, private_key_path = do_verify(ctx.obj['CLIENT'], config)
+        service, ssh_username, private_key_path = do_verify(ctx.obj['CLIENT'], config, state_dir)
         click.echo("Check complete!")
 
     @service_test_group.command(name="cleanup")
     @click.argument('config')
+    @click.option('--state-dir', help="Directory test state was saved in.")
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_test_cleanup(ctx, config):
+    def service_test_cleanup(ctx, config, state_dir):
         """
         Cleanup test service.
 
@@ -104,14 +113,15 @@ def add_service_test_group(cldls):
         if os.path.isdir(config):
             click.echo("Configuration must be a file, not a directory!")
             sys.exit(1)
-        do_teardown(ctx.obj['CLIENT'], config)
+        do_teardown(ctx.obj['CLIENT'], config, state_dir)
         click.echo("Cleanup complete!")
 
     @service_test_group.command(name="run")
     @click.argument('config')
+    @click.option('--state-dir', help="Directory to save test state in.")
     @click.pass_context
     # pylint:disable=unused-variable
-    def service_test_run(ctx, config):
+    def service_test_run(ctx, config, state_dir):
         """
         Run create, verify, and cleanup.
 
@@ -120,5 +130,53 @@ def add_service_test_group(cldls):
         if os.path.isdir(config):
             click.echo("Configuration must be a file, not a directory!")
             sys.exit(1)
-        run_all(ctx.obj['CLIENT'], config)
+        run_all(ctx.obj['CLIENT'], config, state_dir)
         click.echo("Full test run complete!")
+
+    @service_test_group.command(name="matrix")
+    @click.argument('configs', nargs=-1, required=True)
+    @click.option('--test-profile', 'test_profiles', multiple=True,
+                  help="Profile to test with.  Can be given more than once.  Defaults to the "
+                  "current profile.")
+    @click.option('--jobs', '-j', type=click.IntRange(min=1), default=DEFAULT_JOBS,
+                  show_default=True, help="Number of tests to run at once.")
+    @click.option('--junit-xml', type=click.File('w'), help="File to write a JUnit XML report to.")
+    @click.option('--state-dir', help="Directory to save the state of each test in.  Defaults to "
+                  "a temporary directory.")
+    @click.pass_context
+    # pylint:disable=unused-variable,too-many-arguments
+    def service_test_matrix(ctx, configs, test_profiles, jobs, junit_xml, state_dir):
+        """
+        Run many tests at once.
+
+        Runs create, verify, and cleanup for every test configuration in CONFIGS with every
+        profile, in parallel.  Each test keeps its state in its own directory, so this doesn't use
+        or change the state of the other service-test commands.
+        """
+        for config in configs:
+            if os.path.isdir(config):
+                click.echo("Configuration must be a file, not a directory: %s" % config)
+                sys.exit(1)
+        profiles = {}
+        for profile in test_profiles or [ctx.obj['PROFILE']]:
+            profiles[profile] = cloudless.profile.load_profile(profile)
+            if not profiles[profile]:
+                click.echo("Profile: \"%s\" not found." % profile)
+                sys.exit(1)
+
+        def show_result(result):
+            click.echo("%s: %s with profile %s (%.1fs)" % (
+                "PASSED" if result.passed else "FAILED", result.config, result.profile,
+                result.duration))
+
+        results = run_blueprint_matrix(configs, profiles, jobs, state_dir, show_result)
+        if junit_xml:
+            write_junit_xml(results, junit_xml)
+        failed = [result for result in results if not result.passed]
+        for result in failed:
+            click.echo("\n%s with profile %s failed:\n%s" % (result.config, result.profile,
+                                                             result.error), err=True)
+        click.echo("Matrix complete!  %s passed, %s failed." % (len(results) - len(failed),
+                                                               len(failed)))
+        if failed:
+            sys.exit(1)
@@ -1,9 +1,11 @@
 """
 Utilities needed for command line interface.
 """
+import importlib
 import sys
 from collections import OrderedDict
 import click
+from click.utils import make_default_short_help
 import cloudless
 
 class NaturalOrderGroup(click.Group):
@@ -34,6 +36,67 @@ class NaturalOrderGroup(click.Group):
         return self.commands.keys()
 
 
+class LazyGroup(NaturalOrderGroup):
+    """
+    Command group that only imports the module for a subcommand when that subcommand is used, so
+    that commands with expensive imports don't slow down every other command.
+
+    "lazy_subcommands" maps each subcommand name to a tuple of the module that defines it, the
+    function in that module that adds it to a group, and its short help, which is shown in the help
+    output without importing the module.  Example use::
+
+        @click.group(cls=LazyGroup, lazy_subcommands=OrderedDict([
+            ("network", ("cloudless.cli.network", "add_network_group", "Manage networks."))]))
+    """
+    def __init__(self, name=None, commands=None, lazy_subcommands=None, **attrs):
+        NaturalOrderGroup.__init__(self, name=name, commands=commands, **attrs)
+        self.lazy_subcommands = OrderedDict(lazy_subcommands or {})
+
+    def list_commands(self, ctx):
+        """
+        List the lazy subcommands in the order they were given, followed by any other commands.
+        """
+        return list(self.lazy_subcommands.keys()) + [
+            name for name in self.commands if name not in self.lazy_subcommands]
+
+    def get_command(self, ctx, cmd_name):
+        """
+        Get the command, importing its module first if it hasn't been loaded yet.
+
+        While completing, click asks for every subcommand just to list their names, so this
+        returns a placeholder with the stored short help instead of importing every module.  The
+        subcommand actually named on the command line is still loaded, so its own subcommands and
+        options can be completed.
+        """
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, add_function_name, short_help = self.lazy_subcommands[cmd_name]
+            if ctx and ctx.resilient_parsing and cmd_name not in ctx.protected_args + ctx.args:
+                return click.Command(cmd_name, short_help=short_help)
+            add_function = getattr(importlib.import_module(module_name), add_function_name)
+            add_function(self)
+        return click.Group.get_command(self, ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        """
+        Write the list of commands to the help output, using the stored short help for commands
+        that haven't been loaded rather than importing them.
+        """
+        commands = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                if not self.commands[name].hidden:
+                    commands.append((name, self.commands[name].get_short_help_str))
+            else:
+                short_help = self.lazy_subcommands[name][2]
+                commands.append((name, lambda limit, short_help=short_help:
+                                 make_default_short_help(short_help, limit)))
+        if commands:
+            limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+            with formatter.section("Commands"):
+                formatter.write_dl([(name, get_short_help(limit))
+                                    for name, get_short_help in commands])
+
+
 class NaturalOrderAliasedGroup(NaturalOrderGroup):
     """
     Handles command aliases.  See: http://click.pocoo.org/5/advanced/#command-aliases
@@ -61,6 +124,10 @@ def handle_profile_for_cli(ctx):
         sys.exit(1)
     ctx.obj['PROVIDER'] = profile["provider"]
     ctx.obj['CREDENTIALS'] = profile["credentials"]
+    if ctx.obj.get('CLIENT_CACHE'):
+        # Set when running in the daemon, which keeps clients around between commands.
+        ctx.obj['CLIENT'] = ctx.obj['CLIENT_CACHE'](ctx.obj['PROVIDER'], ctx.obj['CREDENTIALS'])
+        return
     ctx.obj['CLIENT'] = cloudless.Client(provider=ctx.obj['PROVIDER'],
                                          credentials=ctx.obj['CREDENTIALS'])
 
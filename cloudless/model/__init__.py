@@ -5,13 +5,21 @@ This file should contain things to help drivers for each provider implement the
 where they can specify what functions should be called for each model operation.
 """
 
+import functools
 import json
-from jsonschema import validate
+import os
+from typing import List
 import cattr
 import attr
-import boto3
-from moto import mock_ec2
-from cloudless.util.exceptions import BadConfigurationException
+from cloudless.util.exceptions import BadConfigurationException, DisallowedOperationException
+
+# Actions a plan can contain.  A "conflict" means the operation would fail against the current
+# state, for example creating a resource that already exists.
+PLAN_CREATE = "create"
+PLAN_UPDATE = "update"
+PLAN_DELETE = "delete"
+PLAN_NOOP = "noop"
+PLAN_CONFLICT = "conflict"
 
 @attr.s
 class Resource:
@@ -19,21 +27,132 @@ class Resource:
     Base class for a resource object.
     """
     @classmethod
-    def fromdict(cls, resource_dict):
-        """Create a new instance of this resource from a dictionary representation."""
+    def validator(cls):
+        """
+        Returns the validator for this resource's schema.  Building a validator checks the schema
+        itself, so this is done once per class and cached.
+        """
         # This is a gross hack to get this working for now...  I want each instance of a Resource
         # object to include a "schema" member, and so I attach it to the class and reference it
         # here.  I could probably just have the init do it, but then the subclasses have to remember
         # to call super.
         # pylint: disable=no-member
-        validate(instance=resource_dict, schema=cls.schema)
+        schema = cls.schema
+        # Look in this class's own dict so subclasses never pick up their parent's validator, and
+        # check the schema so we notice if it gets replaced.
+        cached = cls.__dict__.get("_compiled_validator")
+        if cached is None or cached[0] is not schema:
+            # Imported here because jsonschema is slow to import and isn't needed until we load a
+            # resource.
+            from jsonschema import validators
+            validator_class = validators.validator_for(schema)
+            validator_class.check_schema(schema)
+            cached = (schema, validator_class(schema))
+            cls._compiled_validator = cached
+        return cached[1]
+
+    @classmethod
+    def validate(cls, resource_dict):
+        """
+        Validate a dictionary representation of this resource against its schema.  Raises the same
+        ValidationError that jsonschema.validate would.
+        """
+        validator = cls.validator()
+        if not validator.is_valid(resource_dict):
+            from jsonschema.exceptions import best_match
+            raise best_match(validator.iter_errors(resource_dict))
+
+    @classmethod
+    def fromdict(cls, resource_dict):
+        """Create a new instance of this resource from a dictionary representation."""
+        cls.validate(resource_dict)
         return cattr.structure(resource_dict, cls)
 
+    @classmethod
+    def fromdicts(cls, resource_dicts):
+        """
+        Create a list of instances of this resource from a list of dictionary representations.
+        Every dictionary is validated before any are structured.
+        """
+        resource_dicts = list(resource_dicts)
+        for resource_dict in resource_dicts:
+            cls.validate(resource_dict)
+        return cattr.structure(resource_dicts, List[cls])
+
     @classmethod
     def fromjson(cls, resource_json):
         """Create a new instance of this resource from a json representation."""
         return cls.fromdict(json.loads(resource_json))
 
+# pylint: disable=too-few-public-methods
+@attr.s
+class PlanItem:
+    """
+    What a single model operation would do to a single resource.
+
+    "current" is the list of matching resources that exist now, and "changes" maps each field that
+    would change to a (current, desired) pair.
+    """
+    action = attr.ib(type=str)
+    resource_type = attr.ib(type=str)
+    resource_definition = attr.ib()
+    current = attr.ib(type=list, factory=list)
+    changes = attr.ib(type=dict, factory=dict)
+    reason = attr.ib(type=str, default=None)
+
+
+@attr.s
+class Plan:
+    """
+    The result of planning a set of model operations, in the order they were given.
+    """
+    items = attr.ib(type=list, factory=list)
+
+    def has_changes(self):
+        """
+        Returns True if running these operations would change anything.
+        """
+        return any(item.action != PLAN_NOOP for item in self.items)
+
+    def summary(self):
+        """
+        Returns a map from each action to the number of items with that action.
+        """
+        counts = {}
+        for item in self.items:
+            counts[item.action] = counts.get(item.action, 0) + 1
+        return counts
+
+
+@functools.lru_cache(maxsize=None)
+def _load_schema_file(schema_path):
+    """
+    Parse the schema file at "schema_path".  Cached, so creating many models, for example for
+    several providers or accounts, only parses each schema once.  The result is shared, so it must
+    not be modified.
+    """
+    with open(schema_path) as model_raw:
+        return json.loads(model_raw.read())
+
+
+def _diff_fields(desired, current, prefix=""):
+    """
+    Returns the fields that differ between two unstructured resources.  Fields that aren't set in
+    "desired" are left to the provider, and fields the provider doesn't report can't be compared,
+    so neither count as changes.
+    """
+    changes = {}
+    for key, desired_value in desired.items():
+        current_value = current.get(key)
+        if desired_value is None or current_value is None:
+            continue
+        if isinstance(desired_value, dict) and isinstance(current_value, dict):
+            changes.update(_diff_fields(desired_value, current_value, "%s%s." % (prefix, key)))
+        elif desired_value != current_value:
+            changes["%s%s" % (prefix, key)] = (current_value, desired_value)
+    return changes
+
+
 class ResourceDriver():
     """
     Base class for a resource driver.
@@ -87,11 +206,14 @@ class Model():
     The entry point to a provider.  Each provider should return a model object that has that
     provider's information inside.
     """
-    RESOURCE_TYPES = {}
-    RESOURCE_SCHEMAS = {}
-
     def __init__(self):
-        pass
+        # These are per model, so models for different providers and accounts can be used in the
+        # same process without replacing each other's drivers.
+        self.resource_types = {}
+        self.resource_schemas = {}
+        # Reads made while planning, so repeated plans against the same state don't hit the
+        # provider again.  Cleared whenever this model changes anything.
+        self._plan_cache = {}
 
     def register(self, resource_type, schema_path, resource_driver):
         """
@@ -103,70 +225,139 @@ class Model():
             register("PrivateNetwork", "cloudless-core-model/models/private-network.json",
                 pn_driver)
         """
-        with open(schema_path) as model_raw:
-            model = json.loads(model_raw.read())
+        model = _load_schema_file(os.path.realpath(schema_path))
         if resource_type != model["title"]:
             raise BadConfigurationException(
                 "Expected resource type %s does not match type in config %s" % (resource_type,
                                                                                 schema_path))
-        self.RESOURCE_TYPES[model["title"]] = resource_driver
-        self.RESOURCE_SCHEMAS[model["title"]] = model
+        self.resource_types[model["title"]] = resource_driver
+        self.resource_schemas[model["title"]] = model
 
     def _check_resource_registered(self, resource_type):
         """
         Check if we have a handler registered for resource_type.
         """
-        if resource_type not in self.RESOURCE_TYPES:
+        if resource_type not in self.resource_types:
             raise NotImplementedError("No handler found for resource %s!" % resource_type)
 
     def resources(self):
         """
         Return the list of resources currently registered with this model.
         """
-        return self.RESOURCE_TYPES.keys()
+        return self.resource_types.keys()
+
+    def clear_plan_cache(self):
+        """
+        Forget the reads cached by planning.  Call this if something else changed the resources
+        this model manages.
+        """
+        self._plan_cache = {}
+
+    def _cached_get(self, resource_type, resource_definition):
+        """
+        Get the given resource, using the plan cache.  Only ever reads from the provider.
+        """
+        key = (resource_type, json.dumps(cattr.unstructure(resource_definition), sort_keys=True,
+                                         default=str))
+        if key not in self._plan_cache:
+            driver = self.resource_types[resource_type]
+            self._plan_cache[key] = driver.get(resource_definition) or []
+        return self._plan_cache[key]
+
+    # pylint: disable=too-many-return-statements
+    def _plan_item(self, operation, resource_type, resource_definition):
+        """
+        Work out what "operation" would do for the given resource, using only read calls.
+        """
+        current = self._cached_get(resource_type, resource_definition)
+        if operation == "create":
+            if current:
+                return PlanItem(PLAN_CONFLICT, resource_type, resource_definition, current,
+                                reason="Resource already exists")
+            return PlanItem(PLAN_CREATE, resource_type, resource_definition, current)
+        if operation == "apply":
+            if not current:
+                return PlanItem(PLAN_CREATE, resource_type, resource_definition, current)
+            if len(current) > 1:
+                return PlanItem(PLAN_CONFLICT, resource_type, resource_definition, current,
+                                reason="Definition matches more than one resource")
+            changes = _diff_fields(cattr.unstructure(resource_definition),
+                                   cattr.unstructure(current[0]))
+            if changes:
+                return PlanItem(PLAN_UPDATE, resource_type, resource_definition, current, changes)
+            return PlanItem(PLAN_NOOP, resource_type, resource_definition, current)
+        if operation == "delete":
+            if current:
+                return PlanItem(PLAN_DELETE, resource_type, resource_definition, current)
+            return PlanItem(PLAN_NOOP, resource_type, resource_definition, current)
+        raise DisallowedOperationException("Cannot plan operation %s" % operation)
+
+    def plan(self, operations):
+        """
+        Plan a list of (operation, resource_type, resource_definition) tuples, where operation is
+        one of "create", "apply" or "delete".  Nothing is changed.
+
+        Each operation is planned against the current state, so this doesn't account for earlier
+        operations in the list.
+
+        Example:
+            model.plan([("apply", "Network", network), ("delete", "Firewall", firewall)])
+        """
+        items = []
+        for operation, resource_type, resource_definition in operations:
+            self._check_resource_registered(resource_type)
+            items.append(self._plan_item(operation, resource_type, resource_definition))
+        return Plan(items)
 
     def create(self, resource_type, resource_definition, plan=False):
         """
-        Create the given resource type using the registered resource driver.
+        Create the given resource type using the registered resource driver.  With "plan", return a
+        PlanItem describing what would happen instead.
         """
         self._check_resource_registered(resource_type)
         if plan:
-            raise NotImplementedError("plan not implemented!")
-        return self.RESOURCE_TYPES[resource_type].create(resource_definition)
+            return self._plan_item("create", resource_type, resource_definition)
+        self.clear_plan_cache()
+        return self.resource_types[resource_type].create(resource_definition)
 
     def apply(self, resource_type, resource_definition, plan=False):
         """
-        Apply the given resource type using the registered resource driver.
+        Apply the given resource type using the registered resource driver.  With "plan", return a
+        PlanItem describing what would happen instead.
         """
         self._check_resource_registered(resource_type)
         if plan:
-            raise NotImplementedError("plan not implemented!")
-        return self.RESOURCE_TYPES[resource_type].apply(resource_definition)
+            return self._plan_item("apply", resource_type, resource_definition)
+        self.clear_plan_cache()
+        return self.resource_types[resource_type].apply(resource_definition)
 
     def delete(self, resource_type, resource_definition, plan=False):
         """
-        Delete the given resource type using the registered resource driver.
+        Delete the given resource type using the registered resource driver.  With "plan", return a
+        PlanItem describing what would happen instead.
         """
         self._check_resource_registered(resource_type)
         if plan:
-            raise NotImplementedError("plan not implemented!")
-        return self.RESOURCE_TYPES[resource_type].delete(resource_definition)
+            return self._plan_item("delete", resource_type, resource_definition)
+        self.clear_plan_cache()
+        return self.resource_types[resource_type].delete(resource_definition)
 
     def get(self, resource_type, resource_definition, plan=False):
         """
-        Get the given resource type using the registered resource driver.
+        Get the given resource type using the registered resource driver.  With "plan", the result
+        may come from reads cached while planning.
         """
         self._check_resource_registered(resource_type)
         if plan:
-            raise NotImplementedError("plan not implemented!")
-        return self.RESOURCE_TYPES[resource_type].get(resource_definition)
+            return self._cached_get(resource_type, resource_definition)
+        return self.resource_types[resource_type].get(resource_definition)
 
+    # "plan" is kept so callers can pass it the same way as to the other operations.
+    # pylint: disable=unused-argument
     def flags(self, resource_type, resource_definition, plan=False):
         """
         Get provider specific flags for the given resource type using the registered resource
-        driver.
+        driver.  Flags don't change anything, so this is the same with or without "plan".
         """
         self._check_resource_registered(resource_type)
-        if plan:
-            raise NotImplementedError("plan not implemented!")
-        return self.RESOURCE_TYPES[resource_type].flags(resource_definition)
+        return self.resource_types[resource_type].flags(resource_definition)
@@ -81,3 +81,20 @@ class NetworkClient:
         """
         logger.debug('Listing networks')
         return self.network.list()
+
+    def iterate(self):
+        """
+        Like `list`, but returns an iterator that yields each network as the provider returns it,
+        so callers can start on the first network before the last one is fetched.
+
+        Example:
+
+            for network in client.network.iterate():
+                print(network.name)
+
+        """
+        logger.debug('Iterating over networks')
+        if not hasattr(self.network, "iterate"):
+            # Providers from other packages may only implement "list".
+            return iter(self.network.list())
+        return self.network.iterate()
@@ -7,6 +7,9 @@ does the transformation to and from the underlying firewall rules.
 """
 from cloudless.log import logger
 from cloudless.providers import get_provider
+from cloudless.types.common import Service
+from cloudless.types.frozen import thaw
+from cloudless.util.exceptions import DisallowedOperationException
 # Importing this just so it's available in this namespace.
 # pylint: disable=unused-import
 from cloudless.types.networking import CidrBlock
@@ -77,16 +80,59 @@ class PathsClient:
         logger.debug('Removing path from %s to %s on port %s', source, destination, port)
         return self.paths.remove(source, destination, int(port))
 
-    def list(self):
+    def list(self, services=None, snapshot=None):
         """
-        List all paths and return a dictionary structure representing a graph.
+        List all paths and return a dictionary structure representing a graph.  If "services" is
+        given, it should be the result of `client.service.list()`, and it's used instead of listing
+        services again.  If "snapshot" is set, the paths in that
+        `cloudless.types.snapshot.Snapshot` are returned instead of listing them on the provider.
 
         Example:
 
             client.paths.list()
 
         """
-        return self.paths.list()
+        if snapshot is not None:
+            return thaw(snapshot.paths)
+        return self.paths.list(services)
+
+    def iterate(self, services=None, snapshot=None):
+        """
+        Like `list`, but returns an iterator that yields each path as soon as it's found, so
+        callers can start on the first path before the last one is fetched.
+
+        Example:
+
+            for path in client.paths.iterate():
+                print(path.port)
+
+        """
+        if snapshot is not None:
+            return iter(thaw(snapshot.paths))
+        if not hasattr(self.paths, "iterate"):
+            # Providers from other packages may only implement "list".
+            return iter(self.paths.list(services))
+        return self.paths.iterate(services)
+
+    def list_for(self, service, snapshot=None):
+        """
+        List the paths to and from "service".  This only looks up the firewall rules that involve
+        "service", so it's much cheaper than `client.paths.list()` when there are many services.
+        The services on the other end of each path only have their network and name set.  If
+        "snapshot" is set, the paths are found in that `cloudless.types.snapshot.Snapshot` instead.
+
+        Example:
+
+            service1 = client.service.get(network=client.network.get("example"), name="service1")
+            client.paths.list_for(service1)
+
+        """
+        if not isinstance(service, Service):
+            raise DisallowedOperationException(
+                "Service argument to list_for must be of type cloudless.types.common.Service")
+        if snapshot is not None:
+            return thaw(snapshot.paths_for(service))
+        return self.paths.list_for(service)
 
     def internet_accessible(self, service, port):
         """
@@ -18,21 +18,78 @@ Example usage:
 This creates a network named example using the "mock-aws" client.  This doesn't actually create the
 network, but cloudless will think it exists for the duration of the session so the
 `mock_aws.network.list()` command will show it.
+
+Providers are only imported when they are first used, so nobody pays for the libraries of a
+provider they aren't using.  Other packages can add providers by registering a module with the same
+interface as the builtin providers under the "cloudless.providers" entry point group, for example:
+
+    entry_points={
+        'cloudless.providers': ['myprovider=myprovider.cloudless'],
+    }
 """
+import importlib
+import threading
+
+from cloudless.log import logger
 
-from cloudless.providers import aws, aws_mock, gce
+ENTRY_POINT_GROUP = "cloudless.providers"
 
-PROVIDERS_MAP = {
-    "aws": aws,
-    "mock-aws": aws_mock,
-    "gce": gce
+# Builtin providers, as a map from provider name to module path.  These are also registered as
+# entry points, but are kept here so they work without the package metadata installed, for example
+# when running from a source checkout.
+BUILTIN_PROVIDERS = {
+    "aws": "cloudless.providers.aws",
+    "mock-aws": "cloudless.providers.aws_mock",
+    "gce": "cloudless.providers.gce"
     }
 
+LOADED_PROVIDERS = {}
+PROVIDERS_LOCK = threading.Lock()
+
+
+def _provider_entry_points():
+    """
+    Returns a map from provider name to entry point, for all providers registered by installed
+    packages.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        # Before python 3.8
+        import pkg_resources
+        return {entry_point.name: entry_point
+                for entry_point in pkg_resources.iter_entry_points(ENTRY_POINT_GROUP)}
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        group = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        group = entry_points.get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point for entry_point in group}
+
+
+def list_providers():
+    """
+    Returns the names of all the available providers.
+    """
+    return sorted(set(BUILTIN_PROVIDERS) | set(_provider_entry_points()))
+
 
 def get_provider(provider):
     """
     Given a provider string, returns the provider module object.
     """
-    if provider in PROVIDERS_MAP:
-        return PROVIDERS_MAP[provider]
-    raise NotImplementedError("Provider %s not implemented" % provider)
+    with PROVIDERS_LOCK:
+        if provider not in LOADED_PROVIDERS:
+            if provider in BUILTIN_PROVIDERS:
+                logger.debug("Loading builtin provider %s", provider)
+                module = importlib.import_module(BUILTIN_PROVIDERS[provider])
+            else:
+                # Only look through installed packages if this isn't a builtin provider, since
+                # that's much slower than importing a known module.
+                entry_point = _provider_entry_points().get(provider)
+                if not entry_point:
+                    raise NotImplementedError("Provider %s not implemented" % provider)
+                logger.debug("Loading provider %s from %s", provider, entry_point)
+                module = entry_point.load()
+            LOADED_PROVIDERS[provider] = module
+        return LOADED_PROVIDERS[provider]
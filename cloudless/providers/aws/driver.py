@@ -0,0 +1,53 @@
+"""
+Amazon Web Services Driver Setup
+
+The AWS implementation uses a boto3 session as its driver, and creates clients from it as needed.
+
+Boto3 sessions are not thread safe, so sessions are pooled per thread and keyed by the profile in
+the credentials.  This means clients for different profiles can be used in the same process without
+changing the boto3 default session, and that each thread reuses its own session, along with the
+service definitions it has already loaded, for every client it creates.  Clients get their session
+through `PerThreadDriver` rather than keeping one, so a client created on one thread can be used
+from others.
+"""
+import threading
+
+import boto3.session
+from cloudless.providers.aws.log import logger
+
+
+DRIVERS = {}
+DRIVERS_LOCK = threading.Lock()
+
+
+def get_aws_driver(credentials):
+    """
+    Uses the given credentials to get a boto3 session.  The session returned is owned by the
+    calling thread.
+    """
+    profile = credentials.get("profile")
+    with DRIVERS_LOCK:
+        if profile not in DRIVERS:
+            DRIVERS[profile] = threading.local()
+        thread_drivers = DRIVERS[profile]
+    if not hasattr(thread_drivers, "driver"):
+        logger.debug("AWS driver not initialized for profile %s in this thread, creating.",
+                     profile)
+        thread_drivers.driver = boto3.session.Session(profile_name=profile)
+    return thread_drivers.driver
+
+
+class PerThreadDriver:
+    """
+    Base for AWS clients, whose "driver" is always the calling thread's session for their
+    "credentials".
+    """
+    # pylint: disable=too-few-public-methods
+    credentials = None
+
+    @property
+    def driver(self):
+        """
+        The boto3 session owned by the calling thread.
+        """
+        return get_aws_driver(self.credentials)
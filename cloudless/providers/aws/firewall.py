@@ -2,9 +2,9 @@
 Cloudless Firewall Model on AWS
 """
 import time
-import boto3
 from botocore.exceptions import ClientError
 import cloudless.model
+from cloudless.providers.aws.driver import get_aws_driver
 from cloudless.providers.aws.log import logger
 from cloudless.types.common import Firewall
 import cloudless.providers.aws.impl.network
@@ -41,12 +41,10 @@ class FirewallResourceDriver(cloudless.model.ResourceDriver):
         self.provider = provider
         self.credentials = credentials
         super(FirewallResourceDriver, self).__init__(provider, credentials)
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.driver = boto3
+        self.driver = get_aws_driver(credentials)
         # Should remove this when I actually have a real model for the network.
         # e.g. model.get("Network", "etc...")
-        self.network = cloudless.providers.aws.impl.network.NetworkClient(boto3, mock=False)
+        self.network = cloudless.providers.aws.impl.network.NetworkClient(self.driver, mock=False)
 
     def create(self, resource_definition):
         firewall = resource_definition
@@ -154,11 +152,12 @@ class FirewallResourceDriver(cloudless.model.ResourceDriver):
         ec2 = self.driver.client("ec2")
         firewall = resource_definition
         logger.info("Getting firewall: %s", firewall)
-        network = self.network.get(firewall.network.name)
         search_filters = []
         if not firewall.network or not firewall.network.name:
             raise DisallowedOperationException("Network selector required when getting firewall")
         network = self.network.get(firewall.network.name)
+        if not network:
+            return []
         search_filters.append(
             {'Name': 'vpc-id', 'Values': [network.network_id]})
         search_filters.append(
@@ -1,10 +1,10 @@
 """
 Cloudless Image on Mock AWS
 """
-import boto3
+from cloudless.providers.aws.driver import PerThreadDriver
 import cloudless.providers.aws.impl.image
 
-class ImageClient:
+class ImageClient(PerThreadDriver):
     """
     Cloudless Image Client Object for AWS
 
@@ -12,9 +12,14 @@ class ImageClient:
     """
 
     def __init__(self, credentials):
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.image = cloudless.providers.aws.impl.image.ImageClient(boto3, mock=True)
+        self.credentials = credentials
+
+    @property
+    def image(self):
+        """
+        The implementation client, using the calling thread's session.
+        """
+        return cloudless.providers.aws.impl.image.ImageClient(self.driver, mock=True)
 
     def create(self, name, service):
         """
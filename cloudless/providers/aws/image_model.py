@@ -1,8 +1,8 @@
 """
 Cloudless Image Model on AWS
 """
-import boto3
 import dateutil.parser
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.model
 from cloudless.types.common import ImageModel
 import cloudless.providers.aws.impl.image
@@ -15,9 +15,7 @@ class ImageResourceDriver(cloudless.model.ResourceDriver):
         self.provider = provider
         self.credentials = credentials
         super(ImageResourceDriver, self).__init__(provider, credentials)
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.driver = boto3
+        self.driver = get_aws_driver(credentials)
 
     def create(self, resource_definition):
         raise NotImplementedError("Image Creation Not Implemented")
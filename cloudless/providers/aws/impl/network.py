@@ -79,7 +79,7 @@ class NetworkClient:
             ec2.delete_vpc(VpcId=vpc_id)
             raise exception
         return canonicalize_network_info(name, vpc["Vpc"],
-                                         self.driver.session.Session().region_name)
+                                         self.driver.region_name)
 
     # pylint: disable=no-self-use
     def get(self, name):
@@ -99,7 +99,7 @@ class NetworkClient:
             return None
 
         return canonicalize_network_info(name, vpcs["Vpcs"][0],
-                                         self.driver.session.Session().region_name)
+                                         self.driver.region_name)
 
     # pylint: disable=no-self-use
     def destroy(self, network):
@@ -169,6 +169,12 @@ class NetworkClient:
         """
         List all networks.
         """
+        return list(self.iterate())
+
+    def iterate(self):
+        """
+        Yield each network.
+        """
         ec2 = self.driver.client("ec2")
 
         def get_deployment_tag(vpc):
@@ -180,9 +186,6 @@ class NetworkClient:
             return None
 
         vpcs = ec2.describe_vpcs()
-        result = []
         for vpc in vpcs["Vpcs"]:
             name = get_deployment_tag(vpc)
-            result.append(canonicalize_network_info(name, vpc,
-                                                    self.driver.session.Session().region_name))
-        return result
+            yield canonicalize_network_info(name, vpc, self.driver.region_name)
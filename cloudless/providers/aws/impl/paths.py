@@ -8,7 +8,7 @@ rules.
 import ipaddress
 
 import cloudless.providers.aws.service
-from cloudless.providers.aws.impl.asg import ASG
+from cloudless.providers.aws.impl.asg import ASG, AsgName
 from cloudless.providers.aws.log import logger
 from cloudless.util.exceptions import DisallowedOperationException
 from cloudless.util.public_blocks import get_public_blocks
@@ -16,6 +16,25 @@ from cloudless.types.common import Service, Path, Subnetwork
 from cloudless.types.networking import CidrBlock
 
 
+def _make_path(destination, source, rule):
+    return Path(destination.network, source, destination, rule["IpProtocol"],
+                rule.get("FromPort", "N/A"))
+
+
+def _get_cidr_paths(destination, ip_permissions):
+    subnets = []
+    for ip_range in ip_permissions["IpRanges"]:
+        subnets.append(Subnetwork(subnetwork_id=None, name=None,
+                                  cidr_block=ip_range["CidrIp"],
+                                  region=None, availability_zone=None, instances=[]))
+    # We treat an explicit CIDR block as a special case of a service with no name.
+    paths = []
+    if subnets:
+        source = Service(network=None, name=None, subnetworks=subnets)
+        paths.append(_make_path(destination, source, ip_permissions))
+    return paths
+
+
 class PathsClient:
     """
     Client object to interact with paths between resources.
@@ -42,7 +61,7 @@ class PathsClient:
                 "Either destination or source must be a cloudless.types.networking.Service object")
 
         if (isinstance(source, Service) and isinstance(destination, Service) and
-                source.network != destination.network):
+                source.network.key != destination.network.key):
             raise DisallowedOperationException(
                 "Destination and source must be in the same network if specified as services")
 
@@ -125,14 +144,24 @@ class PathsClient:
         dest_sg_id, _, _, src_ip_permissions = self._extract_service_info(source, destination, port)
         ec2.revoke_security_group_ingress(GroupId=dest_sg_id, IpPermissions=src_ip_permissions)
 
+    def list(self, services=None):
+        """
+        List all paths and return a dictionary structure representing a graph.  If "services" is
+        given, it's used instead of listing services again.
+        """
+        return list(self.iterate(services))
+
     # pylint: disable=too-many-locals
-    def list(self):
+    def iterate(self, services=None):
         """
-        List all paths and return a dictionary structure representing a graph.
+        Yield each path, one security group at a time.  If "services" is given, it's used instead
+        of listing services again.
         """
         ec2 = self.driver.client("ec2")
         sg_to_service = {}
-        for service in self.service.list():
+        if services is None:
+            services = self.service.list()
+        for service in services:
             sg_id = self.asg.get_launch_configuration_security_group(
                 service.network.name, service.name)
             if sg_id in sg_to_service:
@@ -141,32 +170,14 @@ class PathsClient:
                 sg_to_service[sg_id] = [service]
         security_groups = ec2.describe_security_groups()
 
-        def make_path(destination, source, rule):
-            return Path(destination.network, source, destination, rule["IpProtocol"],
-                        rule.get("FromPort", "N/A"))
-
-        def get_cidr_paths(destination, ip_permissions):
-            subnets = []
-            for ip_range in ip_permissions["IpRanges"]:
-                subnets.append(Subnetwork(subnetwork_id=None, name=None,
-                                          cidr_block=ip_range["CidrIp"],
-                                          region=None, availability_zone=None, instances=[]))
-            # We treat an explicit CIDR block as a special case of a service with no name.
-            paths = []
-            if subnets:
-                source = Service(network=None, name=None, subnetworks=subnets)
-                paths.append(make_path(destination, source, ip_permissions))
-            return paths
-
         def get_sg_paths(destination, ip_permissions):
             paths = []
             for group in ip_permissions["UserIdGroupPairs"]:
                 services = sg_to_service[group["GroupId"]]
                 for service in services:
-                    paths.append(make_path(destination, service, ip_permissions))
+                    paths.append(_make_path(destination, service, ip_permissions))
             return paths
 
-        paths = []
         for security_group in security_groups["SecurityGroups"]:
 
             if security_group["GroupId"] not in sg_to_service:
@@ -178,9 +189,65 @@ class PathsClient:
             for service in services:
                 for ip_permissions in security_group["IpPermissions"]:
                     logger.debug("ip_permissions: %s", ip_permissions)
-                    paths.extend(get_cidr_paths(service, ip_permissions))
-                    paths.extend(get_sg_paths(service, ip_permissions))
+                    yield from _get_cidr_paths(service, ip_permissions)
+                    yield from get_sg_paths(service, ip_permissions)
 
+    def list_for(self, service):
+        """
+        List the paths to and from "service".  Only the security group of the service and the
+        groups with rules that reference it are fetched, so this doesn't depend on how many other
+        services there are.
+
+        The services on the other end of each path only have their network and name set.
+        """
+        ec2 = self.driver.client("ec2")
+        sg_id = self.asg.get_launch_configuration_security_group(service.network.name,
+                                                                 service.name)
+        if not sg_id:
+            return []
+
+        def get_service(security_group):
+            # Service security groups are named after the autoscaling group, which is
+            # "<network>.<service>".
+            asg_name = AsgName(name_string=security_group["GroupName"])
+            if getattr(asg_name, "network", None) != service.network.name:
+                logger.debug("Security group %s is apparently not attached to a service in %s.  "
+                             "Skipping", security_group["GroupId"], service.network.name)
+                return None
+            if asg_name.subnetwork == service.name:
+                return service
+            return Service(network=service.network, name=asg_name.subnetwork, subnetworks=[])
+
+        # Paths to this service are the rules in its own security group.
+        own_rules = ec2.describe_security_groups(
+            GroupIds=[sg_id])["SecurityGroups"][0]["IpPermissions"]
+        source_ids = {group["GroupId"] for ip_permissions in own_rules
+                      for group in ip_permissions["UserIdGroupPairs"]}
+        sources = {}
+        if source_ids:
+            for security_group in ec2.describe_security_groups(
+                    GroupIds=sorted(source_ids))["SecurityGroups"]:
+                sources[security_group["GroupId"]] = get_service(security_group)
+        paths = []
+        for ip_permissions in own_rules:
+            paths.extend(_get_cidr_paths(service, ip_permissions))
+            for group in ip_permissions["UserIdGroupPairs"]:
+                if sources.get(group["GroupId"]):
+                    paths.append(_make_path(service, sources[group["GroupId"]], ip_permissions))
+
+        # Paths from this service are the rules in other groups that reference its group.
+        referencing_groups = ec2.describe_security_groups(
+            Filters=[{"Name": "ip-permission.group-id", "Values": [sg_id]}])["SecurityGroups"]
+        for security_group in referencing_groups:
+            if security_group["GroupId"] == sg_id:
+                continue
+            destination = get_service(security_group)
+            if not destination:
+                continue
+            for ip_permissions in security_group["IpPermissions"]:
+                if any(group["GroupId"] == sg_id
+                       for group in ip_permissions["UserIdGroupPairs"]):
+                    paths.append(_make_path(destination, service, ip_permissions))
         return paths
 
     def internet_accessible(self, service, port):
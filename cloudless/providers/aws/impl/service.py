@@ -127,12 +127,16 @@ class ServiceClient:
         """
         List all instance groups.
         """
-        services = []
+        return list(self.iterate())
+
+    def iterate(self):
+        """
+        Yield each instance group as soon as it's discovered.
+        """
         subnetworks = self.subnetwork.list()
         for network_name, subnetwork_info in subnetworks.items():
             for subnetwork_name, _ in subnetwork_info["subnetworks"].items():
-                services.append(self.get(self.network.get(network_name), subnetwork_name))
-        return services
+                yield self.get(self.network.get(network_name), subnetwork_name)
 
     def _discover_asg(self, network_name, service_name):
         """
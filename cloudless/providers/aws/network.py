@@ -4,10 +4,10 @@ Cloudless Network on AWS
 This component should allow for intuitive and transparent control over networks, which are the top
 level containers for groups of instances/services.  This is the AWS implementation.
 """
-import boto3
+from cloudless.providers.aws.driver import PerThreadDriver
 import cloudless.providers.aws.impl.network
 
-class NetworkClient:
+class NetworkClient(PerThreadDriver):
     """
     Cloudless Network Client Object for AWS
 
@@ -15,9 +15,14 @@ class NetworkClient:
     """
 
     def __init__(self, credentials):
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.network = cloudless.providers.aws.impl.network.NetworkClient(boto3, mock=False)
+        self.credentials = credentials
+
+    @property
+    def network(self):
+        """
+        The implementation client, using the calling thread's session.
+        """
+        return cloudless.providers.aws.impl.network.NetworkClient(self.driver, mock=False)
 
     def create(self, name, blueprint):
         """
@@ -45,3 +50,9 @@ class NetworkClient:
         List all networks.
         """
         return self.network.list()
+
+    def iterate(self):
+        """
+        Yield each network as it's fetched.
+        """
+        return self.network.iterate()
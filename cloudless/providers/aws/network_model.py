@@ -1,7 +1,7 @@
 """
 Cloudless Network Model on AWS
 """
-import boto3
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.model
 from cloudless.types.common import NetworkModel
 import cloudless.providers.aws.impl.network
@@ -14,12 +14,10 @@ class NetworkResourceDriver(cloudless.model.ResourceDriver):
         self.provider = provider
         self.credentials = credentials
         super(NetworkResourceDriver, self).__init__(provider, credentials)
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.driver = boto3
+        self.driver = get_aws_driver(credentials)
         # Should remove this when I actually have a real model for the network.  e.g.
         # model.get("Network", "etc...")
-        self.network = cloudless.providers.aws.impl.network.NetworkClient(boto3, mock=False)
+        self.network = cloudless.providers.aws.impl.network.NetworkClient(self.driver, mock=False)
 
     def create(self, resource_definition):
         network = resource_definition
@@ -5,18 +5,23 @@ This is a the AWS implmentation for the paths API, a high level interface to add
 routes between services, doing the conversion to security groups and firewall
 rules.
 """
-import boto3
+from cloudless.providers.aws.driver import PerThreadDriver
 import cloudless.providers.aws.impl.paths
 
 
-class PathsClient:
+class PathsClient(PerThreadDriver):
     """
     Client object to interact with paths between resources.
     """
     def __init__(self, credentials):
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.paths = cloudless.providers.aws.impl.paths.PathsClient(boto3, mock=False)
+        self.credentials = credentials
+
+    @property
+    def paths(self):
+        """
+        The implementation client, using the calling thread's session.
+        """
+        return cloudless.providers.aws.impl.paths.PathsClient(self.driver, mock=False)
 
 
     def add(self, source, destination, port):
@@ -31,11 +36,25 @@ class PathsClient:
         """
         return self.paths.remove(source, destination, port)
 
-    def list(self):
+    def list(self, services=None):
+        """
+        List all paths and return a dictionary structure representing a graph.  If "services" is
+        given, it's used instead of listing services again.
+        """
+        return self.paths.list(services)
+
+    def iterate(self, services=None):
+        """
+        Yield each path as it's found.  If "services" is given, it's used instead of listing
+        services again.
+        """
+        return self.paths.iterate(services)
+
+    def list_for(self, service):
         """
-        List all paths and return a dictionary structure representing a graph.
+        List the paths to and from "service".
         """
-        return self.paths.list()
+        return self.paths.list_for(service)
 
     def internet_accessible(self, service, port):
         """
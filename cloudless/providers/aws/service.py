@@ -4,20 +4,25 @@ Cloudless Service on AWS
 This is the AWS implmentation for the service API, a high level interface to manage groups of
 instances.
 """
-import boto3
+from cloudless.providers.aws.driver import PerThreadDriver
 import cloudless.providers.aws.impl.service
 
 
 
-class ServiceClient:
+class ServiceClient(PerThreadDriver):
     """
     Client object to manage instances.
     """
 
     def __init__(self, credentials):
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.service = cloudless.providers.aws.impl.service.ServiceClient(boto3, mock=False)
+        self.credentials = credentials
+
+    @property
+    def service(self):
+        """
+        The implementation client, using the calling thread's session.
+        """
+        return cloudless.providers.aws.impl.service.ServiceClient(self.driver, mock=False)
 
     # pylint: disable=too-many-arguments
     def create(self, network, service_name, blueprint, template_vars, count):
@@ -37,6 +42,12 @@ class ServiceClient:
         """
         return self.service.list()
 
+    def iterate(self):
+        """
+        Yield each service as it's discovered.
+        """
+        return self.service.iterate()
+
     # pylint: disable=no-self-use
     def get(self, network, service_name):
         """
@@ -50,6 +61,12 @@ class ServiceClient:
         """
         return self.service.destroy(service)
 
+    def destroy_many(self, services):
+        """
+        Destroy all the services in "services".  Returns a list with the result for each service.
+        """
+        return [self.service.destroy(service) for service in services]
+
     def node_types(self):
         """
         Get a list of node sizes to use for matching resource requirements to
@@ -1,7 +1,7 @@
 """
 Cloudless Subnet Model on AWS
 """
-import boto3
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.model
 from cloudless.providers.aws.log import logger
 from cloudless.types.common import SubnetModel
@@ -28,20 +28,20 @@ class SubnetResourceDriver(cloudless.model.ResourceDriver):
         self.provider = provider
         self.credentials = credentials
         super(SubnetResourceDriver, self).__init__(provider, credentials)
-        if "profile" in credentials:
-            boto3.setup_default_session(profile_name=credentials["profile"])
-        self.driver = boto3
+        self.driver = get_aws_driver(credentials)
         # Should remove this when I actually have a real model for the network.
         # e.g. model.get("Network", "etc...")
-        self.subnetwork = cloudless.providers.aws.impl.subnetwork.SubnetworkClient(boto3,
+        self.subnetwork = cloudless.providers.aws.impl.subnetwork.SubnetworkClient(self.driver,
                                                                                    mock=False)
         self.model = model
 
-    def _get_network(self, network):
+    def _get_network(self, network, required=True):
         if "Network" not in self.model.resources():
             raise DisallowedOperationException(
                 "Network model must be registered to use Subnet model.")
-        networks = self.model.get("Network", network)
+        networks = self.model.get("Network", network) or []
+        if not networks and not required:
+            return None
         if len(networks) != 1:
             raise DisallowedOperationException(
                 "Matcher must match exactly one network, %s matched %s" % (
@@ -77,7 +77,9 @@ class SubnetResourceDriver(cloudless.model.ResourceDriver):
 
     def get(self, resource_definition):
         subnet = resource_definition
-        network = self._get_network(subnet.network)
+        network = self._get_network(subnet.network, required=False)
+        if not network:
+            return []
         old_subnetworks = self.subnetwork.get_with_args(network.name, subnet.name)
         if not old_subnetworks:
             return []
@@ -3,6 +3,7 @@ Cloudless Firewall Model on Mock AWS
 """
 from moto import mock_ec2
 import cloudless.model
+import cloudless.providers.aws.firewall
 
 @mock_ec2
 class MockFirewallResourceDriver(cloudless.model.ResourceDriver):
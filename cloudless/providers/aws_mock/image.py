@@ -1,8 +1,8 @@
 """
 Cloudless Image on Mock AWS
 """
-import boto3
 from moto import mock_ec2, mock_autoscaling
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.providers.aws.impl.image
 
 @mock_ec2
@@ -17,7 +17,8 @@ class ImageClient:
     # You can set a "profile" in credentials, but that doesn't matter for moto
     # pylint: disable=unused-argument
     def __init__(self, credentials):
-        self.image = cloudless.providers.aws.impl.image.ImageClient(boto3, mock=True)
+        driver = get_aws_driver({})
+        self.image = cloudless.providers.aws.impl.image.ImageClient(driver, mock=True)
 
     def create(self, name, service):
         """
@@ -3,6 +3,7 @@ Cloudless Image Model on Mock AWS
 """
 from moto import mock_ec2
 import cloudless.model
+import cloudless.providers.aws.image_model
 
 @mock_ec2
 class MockImageResourceDriver(cloudless.model.ResourceDriver):
@@ -1,8 +1,8 @@
 """
 Cloudless Network on Mock AWS
 """
-import boto3
 from moto import mock_ec2
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.providers.aws.impl.network
 
 @mock_ec2
@@ -16,7 +16,8 @@ class NetworkClient:
     # You can set a "profile" in credentials, but that doesn't matter for moto
     # pylint: disable=unused-argument
     def __init__(self, credentials):
-        self.network = cloudless.providers.aws.impl.network.NetworkClient(boto3, mock=True)
+        driver = get_aws_driver({})
+        self.network = cloudless.providers.aws.impl.network.NetworkClient(driver, mock=True)
 
     def create(self, name, blueprint):
         """
@@ -44,3 +45,10 @@ class NetworkClient:
         List all networks.
         """
         return self.network.list()
+
+    def iterate(self):
+        """
+        Return an iterator over all networks.  They're listed up front, since moto is only
+        active during each call.
+        """
+        return iter(self.network.list())
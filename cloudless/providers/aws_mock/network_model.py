@@ -3,6 +3,7 @@ Cloudless Network Model on Mock AWS
 """
 from moto import mock_ec2
 import cloudless.model
+import cloudless.providers.aws.network_model
 
 @mock_ec2
 class MockNetworkResourceDriver(cloudless.model.ResourceDriver):
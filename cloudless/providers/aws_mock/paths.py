@@ -5,8 +5,8 @@ This is a the AWS implmentation for the paths API, a high level interface to add
 routes between services, doing the conversion to security groups and firewall
 rules.
 """
-import boto3
 from moto import mock_ec2, mock_autoscaling
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.providers.aws.impl.paths
 
 @mock_ec2
@@ -19,7 +19,8 @@ class PathsClient:
     # You can set a "profile" in credentials, but that doesn't matter for moto
     # pylint: disable=unused-argument
     def __init__(self, credentials):
-        self.paths = cloudless.providers.aws.impl.paths.PathsClient(boto3, mock=True)
+        driver = get_aws_driver({})
+        self.paths = cloudless.providers.aws.impl.paths.PathsClient(driver, mock=True)
 
 
     def add(self, source, destination, port):
@@ -34,11 +35,25 @@ class PathsClient:
         """
         return self.paths.remove(source, destination, port)
 
-    def list(self):
+    def list(self, services=None):
         """
-        List all paths and return a dictionary structure representing a graph.
+        List all paths and return a dictionary structure representing a graph.  If "services" is
+        given, it's used instead of listing services again.
         """
-        return self.paths.list()
+        return self.paths.list(services)
+
+    def iterate(self, services=None):
+        """
+        Return an iterator over all paths.  They're listed up front, since moto is only
+        active during each call.
+        """
+        return iter(self.paths.list(services))
+
+    def list_for(self, service):
+        """
+        List the paths to and from "service".
+        """
+        return self.paths.list_for(service)
 
     def internet_accessible(self, service, port):
         """
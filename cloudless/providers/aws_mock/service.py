@@ -1,8 +1,8 @@
 """
 Cloudless Mock AWS Service
 """
-import boto3
 from moto import mock_ec2, mock_autoscaling
+from cloudless.providers.aws.driver import get_aws_driver
 import cloudless.providers.aws.impl.service
 
 @mock_ec2
@@ -15,7 +15,8 @@ class ServiceClient:
     # You can set a "profile" in credentials, but that doesn't matter for moto
     # pylint: disable=unused-argument
     def __init__(self, credentials):
-        self.service = cloudless.providers.aws.impl.service.ServiceClient(boto3, mock=True)
+        driver = get_aws_driver({})
+        self.service = cloudless.providers.aws.impl.service.ServiceClient(driver, mock=True)
 
     # pylint: disable=too-many-arguments
     def create(self, network, service_name, blueprint, template_vars, count):
@@ -41,12 +42,25 @@ class ServiceClient:
         """
         return self.service.destroy(service)
 
+    def destroy_many(self, services):
+        """
+        Destroy all the services in "services".  Returns a list with the result for each service.
+        """
+        return [self.service.destroy(service) for service in services]
+
     def list(self):
         """
         List all services.
         """
         return self.service.list()
 
+    def iterate(self):
+        """
+        Return an iterator over all services.  They're listed up front, since moto is only
+        active during each call.
+        """
+        return iter(self.service.list())
+
     def node_types(self):
         """
         Get mapping of node types to the resources.
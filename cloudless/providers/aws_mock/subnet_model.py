@@ -3,6 +3,7 @@ Cloudless Subnet Model on Mock AWS
 """
 from moto import mock_ec2
 import cloudless.model
+import cloudless.providers.aws.subnet_model
 
 @mock_ec2
 class MockSubnetResourceDriver(cloudless.model.ResourceDriver):
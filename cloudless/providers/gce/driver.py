@@ -3,25 +3,59 @@ Google Compute Engine Driver Setup
 
 GCE uses an oauth process to authenticate, so getting the driver uses the provided credentials to do
 that.
+
+Libcloud drivers are not thread safe, so drivers are pooled per thread and keyed by the user and
+project in the credentials.  Each thread reuses its own driver, and with it the driver's connection,
+for every call against the same project.  Clients get their driver through `PerThreadDriver`
+rather than keeping one, so a client created on one thread can be used from others.
 """
+import threading
+
 from libcloud.compute.types import Provider
 from libcloud.compute.providers import get_driver
 from cloudless.providers.gce.log import logger
 
 
-DRIVER = None
+DRIVERS = {}
+DRIVERS_LOCK = threading.Lock()
 
 
 def get_gce_driver(credentials):
     """
-    Uses the given credentials to get a GCE driver object from libcloud.
+    Uses the given credentials to get a GCE driver object from libcloud.  The driver returned is
+    owned by the calling thread.
+    """
+    key = (credentials["user_id"], credentials["project"])
+    with DRIVERS_LOCK:
+        if key not in DRIVERS:
+            DRIVERS[key] = threading.local()
+        thread_drivers = DRIVERS[key]
+    if not hasattr(thread_drivers, "driver"):
+        logger.debug("GCE driver not initialized for %s in this thread, creating.", key)
+        thread_drivers.driver = _create_gce_driver(credentials)
+    return thread_drivers.driver
+
+
+class PerThreadDriver:
     """
-    # pylint:disable=global-statement
-    global DRIVER
-    if not DRIVER:
-        logger.debug("GCE driver not initialized, creating.")
-        compute_engine_driver = get_driver(Provider.GCE)
-        DRIVER = compute_engine_driver(user_id=credentials["user_id"],
-                                       key=credentials["key"],
-                                       project=credentials["project"])
-    return DRIVER
+    Base for GCE clients, whose "driver" is always the calling thread's driver for their
+    "credentials".
+    """
+    # pylint: disable=too-few-public-methods
+    credentials = None
+
+    @property
+    def driver(self):
+        """
+        The GCE driver owned by the calling thread.
+        """
+        return get_gce_driver(self.credentials)
+
+
+def _create_gce_driver(credentials):
+    # Drivers for the same project share an on disk cache of the oauth token, so creating a driver
+    # for a new thread doesn't authenticate again.
+    compute_engine_driver = get_driver(Provider.GCE)
+    return compute_engine_driver(user_id=credentials["user_id"],
+                                 key=credentials["key"],
+                                 project=credentials["project"])
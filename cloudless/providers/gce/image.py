@@ -5,12 +5,12 @@ This component should allow for intuitive and transparent control over images, w
 level containers for groups of instances/services.  This is the GCE implementation.
 """
 from cloudless.util.exceptions import (BadEnvironmentStateException, DisallowedOperationException)
-from cloudless.providers.gce.driver import get_gce_driver
+from cloudless.providers.gce.driver import PerThreadDriver
 from cloudless.providers.gce.log import logger
 from cloudless.types.common import Image
 
 
-class ImageClient:
+class ImageClient(PerThreadDriver):
     """
     Cloudless Image Client Object for GCE
 
@@ -19,7 +19,6 @@ class ImageClient:
 
     def __init__(self, credentials):
         self.credentials = credentials
-        self.driver = get_gce_driver(credentials)
 
     # pylint: disable=unused-argument
     def create(self, name, service):
@@ -0,0 +1,88 @@
+"""
+Cloudless Raw API Helpers on GCE
+
+Thin wrappers around the libcloud GCE connection for calls that the libcloud driver either doesn't
+expose or makes too expensive.  The libcloud list calls resolve every referenced object (zones,
+regions, networks, disks) with extra requests, which is fine for a handful of resources but not for
+a project with thousands of them.
+"""
+import time
+
+from cloudless.util.exceptions import OperationTimedOut, BadEnvironmentStateException
+
+# This is the maximum page size the GCE API allows for list calls.
+MAX_RESULTS = 500
+
+
+def list_items(driver, path, params=None):
+    """
+    Yields every item returned by the GCE list call at "path", following page tokens.
+    """
+    request_params = dict(params or {})
+    request_params["maxResults"] = MAX_RESULTS
+    while True:
+        response = driver.connection.request(path, method="GET", params=request_params).object
+        for item in response.get("items", []):
+            yield item
+        if "nextPageToken" not in response:
+            return
+        request_params["pageToken"] = response["nextPageToken"]
+
+
+def list_aggregated_items(driver, resource_type, params=None):
+    """
+    Yields every "resource_type" item across all zones or regions, using a single aggregated list
+    call rather than one call per zone or region.
+    """
+    request_params = dict(params or {})
+    request_params["maxResults"] = MAX_RESULTS
+    path = "/aggregated/%s" % resource_type
+    while True:
+        response = driver.connection.request(path, method="GET", params=request_params).object
+        for scoped_list in response.get("items", {}).values():
+            for item in scoped_list.get(resource_type, []):
+                yield item
+        if "nextPageToken" not in response:
+            return
+        request_params["pageToken"] = response["nextPageToken"]
+
+
+def get_item(driver, path):
+    """
+    Returns the raw resource at "path".  Raises ResourceNotFoundError if it doesn't exist.
+    """
+    return driver.connection.request(path, method="GET").object
+
+
+def wait_for_operations(driver, operations, poll_interval=2, timeout=180):
+    """
+    Waits for all the given GCE operations to finish.  Raises BadEnvironmentStateException if an
+    operation failed, or OperationTimedOut if they don't all finish within "timeout" seconds.
+    """
+    deadline = time.time() + timeout
+    pending = list(operations)
+    while pending:
+        still_pending = []
+        for operation in pending:
+            status = driver.connection.request(operation["selfLink"], method="GET").object
+            if status["status"] != "DONE":
+                still_pending.append(status)
+            elif "error" in status:
+                raise BadEnvironmentStateException("Operation on %s failed: %s" % (
+                    status.get("targetLink"), status["error"].get("errors")))
+        pending = still_pending
+        if pending:
+            if time.time() >= deadline:
+                raise OperationTimedOut("Timed out waiting for operations: %s" % (
+                    [operation.get("targetLink") for operation in pending]))
+            time.sleep(poll_interval)
+
+
+def resource_name(url):
+    """
+    Given a GCE resource URL, returns the short name of the resource, which is the last path
+    component.
+    """
+    if not url:
+        return None
+    return url.rstrip("/").split("/")[-1]
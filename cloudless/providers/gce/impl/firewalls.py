@@ -3,35 +3,60 @@ Firewalls Impl
 
 Helper utilities for dealing with google compute engine firewalls.
 """
+import collections
+
+from cloudless.providers.gce.driver import PerThreadDriver
+from cloudless.providers.gce.impl.api import list_items, wait_for_operations
 from cloudless.providers.gce.log import logger
 
 
-# pylint: disable=too-few-public-methods
-class Firewalls:
+class Firewalls(PerThreadDriver):
     """
     Class to manage GCE firewalls.
     """
 
-    def __init__(self, driver):
-        self.driver = driver
+    def __init__(self, credentials):
+        self.credentials = credentials
+
+    def firewalls_by_tag(self):
+        """
+        Returns a map from each network tag to the raw firewalls that reference it as a source or
+        target tag.  Build this once and pass it to "delete_firewalls" to avoid listing every
+        firewall in the project for each service.
+        """
+        # Use the raw API, since the libcloud call looks up the network of every firewall.
+        index = collections.defaultdict(list)
+        for firewall in list_items(self.driver, "/global/firewalls"):
+            tags = set(firewall.get("sourceTags", [])) | set(firewall.get("targetTags", []))
+            for tag in tags:
+                index[tag].append(firewall)
+        return index
 
     def delete_firewall(self, network_name, subnetwork_name):
         """
         Delete the firewall corresponding to the service described by "network_name" and
         "subnetwork_name".
         """
-        firewalls = self.driver.ex_list_firewalls()
-        tag = "%s-%s" % (network_name, subnetwork_name)
-        for firewall in firewalls:
-            if not firewall.source_tags and not firewall.target_tags:
-                continue
-            if firewall.source_tags:
-                if tag in firewall.source_tags:
-                    logger.info("Deleting firewall %s because of source tag: %s", firewall, tag)
-                    self.driver.ex_destroy_firewall(firewall)
-                    continue
-            if firewall.target_tags:
-                if tag in firewall.target_tags:
-                    logger.info("Deleting firewall %s because of target tag: %s", firewall, tag)
-                    self.driver.ex_destroy_firewall(firewall)
-                    continue
+        self.delete_firewalls(["%s-%s" % (network_name, subnetwork_name)])
+
+    def delete_firewalls(self, tags, firewalls_by_tag=None):
+        """
+        Delete every firewall that references any of "tags" as a source or target tag.  The
+        deletes all run at once, and this returns when they've all finished.
+        """
+        if firewalls_by_tag is None:
+            firewalls_by_tag = self.firewalls_by_tag()
+        firewalls = {}
+        for tag in tags:
+            for firewall in firewalls_by_tag.get(tag, []):
+                logger.info("Deleting firewall %s because of tag: %s", firewall["name"], tag)
+                firewalls[firewall["name"]] = firewall
+        operations = [self.driver.connection.request("/global/firewalls/%s" % name,
+                                                     method="DELETE").object
+                      for name in firewalls]
+        wait_for_operations(self.driver, operations)
+        # Keep the index accurate, so the caller can keep using it.
+        for tag, tag_firewalls in firewalls_by_tag.items():
+            firewalls_by_tag[tag] = [firewall for firewall in tag_firewalls
+                                     if firewall["name"] not in firewalls]
+        return list(firewalls)
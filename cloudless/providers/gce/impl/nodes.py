@@ -0,0 +1,96 @@
+"""
+Cloudless Nodes on GCE
+
+Filtered node queries for the GCE service implementation.  The libcloud "list_nodes" call returns
+every instance in the project and looks up the boot disk of each one, so this instead queries each
+zone in the region with a server side name filter and builds lightweight libcloud nodes directly
+from the API response.
+"""
+import collections
+
+from libcloud.compute.base import Node
+from libcloud.compute.types import NodeState
+
+from cloudless.providers.gce.driver import PerThreadDriver
+from cloudless.providers.gce.impl.api import (list_items, list_aggregated_items,
+                                               resource_name)
+from cloudless.providers.gce.log import logger
+
+# Instances in a service are named "<network>-<service>-<index>", so this matches exactly one
+# service without also matching services that share a prefix.
+SERVICE_NODE_FILTER = 'name eq "%s-[0-9]+"'
+
+
+class Nodes(PerThreadDriver):
+    """
+    Finds the nodes belonging to services in a single region.
+    """
+
+    def __init__(self, credentials, region):
+        self.credentials = credentials
+        self.region = region
+        self._zones = None
+
+    def zones(self):
+        """
+        Returns the zones in this region.  Cached, since zones don't change under us.
+        """
+        if self._zones is None:
+            self._zones = [zone for zone in self.driver.ex_list_zones()
+                           if zone.name.startswith(self.region)]
+        return self._zones
+
+    def list_service_nodes(self, network_name, service_name):
+        """
+        Returns the nodes in service "service_name" in network "network_name".
+        """
+        full_subnetwork_name = "%s-%s" % (network_name, service_name)
+        params = {"filter": SERVICE_NODE_FILTER % full_subnetwork_name}
+        nodes = []
+        for zone in self.zones():
+            path = "/zones/%s/instances" % zone.name
+            for item in list_items(self.driver, path, params):
+                # Every instance we create is tagged with its subnetwork, so use that to make sure
+                # this isn't just an instance that happens to have a matching name.
+                if full_subnetwork_name not in item.get("tags", {}).get("items", []):
+                    logger.debug("Skipping untagged instance %s", item["name"])
+                    continue
+                nodes.append(self.to_node(item, zone))
+        return nodes
+
+    def list_nodes_by_tag(self):
+        """
+        Returns all nodes in the project, in every zone, grouped by network tag.  This makes one
+        paginated API call no matter how many services there are.
+        """
+        nodes_by_tag = collections.defaultdict(list)
+        for item in list_aggregated_items(self.driver, "instances"):
+            zone = self.driver.ex_get_zone(resource_name(item["zone"]))
+            node = self.to_node(item, zone)
+            for tag in node.extra["tags"]:
+                nodes_by_tag[tag].append(node)
+        return nodes_by_tag
+
+    def to_node(self, item, zone):
+        """
+        Converts a raw instance returned by the GCE API into a libcloud node.  Only the fields
+        cloudless uses are filled in.
+        """
+        private_ips = []
+        public_ips = []
+        for network_interface in item.get("networkInterfaces", []):
+            private_ips.append(network_interface.get("networkIP"))
+            for access_config in network_interface.get("accessConfigs", []):
+                public_ips.append(access_config.get("natIP"))
+        extra = {
+            "zone": zone,
+            "selfLink": item.get("selfLink"),
+            "status": item.get("status", "UNKNOWN"),
+            "metadata": item.get("metadata", {}),
+            "tags": item.get("tags", {}).get("items", []),
+            "labels": item.get("labels"),
+            "networkInterfaces": item.get("networkInterfaces"),
+        }
+        state = self.driver.NODE_STATE_MAP.get(item.get("status"), NodeState.UNKNOWN)
+        return Node(id=item["id"], name=item["name"], state=state, public_ips=public_ips,
+                    private_ips=private_ips, driver=self.driver, extra=extra)
@@ -14,21 +14,26 @@ from libcloud.common.google import ResourceNotFoundError
 from cloudless.util.blueprint import ServiceBlueprint, NetworkBlueprint
 from cloudless.util.subnet_generator import generate_subnets
 from cloudless.util.exceptions import NotEnoughIPSpaceException
-from cloudless.providers.gce.driver import get_gce_driver
+from cloudless.providers.gce.driver import PerThreadDriver
+from cloudless.providers.gce.impl.api import (get_item, list_aggregated_items,
+                                               resource_name)
 from cloudless.providers.gce.log import logger
-from cloudless.providers.gce.schemas import canonicalize_subnetwork_info
+from cloudless.providers.gce.schemas import (canonicalize_subnetwork_info,
+                                             canonicalize_subnetwork_resource)
 
 DEFAULT_REGION = "us-east1"
 
+# Matches the subnetworks in a network, whose network field is the URL of the network.
+NETWORK_SUBNETWORK_FILTER = 'network eq ".*/global/networks/%s"'
 
-class SubnetworkClient:
+
+class SubnetworkClient(PerThreadDriver):
     """
     Client object to manage subnetworks.
     """
 
     def __init__(self, credentials):
         self.credentials = credentials
-        self.driver = get_gce_driver(credentials)
 
     def create(self, network_name, subnetwork_name, blueprint):
         """
@@ -64,11 +69,16 @@ class SubnetworkClient:
         """
         logger.info('Discovering subnetwork %s, %s', network.name, subnetwork_name)
         full_name = "%s-%s" % (network.name, subnetwork_name)
-        all_subnetworks = self.driver.ex_list_subnetworks()
-        subnets = [sn for sn in all_subnetworks if
-                   sn.network.name == network.name and
-                   sn.name == full_name]
-        return [canonicalize_subnetwork_info(sn) for sn in subnets]
+        # Fetch the one subnetwork by name rather than listing them all.  This also avoids the
+        # extra network and region lookups libcloud does for each subnetwork it returns.
+        try:
+            subnet = get_item(self.driver, "/regions/%s/subnetworks/%s" % (DEFAULT_REGION,
+                                                                            full_name))
+        except ResourceNotFoundError:
+            return []
+        if resource_name(subnet["network"]) != network.name:
+            return []
+        return [canonicalize_subnetwork_resource(subnet)]
 
     def destroy(self, network_name, subnetwork_name):
         """
@@ -96,23 +106,28 @@ class SubnetworkClient:
                 subnet_info))
         return destroy_results
 
-    def list(self):
+    def list(self, network_name=None):
         """
-        List all subnetworks.
+        List all subnetworks, or only the ones in "network_name" if it's set.
         """
         logger.info('Listing subnetworks')
-        subnets = self.driver.ex_list_subnetworks()
         subnets_info = {}
-        for subnet in subnets:
-            if subnet.network.name == "default":
+        params = None
+        if network_name:
+            params = {"filter": NETWORK_SUBNETWORK_FILTER % network_name}
+        # Use the raw aggregated list, since the libcloud call looks up the network and region of
+        # every subnetwork it returns.
+        for subnet in list_aggregated_items(self.driver, "subnetworks", params):
+            network_name = resource_name(subnet["network"])
+            if network_name == "default":
                 continue
-            subnetwork_name = subnet.name.replace("%s-" % subnet.network.name, "")
-            if subnet.network.name not in subnets_info:
-                subnets_info[subnet.network.name] = {}
-            if subnetwork_name not in subnets_info[subnet.network.name]:
-                subnets_info[subnet.network.name][subnetwork_name] = []
-            subnets_info[subnet.network.name][subnetwork_name].append(
-                canonicalize_subnetwork_info(subnet))
+            subnetwork_name = subnet["name"].replace("%s-" % network_name, "")
+            if network_name not in subnets_info:
+                subnets_info[network_name] = {}
+            if subnetwork_name not in subnets_info[network_name]:
+                subnets_info[network_name][subnetwork_name] = []
+            subnets_info[network_name][subnetwork_name].append(
+                canonicalize_subnetwork_resource(subnet))
         logger.info('Found subnetworks: %s', subnets_info)
         return subnets_info
 
@@ -6,12 +6,12 @@ level containers for groups of instances/services.  This is the GCE implementati
 """
 from libcloud.common.google import ResourceNotFoundError
 
-from cloudless.providers.gce.driver import get_gce_driver
+from cloudless.providers.gce.driver import PerThreadDriver
 from cloudless.providers.gce.log import logger
 from cloudless.providers.gce.schemas import canonicalize_network_info
 
 
-class NetworkClient:
+class NetworkClient(PerThreadDriver):
     """
     Cloudless Network Client Object for GCE
 
@@ -20,7 +20,6 @@ class NetworkClient:
 
     def __init__(self, credentials):
         self.credentials = credentials
-        self.driver = get_gce_driver(credentials)
 
     # pylint: disable=unused-argument
     def create(self, name, blueprint):
@@ -60,5 +59,12 @@ class NetworkClient:
         """
         List all networks.
         """
-        return [canonicalize_network_info(network) for network in self.driver.ex_list_networks() if
-                network.name != "default"]
+        return list(self.iterate())
+
+    def iterate(self):
+        """
+        Yield each network.
+        """
+        for network in self.driver.ex_list_networks():
+            if network.name != "default":
+                yield canonicalize_network_info(network)
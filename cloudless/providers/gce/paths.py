@@ -6,7 +6,8 @@ services, doing the conversion to firewalls and firewall rules.
 """
 import ipaddress
 from libcloud.common.google import ResourceNotFoundError
-from cloudless.providers.gce.driver import get_gce_driver
+from cloudless.providers.gce.driver import PerThreadDriver
+from cloudless.providers.gce.impl.api import list_items
 from cloudless.providers.gce.log import logger
 from cloudless.types.networking import CidrBlock
 from cloudless.util.exceptions import DisallowedOperationException, BadEnvironmentStateException
@@ -14,15 +15,33 @@ from cloudless.util.public_blocks import get_public_blocks
 from cloudless.providers.gce.service import ServiceClient
 from cloudless.types.common import Path, Subnetwork, Service
 
+# Matches the firewalls in a network, whose network field is the URL of the network.
+NETWORK_FIREWALL_FILTER = 'network eq ".*/global/networks/%s"'
 
-class PathsClient:
+
+def _firewall_paths(destination, source, firewall):
+    """
+    Returns a path from "source" to "destination" for each port the raw "firewall" allows.
+    """
+    return [Path(destination.network, source, destination, "tcp", port)
+            for rule in firewall.get("allowed", []) for port in rule.get("ports", [])]
+
+
+def _cidr_block_service(source_ranges):
+    # We treat an explicit CIDR block as a special case of a service with no name.
+    return Service(network=None, name=None, subnetworks=[
+        Subnetwork(subnetwork_id=None, name=None, cidr_block=source_range, region=None,
+                   availability_zone=None, instances=[])
+        for source_range in source_ranges])
+
+
+class PathsClient(PerThreadDriver):
     """
     Client object to interact with paths between resources.
     """
 
     def __init__(self, credentials):
         self.credentials = credentials
-        self.driver = get_gce_driver(credentials)
         self.service = ServiceClient(credentials)
 
     # pylint: disable=no-self-use
@@ -38,7 +57,7 @@ class PathsClient:
                 "Either destination or source must be a cloudless.types.networking.Service object")
 
         if (isinstance(source, Service) and isinstance(destination, Service) and
-                source.network != destination.network):
+                source.network.key != destination.network.key):
             raise DisallowedOperationException(
                 "Destination and source must be in the same network if specified as services")
 
@@ -139,14 +158,24 @@ class PathsClient:
             return self.driver.ex_destroy_firewall(firewall)
         return self.driver.ex_update_firewall(firewall)
 
-    def list(self):
+    def list(self, services=None):
+        """
+        List all paths in a dictionary structure.  If "services" is given, it's used instead of
+        listing services again.
+        """
+        return list(self.iterate(services))
+
+    def iterate(self, services=None):
         """
-        List all paths in a dictionary structure.
+        Yield each path, one firewall at a time.  If "services" is given, it's used instead of
+        listing services again.
         """
         firewalls = self.driver.ex_list_firewalls()
 
         tag_to_service = {}
-        for service in self.service.list():
+        if services is None:
+            services = self.service.list()
+        for service in services:
             service_tag = "%s-%s" % (service.network.name, service.name)
             if service_tag in tag_to_service:
                 raise BadEnvironmentStateException(
@@ -192,47 +221,101 @@ class PathsClient:
                     (firewall.target_ranges, firewall))
             return paths
 
+        for firewall in firewalls:
+            yield from handle_targets(tag_to_service, firewall)
+
+    def list_for(self, service):
+        """
+        List the paths to and from "service".  Only the firewalls and subnetworks in the network of
+        the service are fetched, and services aren't listed at all, so this doesn't depend on how
+        many services there are in other networks.
+
+        The services on the other end of each path have their network, name and subnetworks set,
+        but their subnetworks have no instances.
+        """
+        service_tag = "%s-%s" % (service.network.name, service.name)
+        params = {"filter": NETWORK_FIREWALL_FILTER % service.network.name}
+        firewalls = []
+        for firewall in list_items(self.driver, "/global/firewalls", params):
+            if firewall.get("targetRanges"):
+                raise BadEnvironmentStateException(
+                    "Found target ranges %s in firewall %s but they are not supported" %
+                    (firewall["targetRanges"], firewall["name"]))
+            if service_tag in firewall.get("sourceTags", []) + firewall.get("targetTags", []):
+                firewalls.append(firewall)
+        tag_to_service = self._tag_to_service(service, firewalls)
+
         paths = []
         for firewall in firewalls:
-            paths.extend(handle_targets(tag_to_service, firewall))
+            if service_tag in firewall.get("targetTags", []):
+                for source_tag in firewall.get("sourceTags", []):
+                    if source_tag in tag_to_service:
+                        paths.extend(_firewall_paths(service, tag_to_service[source_tag],
+                                                     firewall))
+                if firewall.get("sourceRanges"):
+                    paths.extend(_firewall_paths(
+                        service, _cidr_block_service(firewall["sourceRanges"]), firewall))
+            if service_tag in firewall.get("sourceTags", []):
+                for target_tag in firewall.get("targetTags", []):
+                    # Paths from the service to itself were already added above.
+                    if target_tag in tag_to_service and target_tag != service_tag:
+                        paths.extend(_firewall_paths(tag_to_service[target_tag], service,
+                                                     firewall))
         return paths
 
+    def _tag_to_service(self, service, firewalls):
+        """
+        Returns a map from each service tag in "firewalls" to the service in the network of
+        "service" that it stands for.  The subnetworks of the other services are looked up with a
+        single listing of the subnetworks in the network, and only if there are other services.
+        """
+        tag_prefix = "%s-" % service.network.name
+        tag_to_service = {"%s%s" % (tag_prefix, service.name): service}
+        other_tags = {tag for firewall in firewalls
+                      for tag in firewall.get("sourceTags", []) + firewall.get("targetTags", [])
+                      if tag.startswith(tag_prefix) and tag not in tag_to_service}
+        if not other_tags:
+            return tag_to_service
+        network_subnetworks = self.service.subnetwork.list(service.network.name).get(
+            service.network.name, {})
+        for tag in other_tags:
+            name = tag[len(tag_prefix):]
+            tag_to_service[tag] = Service(network=service.network, name=name,
+                                          subnetworks=network_subnetworks.get(name, []))
+        return tag_to_service
+
     def internet_accessible(self, service, port):
         """
         Return true if the given network is internet accessible.
         """
-        paths = self.list()
+        paths_by_destination = self._paths_by_destination(self.list_for(service))
         for public_block in get_public_blocks():
             source = CidrBlock(public_block)
             self._validate_args(source, service)
-            if self._has_access(paths, source, service, port):
+            if self._has_access(paths_by_destination, source, service, port):
                 return True
         return False
 
-    def _has_access(self, paths, source, destination, port):
-        def cidr_block_access(path, source, destination, port):
-            cidr_block = str(source.cidr_block)
-            for subnet in path.source.subnetworks:
-                if (ipaddress.IPv4Network(subnet.cidr_block).overlaps(
-                        ipaddress.IPv4Network(cidr_block)) and
-                        path.destination == destination and
-                        int(path.port) == port and
-                        path.protocol == "tcp"):
-                    return True
-            return False
-
-        def service_access(path, source, destination, port):
-            if (path.source == source and path.destination == destination and int(path.port) == port
-                    and path.protocol == "tcp"):
-                return True
-            return False
-
+    # pylint: disable=no-self-use
+    def _paths_by_destination(self, paths):
+        paths_by_destination = {}
         for path in paths:
-            if (isinstance(source, Service) and service_access(path, source, destination, port)):
-                return True
-            if (isinstance(source, CidrBlock) and cidr_block_access(path, source, destination,
-                                                                    port)):
-                return True
+            paths_by_destination.setdefault(path.destination_key, []).append(path)
+        return paths_by_destination
+
+    # pylint: disable=no-self-use
+    def _has_access(self, paths_by_destination, source, destination, port):
+        # Compare keys rather than whole services, since services can have many subnetworks and
+        # instances.
+        paths = [path for path in paths_by_destination.get(destination.key, [])
+                 if int(path.port) == port and path.protocol == "tcp"]
+        if isinstance(source, Service):
+            return any(path.source_key == source.key for path in paths)
+        if isinstance(source, CidrBlock):
+            for path in paths:
+                for subnet in path.source.subnetworks:
+                    if ipaddress.IPv4Network(subnet.cidr_block).overlaps(source.cidr_block):
+                        return True
         return False
 
     def has_access(self, source, destination, port):
@@ -241,6 +324,9 @@ class PathsClient:
         """
         logger.debug('Looking for path from %s to %s on port %s', source, destination, 80)
         self._validate_args(source, destination)
-        paths = self.list()
+        if isinstance(destination, Service):
+            paths = self.list_for(destination)
+        else:
+            paths = self.list_for(source)
         logger.debug('Found paths %s', paths)
-        return self._has_access(paths, source, destination, port)
+        return self._has_access(self._paths_by_destination(paths), source, destination, port)
@@ -2,6 +2,7 @@
 Schemas of the results returned by various API calls for GCE.
 """
 import re
+from cloudless.providers.gce.impl.api import resource_name
 from cloudless.types.common import Network, Subnetwork, Instance
 
 def canonicalize_network_info(network):
@@ -22,6 +23,18 @@ def canonicalize_subnetwork_info(subnetwork):
         availability_zone=None,
         instances=[])
 
+def canonicalize_subnetwork_resource(subnetwork):
+    """
+    Convert a raw subnetwork resource returned from the GCE API into the cloudless standard format.
+    """
+    return Subnetwork(
+        subnetwork_id=subnetwork["id"],
+        name=subnetwork["name"],
+        cidr_block=subnetwork["ipCidrRange"],
+        region=resource_name(subnetwork["region"]),
+        availability_zone=None,
+        instances=[])
+
 def canonicalize_instance_info(node):
     """
     Convert what is returned from GCE into the cloudless standard format.
@@ -3,18 +3,20 @@ Cloudless Service on GCE
 
 This is the GCE implmentation for the service API, a high level interface to manage services.
 """
-import ipaddress
 import itertools
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-from cloudless.providers.gce.driver import get_gce_driver
+from cloudless.providers.gce.driver import PerThreadDriver
 
 from cloudless.util.blueprint import ServiceBlueprint
 from cloudless.util.instance_fitter import get_fitting_instance
 from cloudless.util.exceptions import DisallowedOperationException
+from cloudless.util.subnet_index import SubnetIndex
 from cloudless.providers.gce.impl import subnetwork
 from cloudless.providers.gce.network import NetworkClient
 from cloudless.providers.gce.impl.firewalls import Firewalls
+from cloudless.providers.gce.impl.nodes import Nodes
 from cloudless.providers.gce.log import logger
 from cloudless.providers.gce.schemas import (canonicalize_instance_info,
                                              canonicalize_node_size)
@@ -22,18 +24,21 @@ from cloudless.types.common import Service
 
 DEFAULT_REGION = "us-east1"
 
+# Maximum number of instances to create at once.
+MAX_CONCURRENT_OPERATIONS = 10
 
-class ServiceClient:
+
+class ServiceClient(PerThreadDriver):
     """
     Client object to manage services.
     """
 
     def __init__(self, credentials):
         self.credentials = credentials
-        self.driver = get_gce_driver(credentials)
         self.subnetwork = subnetwork.SubnetworkClient(credentials)
         self.network = NetworkClient(credentials)
-        self.firewalls = Firewalls(self.driver)
+        self.firewalls = Firewalls(credentials)
+        self.nodes = Nodes(credentials, DEFAULT_REGION)
 
     # pylint: disable=too-many-arguments, too-many-locals
     def create(self, network, service_name, blueprint, template_vars, count):
@@ -67,21 +72,32 @@ class ServiceClient:
 
         image = get_image(instances_blueprint.image())
         instance_type = get_fitting_instance(self, instances_blueprint)
-        for availability_zone, instance_num in zip(itertools.cycle(availability_zones),
-                                                   range(0, instance_count)):
-            full_subnetwork_name = "%s-%s" % (network.name, service_name)
+        full_subnetwork_name = "%s-%s" % (network.name, service_name)
+        # Every instance gets the same startup script, so only render it once.
+        metadata = [
+            {"key": "startup-script", "value":
+             instances_blueprint.runtime_scripts(template_vars)},
+            {"key": "network", "value": network.name},
+            {"key": "subnetwork", "value": service_name}
+        ]
+
+        def create_instance(availability_zone, instance_num):
             instance_name = "%s-%s" % (full_subnetwork_name, instance_num)
-            metadata = [
-                {"key": "startup-script", "value":
-                 instances_blueprint.runtime_scripts(template_vars)},
-                {"key": "network", "value": network.name},
-                {"key": "subnetwork", "value": service_name}
-            ]
             logger.info('Creating instance %s in zone %s', instance_name, availability_zone.name)
-            self.driver.create_node(instance_name, instance_type, image, location=availability_zone,
-                                    ex_network=network.name, ex_subnetwork=full_subnetwork_name,
-                                    external_ip="ephemeral", ex_metadata=metadata,
-                                    ex_tags=[full_subnetwork_name])
+            # This runs in a worker thread, so "self.driver" is that thread's driver.
+            self.driver.create_node(instance_name, instance_type, image,
+                                    location=availability_zone, ex_network=network.name,
+                                    ex_subnetwork=full_subnetwork_name, external_ip="ephemeral",
+                                    ex_metadata=metadata, ex_tags=[full_subnetwork_name])
+
+        # Creating a node blocks until GCE reports it running, so create them in parallel.
+        max_workers = max(1, min(MAX_CONCURRENT_OPERATIONS, instance_count))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(create_instance, availability_zone, instance_num)
+                       for availability_zone, instance_num in zip(
+                           itertools.cycle(availability_zones), range(0, instance_count))]
+            for future in futures:
+                future.result()
         return self.get(network, service_name)
 
     def get(self, network, service_name):
@@ -90,74 +106,89 @@ class ServiceClient:
         """
         logger.debug('Discovering service %s, %s', network.name, service_name)
 
-        # 1. Get list of instances
-        instances = []
-        node_name = "%s-%s" % (network.name, service_name)
-        for node in self.driver.list_nodes():
-            if node.name.startswith(node_name):
-                instances.append(canonicalize_instance_info(node))
-
-        # 2. Get List Of Subnets
+        # 1. Get List Of Subnets
         subnetworks = self.subnetwork.get(network, service_name)
         if not subnetworks:
             return None
 
+        # 2. Get list of instances
+        nodes = self.nodes.list_service_nodes(network.name, service_name)
+
         # 3. Group Services By Subnet
-        for subnet_info in subnetworks:
-            for instance in instances:
-                if (instance.private_ip and ipaddress.IPv4Network(subnet_info.cidr_block).overlaps(
-                        ipaddress.IPv4Network(instance.private_ip))):
-                    subnet_info.instances.append(instance)
-        return Service(network=network, name=service_name, subnetworks=subnetworks)
+        return self._build_service(network, service_name, subnetworks, nodes)
 
     def destroy(self, service):
         """
         Destroy a service described by "service".
         """
-        logger.debug('Destroying service: %s', service)
-        destroy_results = []
-        for node in self.driver.list_nodes():
-            metadata = node.extra.get("metadata", {}).get("items", [])
-            node_network_name = None
-            node_subnetwork_name = None
-            for item in metadata:
-                logger.debug("Found metadata item %s for node %s", item, node)
-                if item["key"] == "network":
-                    node_network_name = item["value"]
-                if item["key"] == "subnetwork":
-                    node_subnetwork_name = item["value"]
-            if (service.network.name == node_network_name and
-                    service.name == node_subnetwork_name):
+        return self.destroy_many([service])[0]
+
+    def destroy_many(self, services):
+        """
+        Destroy all the services in "services".  Returns a list with the result for each service.
+        """
+        logger.debug('Destroying services: %s', services)
+        nodes_by_service = []
+        for service in services:
+            nodes = self.nodes.list_service_nodes(service.network.name, service.name)
+            for node in nodes:
                 logger.info('Destroying instance: %s', node.name)
-                destroy_results.append(self.driver.destroy_node(node))
-        subnetwork_destroy = self.subnetwork.destroy(service.network.name,
-                                                     service.name)
-        self.firewalls.delete_firewall(service.network.name, service.name)
-        return {"Subnetwork": subnetwork_destroy,
-                "Instances": destroy_results}
+            nodes_by_service.append(nodes)
+        # This issues all the deletes up front and then waits for them together.
+        all_nodes = [node for nodes in nodes_by_service for node in nodes]
+        all_destroy_results = []
+        if all_nodes:
+            all_destroy_results = self.driver.ex_destroy_multiple_nodes(all_nodes,
+                                                                        ignore_errors=False)
+        results = []
+        for service, nodes in zip(services, nodes_by_service):
+            destroy_results = all_destroy_results[:len(nodes)]
+            all_destroy_results = all_destroy_results[len(nodes):]
+            subnetwork_destroy = self.subnetwork.destroy(service.network.name,
+                                                         service.name)
+            results.append({"Subnetwork": subnetwork_destroy,
+                            "Instances": destroy_results})
+        # List the firewalls once for all the services, rather than once per service.
+        self.firewalls.delete_firewalls(["%s-%s" % (service.network.name, service.name)
+                                         for service in services])
+        return results
 
     def list(self):
         """
         List all instance groups.
         """
+        return list(self.iterate())
+
+    def iterate(self):
+        """
+        Yield each instance group.
+        """
         logger.debug('Listing services')
+        # Fetch everything up front and group it here, rather than calling "get" for every
+        # service, which would list the whole project each time.
+        networks = {network.name: network for network in self.network.list()}
         subnetworks = self.subnetwork.list()
-        services = []
+        nodes_by_tag = self.nodes.list_nodes_by_tag()
         for network_name, subnet_info in subnetworks.items():
             logger.debug("Subnets in network %s: %s", network_name, subnet_info)
-            for subnetwork_name, _ in subnet_info.items():
-                # Things might have changed from the time we listed the services, so skip if we
-                # can't find them anymore.
-                network = self.network.get(network_name)
-                if not network:
-                    logger.debug("Network %s not found!  %s", network_name, subnet_info)
-                    continue
-                service = self.get(network, subnetwork_name)
-                if not service:
-                    logger.debug("Service %s not found!  %s", subnetwork_name, subnet_info)
-                    continue
-                services.append(service)
-        return services
+            network = networks.get(network_name)
+            if not network:
+                logger.debug("Network %s not found!  %s", network_name, subnet_info)
+                continue
+            for subnetwork_name, service_subnetworks in subnet_info.items():
+                full_subnetwork_name = "%s-%s" % (network_name, subnetwork_name)
+                yield self._build_service(network, subnetwork_name, service_subnetworks,
+                                          nodes_by_tag.get(full_subnetwork_name, []))
+
+    # pylint: disable=no-self-use
+    def _build_service(self, network, service_name, subnetworks, nodes):
+        subnet_index = SubnetIndex(subnetworks)
+        for node in nodes:
+            instance = canonicalize_instance_info(node)
+            subnet_info = subnet_index.find(instance.private_ip)
+            if subnet_info:
+                subnet_info.instances.append(instance)
+        return Service(network=network, name=service_name, subnetworks=subnetworks)
 
     def _get_availability_zones(self):
         zones = self.driver.ex_list_zones()
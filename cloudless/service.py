@@ -7,6 +7,7 @@ subnetworks and groups of instances.
 from cloudless.log import logger
 from cloudless.providers import get_provider
 from cloudless.types.common import Network, Service
+from cloudless.types.frozen import thaw
 from cloudless.util.exceptions import DisallowedOperationException
 
 class ServiceClient:
@@ -57,9 +58,10 @@ class ServiceClient:
                 "Network argument to create must be of type cloudless.types.common.Network")
         return self.service.create(network, service_name, blueprint, template_vars, count)
 
-    def get(self, network, service_name):
+    def get(self, network, service_name, snapshot=None):
         """
-        Get a service in "network" named "service_name".
+        Get a service in "network" named "service_name".  If "snapshot" is set, the service is
+        looked up in that `cloudless.types.snapshot.Snapshot` instead of on the provider.
 
         Example:
 
@@ -71,6 +73,8 @@ class ServiceClient:
         if not isinstance(network, Network):
             raise DisallowedOperationException(
                 "Network argument to get must be of type cloudless.types.common.Network")
+        if snapshot is not None:
+            return thaw(snapshot.service(network.name, service_name))
         return self.service.get(network, service_name)
 
     # pylint: disable=no-self-use
@@ -107,9 +111,30 @@ class ServiceClient:
                 "Service argument to destroy must be of type cloudless.types.common.Service")
         return self.service.destroy(service)
 
-    def list(self):
+    def destroy_many(self, services):
         """
-        List all services.
+        Destroy all the services in the "services" list.  This can be faster than destroying them
+        one at a time, since some providers share work between the services.
+
+        Example:
+
+            example_network = client.network.get("example")
+            client.service.destroy_many([service for service in client.service.list()
+                                         if service.network == example_network])
+
+        """
+        logger.debug('Destroying services %s', services)
+        for service in services:
+            if not isinstance(service, Service):
+                raise DisallowedOperationException(
+                    "Service arguments to destroy_many must be of type "
+                    "cloudless.types.common.Service")
+        return self.service.destroy_many(services)
+
+    def list(self, snapshot=None):
+        """
+        List all services.  If "snapshot" is set, the services in that
+        `cloudless.types.snapshot.Snapshot` are returned instead of listing them on the provider.
 
         Example:
 
@@ -117,8 +142,29 @@ class ServiceClient:
 
         """
         logger.debug('Listing services')
+        if snapshot is not None:
+            return thaw(snapshot.services)
         return self.service.list()
 
+    def iterate(self, snapshot=None):
+        """
+        Like `list`, but returns an iterator that yields each service as soon as it's discovered,
+        so callers can start on the first service before the last one is fetched.
+
+        Example:
+
+            for service in client.service.iterate():
+                print(service.name)
+
+        """
+        logger.debug('Iterating over services')
+        if snapshot is not None:
+            return iter(thaw(snapshot.services))
+        if not hasattr(self.service, "iterate"):
+            # Providers from other packages may only implement "list".
+            return iter(self.service.list())
+        return self.service.iterate()
+
     def node_types(self):
         """
         Get mapping of node types to the resources.
@@ -0,0 +1,181 @@
+# pylint: disable=too-few-public-methods
+"""
+Run the blueprint tester over many blueprints and providers at once.
+
+Each configuration in the matrix is a blueprint test configuration and a profile to test it with.
+They run in a pool of processes, each with its own state directory, so a full matrix takes about as
+long as its slowest blueprint rather than the sum of all of them.  The results can be written as a
+JUnit XML report for CI systems.
+"""
+import concurrent.futures
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+import traceback
+from xml.etree import ElementTree
+import attr
+import cloudless
+from cloudless.testutils.blueprint_tester import run_all
+from cloudless.util.log import logger
+
+DEFAULT_JOBS = 4
+
+
+@attr.s
+class MatrixConfiguration:
+    """
+    One blueprint test configuration to run with one profile.  "state_dir" is where the test saves
+    its state, and must be different for every configuration in a matrix.
+    """
+    config = attr.ib(type=str)
+    profile = attr.ib(type=str)
+    provider = attr.ib(type=str)
+    credentials = attr.ib(type=dict)
+    state_dir = attr.ib(type=str)
+
+
+@attr.s
+class MatrixResult:
+    """
+    The result of testing one configuration.  "error" is the formatted exception if it failed.
+    """
+    config = attr.ib(type=str)
+    profile = attr.ib(type=str)
+    duration = attr.ib(type=float)
+    error = attr.ib(type=str, default=None)
+
+    @property
+    def passed(self):
+        """
+        Whether the test passed.
+        """
+        return self.error is None
+
+
+def _state_dir_name(index, config, profile):
+    config_dir = os.path.basename(os.path.dirname(os.path.abspath(config)))
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", "%s-%s-%s" % (index, config_dir, profile))
+
+
+def get_matrix(configs, profiles, state_dir):
+    """
+    Returns a `MatrixConfiguration` for every pair of test configuration path in "configs" and
+    profile in "profiles", which is a map from profile name to a dictionary with "provider" and
+    "credentials".  Each gets its own state directory under "state_dir".
+    """
+    matrix = []
+    for config in configs:
+        for profile, profile_data in profiles.items():
+            matrix.append(MatrixConfiguration(
+                config=config, profile=profile, provider=profile_data["provider"],
+                credentials=profile_data.get("credentials", {}),
+                state_dir=os.path.join(state_dir, _state_dir_name(len(matrix), config, profile))))
+    return matrix
+
+
+def run_configuration(configuration):
+    """
+    Runs the full test of one `MatrixConfiguration` and returns its `MatrixResult`.  Meant to run
+    in a worker process.
+    """
+    # Worker processes start with a copy of the same random state, which would make them generate
+    # the same "unique" names for their test networks and services.
+    random.seed()
+    # Test fixtures are imported by module name from the blueprint directory, so undo the import
+    # afterwards in case this process tests another blueprint with a fixture of the same name.
+    # Everything else imported along the way, like the providers, stays loaded for the next test.
+    config_dir = os.path.join(os.path.dirname(os.path.abspath(configuration.config)), "")
+    previous_path = list(sys.path)
+    previous_modules = set(sys.modules)
+    start = time.time()
+    error = None
+    try:
+        client = cloudless.Client(provider=configuration.provider,
+                                  credentials=configuration.credentials)
+        run_all(client, configuration.config, configuration.state_dir)
+    # pylint: disable=broad-except
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        sys.path[:] = previous_path
+        for module_name in set(sys.modules) - previous_modules:
+            module_file = getattr(sys.modules[module_name], "__file__", None)
+            if module_file and os.path.abspath(module_file).startswith(config_dir):
+                del sys.modules[module_name]
+    return MatrixResult(config=configuration.config, profile=configuration.profile,
+                        duration=time.time() - start, error=error)
+
+
+def run_matrix(matrix, jobs=DEFAULT_JOBS, on_result=None):
+    """
+    Runs every `MatrixConfiguration` in "matrix", up to "jobs" at a time, and returns the results in
+    the same order.  Calls "on_result" with each `MatrixResult` as soon as it finishes.
+    """
+    results = [None] * len(matrix)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_configuration, configuration): index
+                   for index, configuration in enumerate(matrix)}
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            # pylint: disable=broad-except
+            except Exception:
+                # The worker itself died, for example if it was killed.
+                result = MatrixResult(config=matrix[index].config, profile=matrix[index].profile,
+                                      duration=0.0, error=traceback.format_exc())
+            logger.info("Finished testing %s with profile %s: %s", result.config, result.profile,
+                        "passed" if result.passed else "failed")
+            results[index] = result
+            if on_result:
+                on_result(result)
+    return results
+
+
+def run_blueprint_matrix(configs, profiles, jobs=DEFAULT_JOBS, state_dir=None, on_result=None):
+    """
+    Tests every configuration in "configs" with every profile in "profiles", and returns a list of
+    `MatrixResult`.  See `get_matrix` and `run_matrix`.  If "state_dir" isn't set, test state is
+    kept in a temporary directory that's removed afterwards.
+    """
+    if state_dir:
+        return run_matrix(get_matrix(configs, profiles, state_dir), jobs, on_result)
+    with tempfile.TemporaryDirectory(prefix="cloudless-matrix-") as temporary_state_dir:
+        return run_matrix(get_matrix(configs, profiles, temporary_state_dir), jobs, on_result)
+
+
+def write_junit_xml(results, out):
+    """
+    Writes "results", a list of `MatrixResult`, to the file object "out" as a JUnit XML report.
+    Each profile is a test suite, and each configuration tested with it is a test case.
+    """
+    testsuites = ElementTree.Element("testsuites", {
+        "name": "blueprint-matrix",
+        "tests": str(len(results)),
+        "failures": str(len([result for result in results if not result.passed])),
+        "time": "%.3f" % sum(result.duration for result in results)})
+    profiles = []
+    for result in results:
+        if result.profile not in profiles:
+            profiles.append(result.profile)
+    for profile in profiles:
+        profile_results = [result for result in results if result.profile == profile]
+        testsuite = ElementTree.SubElement(testsuites, "testsuite", {
+            "name": profile,
+            "tests": str(len(profile_results)),
+            "failures": str(len([result for result in profile_results if not result.passed])),
+            "time": "%.3f" % sum(result.duration for result in profile_results)})
+        for result in profile_results:
+            testcase = ElementTree.SubElement(testsuite, "testcase", {
+                "classname": profile,
+                "name": result.config,
+                "time": "%.3f" % result.duration})
+            if not result.passed:
+                failure = ElementTree.SubElement(testcase, "failure", {
+                    "message": result.error.strip().splitlines()[-1]})
+                failure.text = result.error
+    out.write(ElementTree.tostring(testsuites, encoding="unicode"))
+    out.write("\n")
@@ -2,7 +2,6 @@
 Test boilerplate for modules.
 """
 import os
-import time
 import sys
 import json
 import importlib
@@ -12,9 +11,11 @@ from cloudless.testutils.fixture import SetupInfo
 from cloudless.util.log import logger
 from cloudless.util.blueprint_test_configuration import BlueprintTestConfiguration
 from cloudless.util.exceptions import DisallowedOperationException
-from cloudless.testutils.ssh import generate_ssh_keypair
+from cloudless.testutils.ssh import generate_ssh_keypair, SSHExecutor
 from cloudless.types.networking import CidrBlock
 from cloudless.testutils.utils import generate_unique_name
+from cloudless.testutils.retry import retry_until, DEFAULT_INITIAL_DELAY
+from cloudless.testutils.network_pool import get_network_pool
 
 SCRIPT_PATH = os.path.dirname(os.path.abspath(__file__))
 NETWORK_BLUEPRINT = os.path.join(SCRIPT_PATH, "network.yml")
@@ -22,23 +23,18 @@ TEST_STATE_FILENAME = "blueprint-test-state.json"
 
 def call_with_retries(function, retry_count, retry_delay):
     """
-    Calls the given function with retries.  Also handles logging on each retry.
+    Calls the given function until it succeeds, for up to "retry_count" times "retry_delay"
+    seconds, and at least "retry_count" + 1 times no matter how long each call takes.  Polls
+    quickly at first and backs off to "retry_delay" between attempts, so this returns as soon as
+    the function succeeds.  See `cloudless.testutils.retry.retry_until`.
     """
     logger.debug("Calling function: %s with retry count: %s, retry_delay: %s",
                  function, retry_count, retry_delay)
-    retry = 0
-    while True:
-        logger.info("Attempt number: %s", retry)
-        retry = retry + 1
-        try:
-            return function()
-        # pylint: disable=broad-except
-        except Exception as verify_exception:
-            logger.info("Verify exception: %s", verify_exception)
-            time.sleep(float(retry_delay))
-            if retry > int(retry_count):
-                logger.info("Exceeded max retries!  Reraising last exception")
-                raise
+    retry_delay = float(retry_delay)
+    return retry_until(function, timeout=int(retry_count) * retry_delay,
+                       initial_delay=min(DEFAULT_INITIAL_DELAY, retry_delay),
+                       max_delay=retry_delay, retryable=Exception,
+                       min_attempts=int(retry_count) + 1)
 
 def get_blueprint_tester(client, base_dir, fixture_type, fixture_options):
     """
@@ -61,7 +57,7 @@ def save_state(state, config):
     Save test state so we can run each command independently.
     """
     if not os.path.exists(config.get_state_dir()):
-        os.mkdir(config.get_state_dir())
+        os.makedirs(config.get_state_dir())
     state_file_path = "%s/%s" % (config.get_state_dir(), TEST_STATE_FILENAME)
     state_json = json.dumps(state, indent=2, sort_keys=True)
     with open(state_file_path, "w") as state_file:
@@ -106,27 +102,44 @@ def get_state(config):
     with open(state_file_path, "r") as state_file:
         return json.loads(state_file.read())
 
-def setup(client, config):
+def renew_network_lease(client, state):
+    """
+    Renews the lease on the test network if it came from the network pool.
+    """
+    network_pool = get_network_pool(client)
+    if state.get("network_leased") and network_pool:
+        network_pool.renew(state["network_name"], state["network_lease_token"])
+
+def setup(client, config, state_dir=None):
     """
     Create all the boilerplate to spin up the service, and the service itself.
     """
     logger.debug("Running setup to test: %s", config)
-    config_obj = BlueprintTestConfiguration(config)
+    config_obj = BlueprintTestConfiguration(config, state_dir)
     state = get_state(config_obj)
     if state:
         raise DisallowedOperationException(
             "Found non empty state file: %s" % state)
-    network_name = generate_unique_name("test-network")
+    network_pool = get_network_pool(client)
+    lease_token = None
+    if network_pool:
+        logger.debug("Leasing test network from pool: %s", network_pool.pool_file)
+        network, lease_token = network_pool.lease()
+        network_name = network.name
+    else:
+        network_name = generate_unique_name("test-network")
     service_name = generate_unique_name("test-service")
     key_pair = generate_ssh_keypair()
     state = {"network_name": network_name, "service_name": service_name, "public_key":
-             key_pair.public_key, "private_key": key_pair.private_key}
+             key_pair.public_key, "private_key": key_pair.private_key,
+             "network_leased": bool(network_pool), "network_lease_token": lease_token}
     logger.debug("Saving state: %s now in case something fails", state)
     save_state(state, config_obj)
     save_key_pair(key_pair, config_obj)
 
-    logger.debug("Creating test network: %s", network_name)
-    network = client.network.create(network_name, NETWORK_BLUEPRINT)
+    if not network_pool:
+        logger.debug("Creating test network: %s", network_name)
+        network = client.network.create(network_name, NETWORK_BLUEPRINT)
 
     logger.debug("Calling the pre service setup in test fixture")
     blueprint_tester = get_blueprint_tester(client, config_obj.get_config_dir(),
@@ -173,13 +186,14 @@ def setup(client, config):
     logger.debug("Test service instances: %s", client.service.get_instances(service))
     return (service, state["ssh_username"], private_key_path(config_obj))
 
-def verify(client, config):
+def verify(client, config, state_dir=None):
     """
     Verify that the instances are behaving as expected.
     """
     logger.debug("Running verify on: %s", config)
-    config_obj = BlueprintTestConfiguration(config)
+    config_obj = BlueprintTestConfiguration(config, state_dir)
     state = get_state(config_obj)
+    renew_network_lease(client, state)
     blueprint_tester = get_blueprint_tester(client, config_obj.get_config_dir(),
                                             config_obj.get_verify_fixture_type(),
                                             config_obj.get_verify_fixture_options())
@@ -187,16 +201,18 @@ def verify(client, config):
                            state["setup_info"]["blueprint_vars"])
     network = client.network.get(state["network_name"])
     service = client.service.get(network, state["service_name"])
-    blueprint_tester.verify(network, service, setup_info)
+    with SSHExecutor(state["ssh_username"], private_key_path(config_obj)) as ssh:
+        blueprint_tester.ssh = ssh
+        blueprint_tester.verify(network, service, setup_info)
     logger.info("Verify successful!")
     return (service, state["ssh_username"], private_key_path(config_obj))
 
-def load_config_for_cli(client, config):
+def load_config_for_cli(client, config, state_dir=None):
     """
     Try to load the configuration for an existing
     """
     logger.debug("Running load_config_for_cli on: %s", config)
-    config_obj = BlueprintTestConfiguration(config)
+    config_obj = BlueprintTestConfiguration(config, state_dir)
     state = get_state(config_obj)
     if not state:
         return None
@@ -204,35 +220,39 @@ def load_config_for_cli(client, config):
     service = client.service.get(network, state["service_name"])
     return (service, state["ssh_username"], private_key_path(config_obj))
 
-def teardown(client, config):
+def teardown(client, config, state_dir=None):
     """
     Destroy all services in this network, and destroy the network.
     """
     logger.debug("Running teardown on: %s", config)
-    config_obj = BlueprintTestConfiguration(config)
+    config_obj = BlueprintTestConfiguration(config, state_dir)
     state = get_state(config_obj)
     if not state or "network_name" not in state:
         return
-    all_services = client.service.list()
-    for service in all_services:
-        if service.network.name == state["network_name"]:
-            client.service.destroy(service)
-    network = client.network.get(state["network_name"])
-    if network:
-        client.network.destroy(network)
+    network_pool = get_network_pool(client)
+    if state.get("network_leased") and network_pool:
+        # Only remove the services, and give the network back to the pool.
+        network_pool.release(state["network_name"], state["network_lease_token"])
+    else:
+        all_services = client.service.list()
+        client.service.destroy_many([service for service in all_services
+                                     if service.network.name == state["network_name"]])
+        network = client.network.get(state["network_name"])
+        if network:
+            client.network.destroy(network)
     save_state({}, config_obj)
     remove_key_pair(config_obj)
 
-def run_all(client, config):
+def run_all(client, config, state_dir=None):
     """
-    Test blueprint.
+    Test blueprint.  Saves state in "state_dir" if it's set, instead of next to the configuration.
     """
     tests_passed = False
     try:
-        setup(client, config)
-        verify(client, config)
+        setup(client, config, state_dir)
+        verify(client, config, state_dir)
         tests_passed = True
     finally:
-        teardown(client, config)
+        teardown(client, config, state_dir)
     if tests_passed:
         logger.info("All tests passed!")
@@ -22,6 +22,11 @@ class BlueprintTestInterface:
     make it importable from the root of your blueprint directory.
 
     The teardown is handled automatically by the test runner.
+
+    During verify, "self.ssh" is a `cloudless.testutils.ssh.SSHExecutor` that
+    logs in as the test user, so checks can run on every instance of the
+    service at once.  It is None outside of verify, or if the test runner did
+    not set one up.
     """
     def __init__(self, client):
         """
@@ -30,6 +35,7 @@ class BlueprintTestInterface:
         state.
         """
         self.client = client
+        self.ssh = None
 
     def setup_before_tested_service(self, network):
         """
@@ -5,10 +5,10 @@ import os
 import subprocess
 import json
 from functools import partial
-import paramiko
 from cloudless.util.log import logger
 from cloudless.testutils.utils import generate_unique_name
-from cloudless.testutils.ssh import generate_ssh_keypair
+from cloudless.testutils.network_pool import get_network_pool
+from cloudless.testutils.ssh import generate_ssh_keypair, SSHExecutor
 from cloudless.types.networking import CidrBlock
 from cloudless.util.exceptions import DisallowedOperationException
 
@@ -117,13 +117,20 @@ class ImageBuilder:
         self.filesystem.remove(self.private_key_path)
         self.filesystem.remove(self.public_key_path)
 
+    def _renew_network_lease(self, state):
+        """
+        Renews the lease on the build network if it came from the network pool.
+        """
+        network_pool = get_network_pool(self.client)
+        if state.get("network_leased") and network_pool:
+            network_pool.renew(state["network"], state["network_lease_token"])
+
     def deploy(self):
         """
         Deploy: Deploys the image on the cloud provider.
         """
-        # 1. Deploy a temporary network
+        # 1. Deploy a temporary network, or lease one if there's a network pool
         state = {}
-        state["network"] = generate_unique_name("image-build")
         state["service"] = "image-build"
 
         # Save state first in case something fails
@@ -132,8 +139,16 @@ class ImageBuilder:
                 "Called deploy but found existing state %s in state file %s" % (
                     state,
                     self.state_file))
-        self._save_state(state)
-        network = self.client.network.create(state["network"], NETWORK_BLUEPRINT)
+        network_pool = get_network_pool(self.client)
+        if network_pool:
+            network, state["network_lease_token"] = network_pool.lease()
+            state["network"] = network.name
+            state["network_leased"] = True
+            self._save_state(state)
+        else:
+            state["network"] = generate_unique_name("image-build")
+            self._save_state(state)
+            network = self.client.network.create(state["network"], NETWORK_BLUEPRINT)
 
         # 2. Create temporary ssh keys
         keypair = generate_ssh_keypair()
@@ -170,6 +185,7 @@ class ImageBuilder:
                 "Called configure but found no state at %s.  Call deploy first." % (
                     self.state_file))
         logger.debug("Loaded state: %s", state)
+        self._renew_network_lease(state)
 
         network = self.client.network.get(state["network"])
         if not network:
@@ -200,6 +216,7 @@ class ImageBuilder:
                 "Called check but found no state at %s.  Call deploy first." % (
                     self.state_file))
         logger.debug("Loaded state: %s", state)
+        self._renew_network_lease(state)
 
         network = self.client.network.get(state["network"])
         if not network:
@@ -233,6 +250,7 @@ class ImageBuilder:
                 "Called save but found no state at %s.  Call deploy first." % (
                     self.state_file))
         logger.debug("Loaded state: %s", state)
+        self._renew_network_lease(state)
 
         network = self.client.network.get(state["network"])
         if not network:
@@ -251,27 +269,20 @@ class ImageBuilder:
 
         # 2. Remove test keys
         if not mock:
-            ssh = paramiko.SSHClient()
-            ssh_key = paramiko.RSAKey(file_obj=open(state["ssh_private_key"]))
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(hostname=public_ip, username=state["ssh_username"], pkey=ssh_key)
-
             # This removes all permissions from the temporary user's home directory and sets the
             # account to expire immediately.  We unfortunately can't completely delete this
             # temporary account because we are currently logged in.
-            def try_run(client, cmd):
-                logger.info("running '%s'", cmd)
-                _, stdout, stderr = client.exec_command(cmd)
-                exit_status = stdout.channel.recv_exit_status()
-                if exit_status:
-                    raise Exception("Failed to delete image build user on image: %s.  "
-                                    "Exit code: %s." % (stderr.read(), exit_status))
-                logger.debug("Stdout: %s", stdout.read())
-            try_run(ssh, 'cd /tmp')
-            try_run(ssh, 'sudo chmod -R 000 /home/%s/' % state["ssh_username"])
-            try_run(ssh, 'sudo usermod --expiredate 1 %s' % state["ssh_username"])
+            with SSHExecutor(state["ssh_username"], state["ssh_private_key"]) as ssh:
+                for cmd in ['cd /tmp',
+                            'sudo chmod -R 000 /home/%s/' % state["ssh_username"],
+                            'sudo usermod --expiredate 1 %s' % state["ssh_username"]]:
+                    logger.info("running '%s'", cmd)
+                    result = ssh.run(public_ip, cmd)
+                    if not result.succeeded:
+                        raise Exception("Failed to delete image build user on image: %s.  "
+                                        "Exit code: %s." % (result.stderr, result.exit_status))
+                    logger.debug("Stdout: %s", result.stdout)
             logger.info("Deleted test user: %s", state["ssh_username"])
-            ssh.close()
 
         # 3. Save the image with the correct name
         logger.debug("Saving service %s with name: %s", service.name, self.config.get_image_name())
@@ -289,14 +300,17 @@ class ImageBuilder:
         if not self._load_state():
             return True
 
-        # 2. Tear everything down
-        all_services = self.client.service.list()
-        for service in all_services:
-            if service.network.name == state["network"]:
-                self.client.service.destroy(service)
-        network = self.client.network.get(state["network"])
-        if network:
-            self.client.network.destroy(network)
+        # 2. Tear everything down, except a network leased from the pool
+        network_pool = get_network_pool(self.client)
+        if state.get("network_leased") and network_pool:
+            network_pool.release(state["network"], state["network_lease_token"])
+        else:
+            all_services = self.client.service.list()
+            self.client.service.destroy_many([service for service in all_services
+                                              if service.network.name == state["network"]])
+            network = self.client.network.get(state["network"])
+            if network:
+                self.client.network.destroy(network)
         self._save_state({})
         self._remove_keypair()
         return True
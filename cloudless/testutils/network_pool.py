@@ -0,0 +1,215 @@
+"""
+A pool of test networks that are created ahead of time and leased out to tests.
+
+Creating and destroying a network for every test run adds minutes of churn, so the blueprint tester
+and the image builder can lease a network from this pool instead.  A lease only lasts
+`DEFAULT_LEASE_DURATION` seconds, after which anyone can reclaim it, so networks leased by a test
+that crashed go back into the pool on their own.  Releasing a network, or reclaiming an expired one,
+destroys every service in it but leaves the network itself.  The blueprint tester and the image
+builder renew their lease at the start of each step, so only a single step that runs longer than
+the lease duration can lose its network.  Each lease has an owner token, so a holder whose lease
+was reclaimed can't renew or release the network out from under its new holder.
+
+The pool is off unless "CLOUDLESS_TEST_NETWORK_POOL" is set to a directory, where the leases are
+kept in one file per provider and credentials.  Set "CLOUDLESS_TEST_NETWORK_POOL_LEASE_DURATION" to
+change the lease duration in seconds.  Call `NetworkPool.fill` to create networks ahead of time, and
+`NetworkPool.drain` to destroy the ones that aren't leased.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from cloudless.testutils.utils import generate_unique_name
+from cloudless.util.exceptions import DisallowedOperationException
+from cloudless.util.log import logger
+
+POOL_ENVIRONMENT_VARIABLE = "CLOUDLESS_TEST_NETWORK_POOL"
+LEASE_DURATION_ENVIRONMENT_VARIABLE = "CLOUDLESS_TEST_NETWORK_POOL_LEASE_DURATION"
+
+SCRIPT_PATH = os.path.dirname(os.path.abspath(__file__))
+NETWORK_BLUEPRINT = os.path.join(SCRIPT_PATH, "network.yml")
+
+# In seconds.
+DEFAULT_LEASE_DURATION = 3600
+
+
+class NetworkPool:
+    """
+    A pool of test networks for the provider and credentials of "client", with leases saved in
+    "pool_dir".  Safe to use from many processes at once.
+    """
+    def __init__(self, client, pool_dir, lease_duration=DEFAULT_LEASE_DURATION):
+        self.client = client
+        self.pool_dir = pool_dir
+        self.lease_duration = lease_duration
+        credentials_hash = hashlib.sha256(
+            json.dumps(client.credentials, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        self.pool_file = os.path.join(pool_dir, "%s-%s.json" % (client.provider, credentials_hash))
+
+    @contextmanager
+    def _locked_leases(self):
+        """
+        Holds the lock on the pool while the caller reads or changes the leases, and saves them
+        afterwards.
+        """
+        if not os.path.exists(self.pool_dir):
+            os.makedirs(self.pool_dir, exist_ok=True)
+        with open(self.pool_file + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.pool_file) as pool_file:
+                        leases = json.load(pool_file)
+                except (OSError, ValueError):
+                    leases = {}
+                yield leases
+                with open(self.pool_file + ".tmp", "w") as pool_file:
+                    json.dump(leases, pool_file, indent=2, sort_keys=True)
+                os.replace(self.pool_file + ".tmp", self.pool_file)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _destroy_services(self, network_name):
+        services = [service for service in self.client.service.list()
+                    if service.network.name == network_name]
+        if services:
+            logger.info("Destroying %s services left in pooled network: %s", len(services),
+                        network_name)
+            self.client.service.destroy_many(services)
+
+    def lease(self):
+        """
+        Leases a network from the pool, creating a new one if none are free, and returns the
+        network and the owner token for the lease.  The token must be passed to `renew` and
+        `release`, and the network must be given back with `release` within the lease duration.
+        """
+        while True:
+            now = time.time()
+            token = uuid.uuid4().hex
+            with self._locked_leases() as leases:
+                free = sorted(name for name, lease in leases.items()
+                              if not lease["leased_until"] or lease["leased_until"] < now)
+                if not free:
+                    break
+                network_name = free[0]
+                expired = bool(leases[network_name]["leased_until"])
+                leases[network_name] = {"leased_until": now + self.lease_duration,
+                                        "owner": token}
+            network = self.client.network.get(network_name)
+            if not network:
+                # Destroyed outside the pool, or created by another process with the mock provider.
+                self.forget(network_name)
+                continue
+            if expired:
+                logger.info("Reclaiming expired lease on network: %s", network_name)
+                self._destroy_services(network_name)
+            logger.info("Leased pooled network: %s", network_name)
+            return network, token
+        return self._create(token)
+
+    def _create(self, token=None):
+        network_name = generate_unique_name("test-pool")
+        # Record the lease before creating the network, so it's reclaimed if creation fails
+        # partway.
+        with self._locked_leases() as leases:
+            leases[network_name] = {
+                "leased_until": time.time() + self.lease_duration if token else None,
+                "owner": token}
+        logger.info("Creating pooled network: %s", network_name)
+        return self.client.network.create(network_name, NETWORK_BLUEPRINT), token
+
+    # pylint: disable=no-self-use
+    def _check_owner(self, leases, network_name, token, now=None):
+        # Only "lease" and "drain" change the owner, so if the token still matches nobody else has
+        # the network, even if the lease ran out.
+        lease = leases.get(network_name)
+        if (not lease or lease.get("owner") != token or not lease["leased_until"]
+                or (now is not None and lease["leased_until"] < now)):
+            raise DisallowedOperationException(
+                "Lease on pooled network %s expired or is held by someone else, so it may have "
+                "been reclaimed." % network_name)
+        return lease
+
+    def renew(self, network_name, token):
+        """
+        Extends the lease on "network_name" for another lease duration.  Raises an exception if
+        the lease expired or "token" isn't its owner, since someone else may have reclaimed the
+        network.
+        """
+        now = time.time()
+        with self._locked_leases() as leases:
+            lease = self._check_owner(leases, network_name, token, now)
+            lease["leased_until"] = now + self.lease_duration
+
+    def release(self, network_name, token):
+        """
+        Destroys every service in the leased network "network_name" and gives it back to the pool.
+        Raises an exception, without destroying anything, if the lease expired or "token" isn't its
+        owner.
+        """
+        # Renewing checks the owner and keeps the lease from expiring while the services are
+        # destroyed.
+        self.renew(network_name, token)
+        self._destroy_services(network_name)
+        with self._locked_leases() as leases:
+            self._check_owner(leases, network_name, token)
+            leases[network_name] = {"leased_until": None, "owner": None}
+        logger.info("Released pooled network: %s", network_name)
+
+    def forget(self, network_name):
+        """
+        Removes "network_name" from the pool without destroying it.
+        """
+        with self._locked_leases() as leases:
+            leases.pop(network_name, None)
+
+    def list(self):
+        """
+        Returns a map from the name of every network in the pool to the time its lease ends, or None
+        if it's free.
+        """
+        with self._locked_leases() as leases:
+            return {name: lease["leased_until"] for name, lease in leases.items()}
+
+    def fill(self, count):
+        """
+        Creates networks until the pool has at least "count" of them.
+        """
+        for _ in range(count - len(self.list())):
+            self._create()
+
+    def drain(self):
+        """
+        Destroys every network in the pool that isn't leased.
+        """
+        now = time.time()
+        with self._locked_leases() as leases:
+            drained = [name for name, lease in leases.items()
+                       if not lease["leased_until"] or lease["leased_until"] < now]
+            for name in drained:
+                # Lease it to ourselves while we destroy it, so nobody else takes or releases it.
+                leases[name] = {"leased_until": now + self.lease_duration,
+                                "owner": uuid.uuid4().hex}
+        for name in drained:
+            self._destroy_services(name)
+            network = self.client.network.get(name)
+            if network:
+                self.client.network.destroy(network)
+            self.forget(name)
+        return drained
+
+
+def get_network_pool(client):
+    """
+    Returns the `NetworkPool` for "client" if the pool is turned on with
+    "CLOUDLESS_TEST_NETWORK_POOL", otherwise None.
+    """
+    pool_dir = os.environ.get(POOL_ENVIRONMENT_VARIABLE)
+    if not pool_dir:
+        return None
+    lease_duration = float(os.environ.get(LEASE_DURATION_ENVIRONMENT_VARIABLE,
+                                          DEFAULT_LEASE_DURATION))
+    return NetworkPool(client, pool_dir, lease_duration)
@@ -0,0 +1,90 @@
+# pylint: disable=too-few-public-methods
+"""
+Retry a check until it passes or a deadline is reached.
+
+Polls quickly at first and backs off exponentially, so a check that's about to pass is noticed
+within a fraction of a second, while one that's waiting on something slow, like an instance
+booting, doesn't hammer the provider.  Only exceptions classified as retryable are retried, and
+anything else is raised right away.
+"""
+import time
+import attr
+from cloudless.util.log import logger
+
+# In seconds.
+DEFAULT_INITIAL_DELAY = 0.5
+DEFAULT_MAX_DELAY = 10.0
+DEFAULT_BACKOFF = 2.0
+
+# Failed assertions are how checks in test fixtures fail, and OSError covers connection errors and
+# timeouts, including the ones raised by requests and paramiko.
+DEFAULT_RETRYABLE = (AssertionError, OSError)
+
+
+@attr.s
+class RetryReport:
+    """
+    How a call to `retry_until` went.  Times are in seconds.
+    """
+    attempts = attr.ib(type=int, default=0)
+    elapsed = attr.ib(type=float, default=0.0)
+    slept = attr.ib(type=float, default=0.0)
+    succeeded = attr.ib(type=bool, default=False)
+    last_exception = attr.ib(default=None)
+
+
+def _is_retryable(exception, retryable):
+    if isinstance(retryable, (type, tuple)):
+        return isinstance(exception, retryable)
+    return retryable(exception)
+
+
+# pylint: disable=too-many-arguments
+def retry_until(function, timeout, initial_delay=DEFAULT_INITIAL_DELAY,
+                max_delay=DEFAULT_MAX_DELAY, backoff=DEFAULT_BACKOFF, retryable=DEFAULT_RETRYABLE,
+                min_attempts=1, report=None):
+    """
+    Calls "function" until it returns without raising an exception, and returns what it returned.
+
+    Waits "initial_delay" seconds after the first failure, multiplying the wait by "backoff" after
+    each one up to "max_delay".  If "function" is still failing "timeout" seconds after the first
+    call, and has been called at least "min_attempts" times, reraises its last exception.  Setting
+    "min_attempts" makes sure a slow check, like a request that hangs until it times out, still
+    gets that many tries.  "retryable" is an exception type, a tuple of them, or a function that
+    takes an exception and returns whether to retry it.
+
+    If "report" is a `RetryReport`, it's filled in with the number of attempts and timing.
+    """
+    report = report if report is not None else RetryReport()
+    start = time.time()
+    deadline = start + float(timeout)
+    delay = float(initial_delay)
+    while True:
+        report.attempts += 1
+        try:
+            result = function()
+        # pylint: disable=broad-except
+        except Exception as exception:
+            report.last_exception = exception
+            report.elapsed = time.time() - start
+            remaining = deadline - time.time()
+            if not _is_retryable(exception, retryable):
+                logger.info("Not retrying %s after %s attempts in %.1fs: %r", function,
+                            report.attempts, report.elapsed, exception)
+                raise
+            if remaining <= 0 and report.attempts >= min_attempts:
+                logger.info("Gave up on %s after %s attempts in %.1fs: %r", function,
+                            report.attempts, report.elapsed, exception)
+                raise
+            wait = min(delay, remaining) if remaining > 0 else delay
+            logger.debug("Attempt %s of %s failed, retrying in %.1fs: %r", report.attempts,
+                         function, wait, exception)
+            time.sleep(wait)
+            report.slept += wait
+            delay = min(delay * float(backoff), float(max_delay))
+            continue
+        report.elapsed = time.time() - start
+        report.succeeded = True
+        logger.info("%s succeeded after %s attempts in %.1fs (%.1fs waiting)", function,
+                    report.attempts, report.elapsed, report.slept)
+        return result
@@ -22,9 +22,28 @@ installed on the image.  Because of that, this library does not do any cloud spe
 any frameworks that need SSH (like the blueprint test framework) must do it by passing predefined
 template variables to the startup script.  This minimizes the cloud specific configuration to only
 what is strictly necessary and lets the user control how to create those accounts.
+
+Once an account is set up, `SSHExecutor` runs commands on all the instances of a service at once.
 """
+import concurrent.futures
+import shlex
+import threading
+import time
 from Crypto.PublicKey import RSA
 import attr
+import paramiko
+from cloudless.util.exceptions import DisallowedOperationException
+from cloudless.util.log import logger
+
+# Commands are mostly waiting on the network, so this can be much higher than the number of cores.
+DEFAULT_MAX_WORKERS = 32
+
+# In seconds.
+DEFAULT_CONNECT_TIMEOUT = 30
+POLL_INTERVAL = 0.01
+
+# In bytes.
+READ_SIZE = 32768
 
 # pylint: disable=too-few-public-methods
 @attr.s
@@ -43,3 +62,164 @@ def generate_ssh_keypair():
     key = RSA.generate(2048)
     pubkey = key.publickey()
     return SSHKeyPair(pubkey.exportKey('OpenSSH').decode(), key.exportKey('PEM').decode())
+
+
+@attr.s
+class SSHResult:
+    """
+    The result of running a command on one host.  "duration" is in seconds.
+    """
+    host = attr.ib(type=str)
+    command = attr.ib(type=str)
+    exit_status = attr.ib(type=int)
+    stdout = attr.ib(type=str)
+    stderr = attr.ib(type=str)
+    duration = attr.ib(type=float)
+
+    @property
+    def succeeded(self):
+        """
+        Whether the command exited with status zero.
+        """
+        return self.exit_status == 0
+
+
+def _read_output(channel):
+    """
+    Reads standard output and standard error from "channel" together until the command exits.
+    Reading one fully before the other would block forever if the command filled the channel's
+    window on the other one.
+    """
+    stdout = []
+    stderr = []
+    while True:
+        # The exit status arrives after all the output, so once it's here and the buffers are
+        # empty there's nothing left to read.
+        exited = channel.exit_status_ready()
+        received = False
+        if channel.recv_ready():
+            stdout.append(channel.recv(READ_SIZE))
+            received = True
+        if channel.recv_stderr_ready():
+            stderr.append(channel.recv_stderr(READ_SIZE))
+            received = True
+        if exited and not received:
+            return b"".join(stdout), b"".join(stderr)
+        if not received:
+            time.sleep(POLL_INTERVAL)
+
+
+class SSHExecutor:
+    """
+    Runs commands over SSH on many hosts at once, as "username" with the private key at
+    "private_key_path".
+
+    Keeps one connection open per host and reuses it for every command, opening a new channel on it
+    for each one, so running many commands doesn't pay for the SSH handshake each time.  Call
+    `close` when done, or use this as a context manager.
+
+    "client_factory" creates the underlying connections, and only exists to make this more
+    testable.
+    """
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, username, private_key_path, max_workers=DEFAULT_MAX_WORKERS,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, client_factory=paramiko.SSHClient):
+        self.username = username
+        self.private_key_path = private_key_path
+        self.max_workers = max_workers
+        self.connect_timeout = connect_timeout
+        self.client_factory = client_factory
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.host_locks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _get_connection(self, host):
+        with self.lock:
+            host_lock = self.host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            connection = self.connections.get(host)
+            transport = connection.get_transport() if connection else None
+            if not transport or not transport.is_active():
+                logger.debug("Opening SSH connection to %s@%s", self.username, host)
+                connection = self.client_factory()
+                connection.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                with open(self.private_key_path) as private_key_file:
+                    ssh_key = paramiko.RSAKey(file_obj=private_key_file)
+                connection.connect(hostname=host, username=self.username, pkey=ssh_key,
+                                   timeout=self.connect_timeout)
+                self.connections[host] = connection
+            return connection
+
+    def run(self, host, command, stdin=None):
+        """
+        Runs "command" on "host" and returns an `SSHResult`.  If "stdin" is set, it's written to
+        the standard input of the command.
+        """
+        start = time.time()
+        connection = self._get_connection(host)
+        logger.debug("Running '%s' on %s", command, host)
+        command_stdin, command_stdout, _ = connection.exec_command(command)
+        if stdin is not None:
+            command_stdin.write(stdin.encode("utf-8"))
+            command_stdin.channel.shutdown_write()
+        stdout, stderr = _read_output(command_stdout.channel)
+        exit_status = command_stdout.channel.recv_exit_status()
+        return SSHResult(host=host, command=command, exit_status=exit_status,
+                         stdout=stdout.decode("utf-8", "replace"),
+                         stderr=stderr.decode("utf-8", "replace"), duration=time.time() - start)
+
+    def run_all(self, hosts, command, stdin=None):
+        """
+        Runs "command" on every host in "hosts" at the same time, and returns a list of
+        `SSHResult` in the same order as "hosts".  Raises the first error if any host can't be
+        reached.
+        """
+        if not hosts:
+            return []
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(hosts))) as executor:
+            futures = [executor.submit(self.run, host, command, stdin) for host in hosts]
+            return [future.result() for future in futures]
+
+    def run_script(self, hosts, script_path, args=None):
+        """
+        Runs the local script at "script_path" with "args" on every host in "hosts" at the same
+        time, by sending it to a shell's standard input.  Returns a list of `SSHResult`.
+        """
+        with open(script_path) as script_file:
+            script = script_file.read()
+        command = " ".join(["bash", "-s", "--"] + [shlex.quote(str(arg)) for arg in args or []])
+        return self.run_all(hosts, command, stdin=script)
+
+    def check_all(self, hosts, command):
+        """
+        Runs "command" on every host in "hosts" at the same time, and raises an exception with the
+        output of every host where it failed.  Returns the list of `SSHResult` if it succeeded
+        everywhere.
+        """
+        results = self.run_all(hosts, command)
+        failed = [result for result in results if not result.succeeded]
+        if failed:
+            raise DisallowedOperationException(
+                "Command '%s' failed on %s of %s hosts: %s" % (
+                    command, len(failed), len(results),
+                    "; ".join("%s exited with %s: %s" % (result.host, result.exit_status,
+                                                         result.stderr.strip())
+                              for result in failed)))
+        return results
+
+    def close(self):
+        """
+        Closes every open connection.
+        """
+        with self.lock:
+            connections = list(self.connections.values())
+            self.connections = {}
+        for connection in connections:
+            connection.close()
@@ -18,11 +18,10 @@ extract instances or subnetworks could be layered on top of this.
 """
 import os
 from typing import Optional
-import jsonref
 import attr
 from cloudless.model import Resource
 
-@attr.s
+@attr.s(slots=True, frozen=True)
 class Network:
     """
     Simple container to hold network information.
@@ -32,7 +31,14 @@ class Network:
     cidr_block = attr.ib(type=str, default=None)
     region = attr.ib(type=str, default=None)
 
-@attr.s
+    @property
+    def key(self):
+        """
+        Identifies this network.  Network names are unique within a provider.
+        """
+        return self.name
+
+@attr.s(slots=True)
 class Service:
     """
     Simple container to hold service information.
@@ -41,7 +47,18 @@ class Service:
     name = attr.ib(type=str)
     subnetworks = attr.ib(type=list)
 
-@attr.s
+    @property
+    def key(self):
+        """
+        Identifies this service.  Comparing keys is much cheaper than comparing whole services.
+        """
+        if self.name is None:
+            # Paths use a service with no name to represent a group of CIDR blocks, so use the
+            # blocks to identify it.
+            return (None, tuple(subnetwork.cidr_block for subnetwork in self.subnetworks))
+        return (self.network.key if self.network else None, self.name)
+
+@attr.s(slots=True)
 class Subnetwork:
     """
     Simple container to hold subnetwork information.
@@ -53,7 +70,14 @@ class Subnetwork:
     availability_zone = attr.ib(type=str)
     instances = attr.ib(type=list)
 
-@attr.s
+    @property
+    def key(self):
+        """
+        Identifies this subnetwork.
+        """
+        return (self.subnetwork_id, self.cidr_block)
+
+@attr.s(slots=True, frozen=True)
 class Instance:
     """
     Simple container to hold instance information.
@@ -64,7 +88,14 @@ class Instance:
     state = attr.ib(type=str)
     availability_zone = attr.ib(type=str)
 
-@attr.s
+    @property
+    def key(self):
+        """
+        Identifies this instance.
+        """
+        return self.instance_id
+
+@attr.s(slots=True)
 class Path:
     """
     Simple container to hold path information.
@@ -75,7 +106,30 @@ class Path:
     protocol = attr.ib(type=str)
     port = attr.ib(type=int)
 
-@attr.s
+    @property
+    def source_key(self):
+        """
+        Identifies the source of this path, which is either a service or a CIDR block.
+        """
+        return self.source.key
+
+    @property
+    def destination_key(self):
+        """
+        Identifies the destination of this path, which is either a service or a CIDR block.
+        """
+        return self.destination.key
+
+    @property
+    def key(self):
+        """
+        Identifies this path by its endpoints, protocol and port.  The port is compared as a
+        string, since providers return it as a number or a string, and AWS rules without a port,
+        like ones that allow all traffic, have the port "N/A".
+        """
+        return (self.source_key, self.destination_key, self.protocol, str(self.port))
+
+@attr.s(slots=True)
 class Image:
     """
     Simple container to hold image information.
@@ -102,10 +156,26 @@ def load_model(model_filename):
     schema_path = os.path.abspath("%s/../cloudless-core-model/models/%s" % (os.path.dirname(
         os.path.realpath(__file__)), model_filename))
     schema_uri = 'file://{}/'.format(os.path.dirname(schema_path))
+    # Imported here so that importing this module doesn't pay for it.
+    import jsonref
     with open(schema_path) as model_raw:
         model = jsonref.loads(model_raw.read(), base_uri=schema_uri, jsonschema=True)
     return model
 
+class LazySchema:
+    """
+    Descriptor for the "schema" attribute of a resource class.  The schema is loaded the first time
+    it's used rather than at import time, since resolving the references in it is slow.
+    """
+    def __init__(self, model_filename):
+        self.model_filename = model_filename
+        self.model = None
+
+    def __get__(self, instance, owner):
+        if self.model is None:
+            self.model = load_model(self.model_filename)
+        return self.model
+
 @attr.s(auto_attribs=True)
 class Firewall(Resource):
     """
@@ -118,7 +188,7 @@ class Firewall(Resource):
     source_instances: Optional[list] = None
     source_cidr_blocks: Optional[list] = None
     network: Optional[Selector] = None
-Firewall.schema = load_model("firewall.json")
+Firewall.schema = LazySchema("firewall.json")
 
 @attr.s(auto_attribs=True)
 class NetworkModel(Resource):
@@ -132,7 +202,7 @@ class NetworkModel(Resource):
     region: Optional[str] = None
     availability_zone: Optional[str] = None
     cidr_block: Optional[str] = None
-NetworkModel.schema = load_model("network.json")
+NetworkModel.schema = LazySchema("network.json")
 
 @attr.s(auto_attribs=True)
 class ImageModel(Resource):
@@ -143,7 +213,7 @@ class ImageModel(Resource):
     name: str
     id: Optional[str] = None
     creation_date: Optional[str] = None
-ImageModel.schema = load_model("image.json")
+ImageModel.schema = LazySchema("image.json")
 
 @attr.s(auto_attribs=True)
 class SubnetModel(Resource):
@@ -156,4 +226,4 @@ class SubnetModel(Resource):
     region: Optional[str] = None
     subnets: Optional[list] = None
     size: Optional[int] = 256
-SubnetModel.schema = load_model("subnet.json")
+SubnetModel.schema = LazySchema("subnet.json")
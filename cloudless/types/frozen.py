@@ -0,0 +1,135 @@
+# pylint: disable=too-few-public-methods
+"""
+Frozen types.
+
+Immutable, hashable versions of the common types, for holding large inventories and for putting
+services and paths in sets or using them as dictionary keys.
+
+These use slots and tuples to keep memory down, and every frozen object in a network shares a
+single `Network` object rather than each holding its own copy.  Equality and hashing use each
+object's identity key, for example the network and name of a service, rather than comparing every
+subnetwork and instance.
+
+Usage:
+
+    networks = {}
+    frozen_services = {freeze(service, networks) for service in client.service.list()}
+    service = thaw(next(iter(frozen_services)))
+"""
+import attr
+from cloudless.types.common import Network, Service, Subnetwork, Path
+
+
+class KeyComparable:
+    """
+    Mixin that compares and hashes objects of the same type by their "key" property.
+    """
+    __slots__ = ()
+
+    # Set by each class that uses this.
+    key = None
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+@attr.s(slots=True, frozen=True, eq=False)
+class FrozenSubnetwork(KeyComparable):
+    """
+    Frozen version of `cloudless.types.common.Subnetwork`.
+    """
+    subnetwork_id = attr.ib(type=str)
+    name = attr.ib(type=str)
+    cidr_block = attr.ib(type=str)
+    region = attr.ib(type=str)
+    availability_zone = attr.ib(type=str)
+    instances = attr.ib(type=tuple, converter=tuple)
+
+    key = Subnetwork.key
+
+
+@attr.s(slots=True, frozen=True, eq=False)
+class FrozenService(KeyComparable):
+    """
+    Frozen version of `cloudless.types.common.Service`.
+    """
+    network = attr.ib(type=Network)
+    name = attr.ib(type=str)
+    subnetworks = attr.ib(type=tuple, converter=tuple)
+
+    key = Service.key
+
+
+@attr.s(slots=True, frozen=True, eq=False)
+class FrozenPath(KeyComparable):
+    """
+    Frozen version of `cloudless.types.common.Path`.
+    """
+    network = attr.ib(type=Network)
+    source = attr.ib()
+    destination = attr.ib()
+    protocol = attr.ib(type=str)
+    port = attr.ib(type=int)
+
+    source_key = Path.source_key
+    destination_key = Path.destination_key
+    key = Path.key
+
+
+def _intern_network(network, networks):
+    if network is None or networks is None:
+        return network
+    return networks.setdefault(network.key, network)
+
+
+def freeze(value, networks=None):
+    """
+    Returns a frozen version of a service, subnetwork or path, or of a list of them.
+
+    If "networks" is a dictionary, it's used to share network objects: pass the same dictionary
+    when freezing many objects so they all reference one object per network.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item, networks) for item in value)
+    if isinstance(value, Network):
+        return _intern_network(value, networks)
+    if isinstance(value, Subnetwork):
+        return FrozenSubnetwork(value.subnetwork_id, value.name, value.cidr_block, value.region,
+                                value.availability_zone, value.instances)
+    if isinstance(value, Service):
+        return FrozenService(_intern_network(value.network, networks), value.name,
+                             freeze(value.subnetworks, networks))
+    if isinstance(value, Path):
+        return FrozenPath(_intern_network(value.network, networks),
+                          freeze(value.source, networks), freeze(value.destination, networks),
+                          value.protocol, value.port)
+    # Instances, networks and cidr blocks are already immutable.
+    return value
+
+
+def thaw(value):
+    """
+    Returns a mutable version of a frozen service, subnetwork or path, or of a tuple of them.
+    """
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    if isinstance(value, FrozenSubnetwork):
+        return Subnetwork(value.subnetwork_id, value.name, value.cidr_block, value.region,
+                          value.availability_zone, list(value.instances))
+    if isinstance(value, FrozenService):
+        return Service(value.network, value.name, thaw(value.subnetworks))
+    if isinstance(value, FrozenPath):
+        return Path(value.network, thaw(value.source), thaw(value.destination), value.protocol,
+                    value.port)
+    return value
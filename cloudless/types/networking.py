@@ -11,6 +11,19 @@ class CidrBlock:
     def __init__(self, cidr_block):
         self.cidr_block = ipaddress.IPv4Network(cidr_block)
 
+    @property
+    def key(self):
+        """
+        Identifies this CIDR block, so it can be compared with services and other blocks.
+        """
+        return str(self.cidr_block)
+
+    def __eq__(self, other):
+        return isinstance(other, CidrBlock) and self.cidr_block == other.cidr_block
+
+    def __hash__(self):
+        return hash(self.cidr_block)
+
     # https://stackoverflow.com/questions/1436703/difference-between-str-and-repr#2626364
     def __repr__(self):
         return "%s(%r)" % (self.__class__, self.__dict__)
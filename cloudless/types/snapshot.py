@@ -0,0 +1,197 @@
+"""
+Inventory snapshot.
+
+An immutable copy of everything on a provider: networks, services with their subnetworks and
+instances, and the paths between them.  Taking a snapshot lists each kind of resource once, and
+the snapshot can then be passed to the service, paths and graph calls so they don't fetch
+everything again.
+
+Usage:
+
+    snapshot = client.snapshot()
+    services = client.service.list(snapshot=snapshot)
+    graph = client.graph(snapshot=snapshot)
+    with open("snapshot.json", "w") as snapshot_file:
+        snapshot.to_json(snapshot_file)
+
+Snapshots are built from the frozen types in `cloudless.types.frozen`, and can be saved and loaded
+as JSON.
+"""
+import json
+import attr
+from cloudless.types.common import Network, Instance
+from cloudless.types.frozen import FrozenService, FrozenSubnetwork, FrozenPath, freeze
+
+SNAPSHOT_VERSION = 1
+
+# The top level keys of the dictionaries returned by "network_to_dict", "service_to_dict" and
+# "path_to_dict", in order.
+NETWORK_FIELDS = [field.name for field in attr.fields(Network)]
+SERVICE_FIELDS = ["network", "name", "subnetworks"]
+PATH_FIELDS = ["network", "source", "destination", "protocol", "port"]
+
+
+def network_to_dict(network):
+    """
+    Returns "network" as a dictionary of plain types.
+    """
+    return attr.asdict(network)
+
+
+def _subnetwork_to_dict(subnetwork):
+    return {"subnetwork_id": subnetwork.subnetwork_id, "name": subnetwork.name,
+            "cidr_block": subnetwork.cidr_block, "region": subnetwork.region,
+            "availability_zone": subnetwork.availability_zone,
+            "instances": [attr.asdict(instance) for instance in subnetwork.instances]}
+
+
+def service_to_dict(service):
+    """
+    Returns "service", including its subnetworks and instances, as a dictionary of plain types.
+    """
+    return {"network": service.network.name, "name": service.name,
+            "subnetworks": [_subnetwork_to_dict(subnetwork)
+                            for subnetwork in service.subnetworks]}
+
+
+def _endpoint_to_dict(endpoint):
+    # Paths use a service with no name to represent a group of CIDR blocks.
+    if not endpoint.name:
+        return {"cidr_blocks": [str(subnetwork.cidr_block) for subnetwork in endpoint.subnetworks]}
+    return {"network": endpoint.network.name, "name": endpoint.name}
+
+
+def path_to_dict(path):
+    """
+    Returns "path" as a dictionary of plain types.  The services at each end are only identified by
+    their network and name, or by their CIDR blocks if they have no name.
+    """
+    return {"network": path.network.name, "source": _endpoint_to_dict(path.source),
+            "destination": _endpoint_to_dict(path.destination), "protocol": path.protocol,
+            "port": path.port}
+
+
+@attr.s(slots=True, frozen=True)
+class Snapshot:
+    """
+    Immutable inventory of a provider.  The services and paths are frozen, and share one network
+    object per network.
+    """
+    provider = attr.ib(type=str)
+    networks = attr.ib(type=tuple, converter=tuple)
+    services = attr.ib(type=tuple, converter=tuple)
+    paths = attr.ib(type=tuple, converter=tuple)
+    _services_by_key = attr.ib(init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self):
+        object.__setattr__(self, "_services_by_key",
+                           {service.key: service for service in self.services})
+
+    @classmethod
+    def create(cls, provider, networks, services, paths):
+        """
+        Returns a snapshot of the given networks, services and paths, as returned by the network,
+        service and paths list calls.
+        """
+        interned_networks = {}
+        networks = freeze(networks, interned_networks)
+        return cls(provider, networks, freeze(services, interned_networks),
+                   freeze(paths, interned_networks))
+
+    def network(self, name):
+        """
+        Returns the network named "name", or None if there isn't one.
+        """
+        for network in self.networks:
+            if network.name == name:
+                return network
+        return None
+
+    def service(self, network_name, service_name):
+        """
+        Returns the service named "service_name" in the network named "network_name", or None if
+        there isn't one.
+        """
+        return self._services_by_key.get((network_name, service_name))
+
+    def paths_for(self, service):
+        """
+        Returns the paths to or from "service".
+        """
+        return tuple(path for path in self.paths
+                     if service.key in (path.source_key, path.destination_key))
+
+    def to_dict(self):
+        """
+        Returns this snapshot as a dictionary of plain types, which can be loaded back with
+        `Snapshot.from_dict`.
+        """
+        return {
+            "version": SNAPSHOT_VERSION,
+            "provider": self.provider,
+            "networks": [network_to_dict(network) for network in self.networks],
+            "services": [service_to_dict(service) for service in self.services],
+            "paths": [path_to_dict(path) for path in self.paths]}
+
+    def to_json(self, out=None):
+        """
+        Returns this snapshot as a JSON string, or writes it to the file like object "out".
+        """
+        if out is not None:
+            json.dump(self.to_dict(), out)
+            return None
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, snapshot_dict):
+        """
+        Loads a snapshot from the output of `Snapshot.to_dict`.
+        """
+        if snapshot_dict.get("version") != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version: %s" % snapshot_dict.get("version"))
+        snapshot_networks = [Network(**network_dict) for network_dict in snapshot_dict["networks"]]
+        networks = {network.name: network for network in snapshot_networks}
+
+        def get_network(name):
+            if name not in networks:
+                networks[name] = Network(name=name, network_id=None)
+            return networks[name]
+
+        services = []
+        for service_dict in snapshot_dict["services"]:
+            subnetworks = [
+                FrozenSubnetwork(subnetwork_dict["subnetwork_id"], subnetwork_dict["name"],
+                                 subnetwork_dict["cidr_block"], subnetwork_dict["region"],
+                                 subnetwork_dict["availability_zone"],
+                                 [Instance(**instance_dict)
+                                  for instance_dict in subnetwork_dict["instances"]])
+                for subnetwork_dict in service_dict["subnetworks"]]
+            services.append(FrozenService(get_network(service_dict["network"]),
+                                          service_dict["name"], subnetworks))
+        services_by_key = {service.key: service for service in services}
+
+        def get_endpoint(endpoint_dict):
+            if "cidr_blocks" in endpoint_dict:
+                return FrozenService(None, None, [
+                    FrozenSubnetwork(None, None, cidr_block, None, None, ())
+                    for cidr_block in endpoint_dict["cidr_blocks"]])
+            network = get_network(endpoint_dict["network"])
+            key = (network.key, endpoint_dict["name"])
+            if key not in services_by_key:
+                services_by_key[key] = FrozenService(network, endpoint_dict["name"], ())
+            return services_by_key[key]
+
+        paths = [FrozenPath(get_network(path_dict["network"]), get_endpoint(path_dict["source"]),
+                            get_endpoint(path_dict["destination"]), path_dict["protocol"],
+                            path_dict["port"])
+                 for path_dict in snapshot_dict["paths"]]
+        return cls(snapshot_dict["provider"], snapshot_networks, services, paths)
+
+    @classmethod
+    def from_json(cls, snapshot_json):
+        """
+        Loads a snapshot from a JSON string or file like object written by `Snapshot.to_json`.
+        """
+        if hasattr(snapshot_json, "read"):
+            return cls.from_dict(json.load(snapshot_json))
+        return cls.from_dict(json.loads(snapshot_json))
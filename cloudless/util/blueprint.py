@@ -4,7 +4,10 @@ Utilities to deal with blueprint files.  All here so that I can keep them as a
 standard format.
 """
 
+import copy
+import hashlib
 import os
+import threading
 import yaml
 import jinja2
 
@@ -12,6 +15,69 @@ from cloudless.util.exceptions import BlueprintException
 from cloudless.util.storage_size_parser import parse_storage_size
 from cloudless.util.log import logger
 
+# Parsed blueprints, keyed by a hash of their contents, so that the same blueprint is only parsed
+# once per process no matter how many times it's loaded.
+PARSED_BLUEPRINTS = {}
+PARSED_BLUEPRINTS_LOCK = threading.Lock()
+
+TEMPLATE_ENVIRONMENT = None
+TEMPLATE_ENVIRONMENT_LOCK = threading.Lock()
+
+
+def _parse_blueprint(blueprint):
+    """
+    Parses the given blueprint yaml, using the cache if we've parsed the same contents before.
+    Returns a copy, so callers can't change what's cached.
+    """
+    digest = hashlib.sha256(blueprint.encode("utf-8")).hexdigest()
+    with PARSED_BLUEPRINTS_LOCK:
+        cached = PARSED_BLUEPRINTS.get(digest)
+    if cached is None:
+        cached = yaml.safe_load(blueprint)
+        with PARSED_BLUEPRINTS_LOCK:
+            PARSED_BLUEPRINTS[digest] = cached
+    return copy.deepcopy(cached)
+
+
+def _load_script(path):
+    """
+    Template loader for startup scripts, where the template name is the path to the script.  Jinja
+    calls the returned function to check whether a compiled template is still up to date.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path) as startup_script_file:
+            startup_script = startup_script_file.read()
+    except OSError:
+        return None
+
+    def uptodate():
+        try:
+            return os.path.getmtime(path) == mtime
+        except OSError:
+            return False
+    return startup_script, path, uptodate
+
+
+def get_template_environment():
+    """
+    Returns the jinja environment used to render startup scripts.  It's shared by the whole process,
+    so each script is only compiled once, and compiled templates are also cached on disk so they
+    can be reused by later processes.
+    """
+    # pylint: disable=global-statement
+    global TEMPLATE_ENVIRONMENT
+    with TEMPLATE_ENVIRONMENT_LOCK:
+        if not TEMPLATE_ENVIRONMENT:
+            try:
+                bytecode_cache = jinja2.FileSystemBytecodeCache()
+            except (OSError, RuntimeError) as exc:
+                logger.debug("Not caching compiled templates on disk: %s", exc)
+                bytecode_cache = None
+            TEMPLATE_ENVIRONMENT = jinja2.Environment(loader=jinja2.FunctionLoader(_load_script),
+                                                      bytecode_cache=bytecode_cache)
+        return TEMPLATE_ENVIRONMENT
+
 # pylint: disable=too-few-public-methods
 class Blueprint:
     """
@@ -29,7 +95,7 @@ class Blueprint:
     def __init__(self, blueprint, blueprint_path="./"):
         logger.debug("Creating blueprint from data: %s", blueprint)
         try:
-            self.blueprint = yaml.safe_load(blueprint)
+            self.blueprint = _parse_blueprint(blueprint)
         except yaml.YAMLError as exc:
             logger.error("Error parsing blueprint: %s", exc)
             raise exc
@@ -119,11 +185,12 @@ class ServiceBlueprint(Blueprint):
             Handles a single initialization block.  Factored out in case I
             want to support multiple startup scripts.
             """
-            full_path = os.path.join(self.blueprint_path,
-                                     script["path"])
-            with open(full_path) as startup_script_file:
-                startup_script = startup_script_file.read()
-            template = jinja2.Template(startup_script)
+            full_path = os.path.abspath(os.path.join(self.blueprint_path,
+                                                     script["path"]))
+            try:
+                template = get_template_environment().get_template(full_path)
+            except jinja2.TemplateNotFound:
+                raise FileNotFoundError("Startup script not found: %s" % full_path)
             if "vars" in script:
                 for name, opts in script["vars"].items():
                     if opts["required"] and name not in template_vars:
@@ -14,9 +14,12 @@ class BlueprintTestConfiguration:
     This is where to enforce things like types, required arguments, and just general configuration
     constraints.  This turns it into a kind of "schema" that someday we can probably auto generate
     using a YAML schema library.
+
+    If "state_dir" is set, test state is saved there instead of next to the configuration, so the
+    same configuration can be tested more than once at the same time.
     """
 
-    def __init__(self, config):
+    def __init__(self, config, state_dir=None):
         with open(config, 'r') as stream:
             try:
                 self.config = yaml.safe_load(stream)
@@ -27,6 +30,7 @@ class BlueprintTestConfiguration:
         if not self.config_path:
             self.config_path = "./"
         self.config_filename = config
+        self.state_dir = state_dir
 
     def get_config_dir(self):
         """
@@ -38,6 +42,8 @@ class BlueprintTestConfiguration:
         """
         Get temporary state directory for this configuration.
         """
+        if self.state_dir:
+            return os.path.abspath(self.state_dir)
         return os.path.join(self.get_config_dir(), ".cloudless")
 
     def get_count(self):
@@ -0,0 +1,143 @@
+"""
+Graph Export
+
+Writes the networks, services and paths on a provider out as a graph, either in
+[DOT](https://graphviz.gitlab.io/_pages/doc/info/lang.html) format or as JSON adjacency lists.
+
+The output is written to a file like object a piece at a time rather than built up as one string.
+The networks and paths can be any iterables, such as the provider iterators, and are only read
+once.  Each network's services and paths are written together, so the services and paths are
+grouped by network in memory before anything is written.
+"""
+import json
+
+EXTERNAL_NETWORK = "external"
+EMPTY_NETWORK = "Empty Network"
+
+
+def node_name(service):
+    """
+    Returns the name of the graph node for "service".  A service with no name is a set of CIDR
+    blocks, which are shown outside of any network.
+    """
+    if not service.name:
+        return ",".join([str(subnetwork.cidr_block) for subnetwork in service.subnetworks])
+    return service.name
+
+
+def node_network_name(service):
+    """
+    Returns the name of the network that the graph node for "service" is in.
+    """
+    if not service.name:
+        return EXTERNAL_NETWORK
+    return service.network.name
+
+
+def node_id(service):
+    """
+    Returns the unique identifier of the graph node for "service".
+    """
+    return "%s (%s)" % (node_name(service), node_network_name(service))
+
+
+def _group_by_network(items):
+    """
+    Groups services or paths by the name of their network, keeping the original order.
+    """
+    net_to_items = {}
+    for item in items:
+        net_to_items.setdefault(item.network.name, []).append(item)
+    return net_to_items
+
+
+def _named_networks(networks):
+    # Skip networks with no name for now
+    return (network for network in networks if network.name)
+
+
+def write_dot(out, networks, services, paths):
+    """
+    Writes a DOT formatted graph of "networks", "services" and "paths" to "out".  This string can be
+    passed to a program like graphviz to generate a graph visualization.
+    """
+    net_to_service = _group_by_network(services)
+    net_to_path = _group_by_network(paths)
+    out.write("digraph services {\n\n")
+    for cluster_id, network in enumerate(_named_networks(networks)):
+
+        # Each network is a "cluster" in graphviz terms
+        out.write("subgraph cluster_%s {\n" % cluster_id)
+        out.write("    label = \"%s\";\n" % network.name)
+
+        # If the network is empty just make a placeholder node
+        if network.name not in net_to_service and network.name not in net_to_path:
+            out.write("    \"%s (%s)\";\n" % (EMPTY_NETWORK, network.name))
+            out.write("\n}\n")
+            continue
+
+        for service in net_to_service.get(network.name, []):
+            out.write("    \"%s\";\n" % node_id(service))
+        out.write("\n}\n")
+
+        # We do all paths outside the cluster so that public CIDRs will show up outside the
+        # networks.
+        for path in net_to_path.get(network.name, []):
+            out.write("\"%s\" -> \"%s\" [ label=\"(%s:%s)\" ];\n" % (
+                node_id(path.source), node_id(path.destination), path.protocol, path.port))
+    out.write("\n}\n")
+
+
+def _write_json_items(out, items, indent="    "):
+    """
+    Writes each of "items" as JSON on its own line, separated by commas.
+    """
+    for index, item in enumerate(items):
+        out.write("%s\n%s%s" % ("," if index else "", indent, json.dumps(item, sort_keys=True)))
+
+
+def _json_nodes(network_names, net_to_service):
+    for network_name in network_names:
+        for service in net_to_service.get(network_name, []):
+            yield {"id": node_id(service), "name": service.name, "network": network_name}
+
+
+def _json_edges(paths):
+    for path in paths:
+        yield {"destination": node_id(path.destination), "protocol": path.protocol,
+               "port": path.port}
+
+
+def _write_json_adjacency(out, network_names, net_to_path):
+    """
+    Writes the map from each node to the paths leaving it, for the paths in "network_names".
+    """
+    adjacency = {}
+    for network_name in network_names:
+        for path in net_to_path.get(network_name, []):
+            adjacency.setdefault(node_id(path.source), []).append(path)
+    for index, (source, source_paths) in enumerate(adjacency.items()):
+        out.write("%s\n    %s: [" % ("," if index else "", json.dumps(source)))
+        _write_json_items(out, _json_edges(source_paths), indent="      ")
+        out.write("\n    ]")
+
+
+def write_json(out, networks, services, paths):
+    """
+    Writes a JSON graph of "networks", "services" and "paths" to "out".  The graph has the list of
+    networks, the list of nodes, and an adjacency map from each node to the paths leaving it.
+    """
+    net_to_service = _group_by_network(services)
+    net_to_path = _group_by_network(paths)
+    network_names = [network.name for network in _named_networks(networks)]
+
+    out.write("{\n  \"networks\": [")
+    _write_json_items(out, network_names)
+    out.write("\n  ],\n  \"nodes\": [")
+    _write_json_items(out, _json_nodes(network_names, net_to_service))
+    out.write("\n  ],\n  \"adjacency\": {")
+    _write_json_adjacency(out, network_names, net_to_path)
+    out.write("\n  }\n}\n")
+
+
+FORMATS = {"dot": write_dot, "json": write_json}
@@ -0,0 +1,44 @@
+"""
+Subnet Index
+
+Maps IP addresses to the subnet that contains them.  Each subnet is parsed once and stored as an
+integer address range, so a lookup is a binary search rather than a comparison against every
+subnet.
+"""
+import bisect
+import ipaddress
+
+
+class SubnetIndex:
+    """
+    Index of non overlapping subnets, keyed by their integer address range.
+
+    The subnets can be any objects, as long as "get_cidr" returns their CIDR block.
+    """
+
+    def __init__(self, subnets, get_cidr=lambda subnet: subnet.cidr_block):
+        entries = []
+        for subnet in subnets:
+            network = ipaddress.ip_network(str(get_cidr(subnet)))
+            entries.append((int(network.network_address), int(network.broadcast_address), subnet))
+        entries.sort(key=lambda entry: entry[0])
+        self._starts = [entry[0] for entry in entries]
+        self._entries = entries
+
+    def find(self, ip_address):
+        """
+        Returns the subnet containing "ip_address", or None if no subnet contains it.
+        """
+        if not ip_address:
+            return None
+        address = int(ipaddress.ip_address(str(ip_address)))
+        position = bisect.bisect_right(self._starts, address) - 1
+        if position < 0:
+            return None
+        _, end, subnet = self._entries[position]
+        if address > end:
+            return None
+        return subnet
+
+    def __len__(self):
+        return len(self._entries)
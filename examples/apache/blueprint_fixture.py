@@ -4,14 +4,22 @@ Apache Test Fixture
 This fixture doesn't do any setup, but verifies that the created service is
 running default apache.
 """
+import concurrent.futures
 import requests
 from cloudless.testutils.blueprint_tester import call_with_retries
 from cloudless.testutils.fixture import BlueprintTestInterface, SetupInfo
 from cloudless.types.networking import CidrBlock
 
 RETRY_DELAY = float(10.0)
+REQUEST_TIMEOUT = float(5.0)
 RETRY_COUNT = int(6)
 
+def get_page(public_ip):
+    """
+    Fetches the default page from the instance at "public_ip".
+    """
+    return requests.get("http://%s" % public_ip, timeout=REQUEST_TIMEOUT)
+
 class BlueprintTest(BlueprintTestInterface):
     """
     Fixture class that creates the dependent resources.
@@ -39,11 +47,14 @@ class BlueprintTest(BlueprintTestInterface):
         def check_responsive():
             public_ips = [i.public_ip for s in service.subnetworks for i in s.instances]
             assert public_ips
-            for public_ip in public_ips:
-                response = requests.get("http://%s" % public_ip)
-                expected_content = "Hello World"
-                assert response.content, "No content in response"
-                assert expected_content in str(response.content), (
-                    "Unexpected content in response: %s" % response.content)
+            # Check every instance at once, so a slow or hung one doesn't hold up the rest.
+            if self.ssh:
+                self.ssh.check_all(public_ips, "systemctl is-active apache2")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(public_ips)) as executor:
+                for response in executor.map(get_page, public_ips):
+                    expected_content = "Hello World"
+                    assert response.content, "No content in response"
+                    assert expected_content in str(response.content), (
+                        "Unexpected content in response: %s" % response.content)
 
         call_with_retries(check_responsive, RETRY_COUNT, RETRY_DELAY)
@@ -44,6 +44,8 @@ REQUIRED = [
     # be a separate module eventually.
     'pytest==5.0.1',
     'attr==0.3.1',
+    # For the "eq" argument to attr.s.
+    'attrs>=19.2.0',
     'Click==7.0',
     'click-repl==0.1.6',
     'apache-libcloud==2.5.0',
@@ -168,6 +170,11 @@ setup(
 
     entry_points={
         'console_scripts': ['cldls=cloudless.cli.main:main'],
+        'cloudless.providers': [
+            'aws=cloudless.providers.aws',
+            'mock-aws=cloudless.providers.aws_mock',
+            'gce=cloudless.providers.gce',
+        ],
     },
     install_requires=REQUIRED,
     tests_require=TESTS_REQUIRED,
@@ -0,0 +1,27 @@
+"""
+Test the pool of AWS sessions.
+"""
+import threading
+from unittest.mock import patch
+
+from cloudless.providers.aws import driver
+from cloudless.providers.aws.network import NetworkClient
+
+
+@patch('cloudless.providers.aws.driver.boto3.session.Session')
+def test_aws_client_uses_thread_driver(session):
+    """
+    Test that a client created on one thread uses the session of whichever thread calls it, for
+    the implementation client too.
+    """
+    session.side_effect = lambda **kwargs: object()
+    credentials = {"profile": "client-pool-test"}
+    client = NetworkClient(credentials)
+    assert client.driver is driver.get_aws_driver(credentials)
+    assert client.network.driver is client.driver
+
+    thread_drivers = []
+    thread = threading.Thread(target=lambda: thread_drivers.append(client.network.driver))
+    thread.start()
+    thread.join()
+    assert thread_drivers[0] is not client.driver
@@ -0,0 +1,87 @@
+"""
+Test running batches of cldls commands.
+"""
+import os
+from unittest.mock import patch
+import pytest
+from click.testing import CliRunner
+from cloudless.cli.batch import get_dependencies, parse_batch
+from cloudless.cli.cldls import get_cldls
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
+NETWORK_BLUEPRINT = os.path.join(EXAMPLES_DIR, "network", "blueprint.yml")
+AWS_SERVICE_BLUEPRINT = os.path.join(EXAMPLES_DIR, "base-image", "aws_blueprint.yml")
+
+
+def test_parse_batch():
+    """
+    Test that comments, blank lines, and a leading "cldls" are dropped, and that commands that
+    can't run in a batch are rejected.
+    """
+    commands = parse_batch(["# Comment\n", "\n", "cldls network list\n",
+                            "service get dev 'my service'  # Trailing comment\n"])
+    assert commands == [(3, ["network", "list"]), (4, ["service", "get", "dev", "my service"])]
+    with pytest.raises(Exception, match="Line 1"):
+        parse_batch(["daemon start\n"])
+    with pytest.raises(Exception, match="Line 2"):
+        parse_batch(["network list\n", "--profile dev network list\n"])
+
+
+def test_get_dependencies():
+    """
+    Test that commands only wait for earlier commands that change the same network.
+    """
+    commands = parse_batch([
+        "network create dev blueprint.yml",
+        "service create dev web blueprint.yml",
+        "service create dev lb blueprint.yml",
+        "service create prod web blueprint.yml",
+        "paths allow_service dev web lb 80",
+        "network create staging blueprint.yml",
+        "service list",
+        "service get dev web",
+        "service get dev lb",
+    ])
+    assert get_dependencies(commands) == [[], [0], [0, 1], [], [0, 1, 2], [], [0, 1, 2, 3, 4, 5],
+                                          [0, 1, 2, 4, 6], [0, 1, 2, 4, 6]]
+
+
+# Need to patch this so the test doesn't mess up our real configuration.
+# pylint:disable=unused-argument
+@pytest.mark.mock_aws
+@patch('cloudless.profile.FileConfigSource')
+def test_batch_subcommand(mock_config_source, tmpdir):
+    """
+    Test running a batch of commands with the mock provider.
+    """
+    mock_config_source = mock_config_source.return_value
+    mock_config_source.load.return_value = {"default": {"provider": "mock-aws", "credentials": {}}}
+
+    batch_file = tmpdir.join("commands.txt")
+    batch_file.write("\n".join([
+        "network create batch %s" % NETWORK_BLUEPRINT,
+        "service create batch web %s" % AWS_SERVICE_BLUEPRINT,
+        "service create batch lb %s" % AWS_SERVICE_BLUEPRINT,
+        "paths allow_service batch web lb 80",
+        "service get other missing",
+        "service destroy other missing",
+        "paths revoke_service batch web lb 80",
+        "service destroy batch web",
+        "service destroy batch lb",
+        "network destroy batch",
+    ]))
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(get_cldls(), ["batch", "--jobs", "2", str(batch_file)])
+    assert result.exit_code == 1
+    assert "Created network: batch\n" in result.stdout
+    assert "Created service: web in network: batch\n" in result.stdout
+    assert "Created service: lb in network: batch\n" in result.stdout
+    assert "Added path from lb to web in network batch for port 80\n" in result.stdout
+    assert "Removed path from lb to web in network batch for port 80\n" in result.stdout
+    assert "Destroyed network: batch\n" in result.stdout
+    assert "Line 5: failed: service get other missing\n" in result.stderr
+    assert "Line 6: skipped since an earlier command failed\n" in result.stderr
+    assert result.stderr.endswith("Ran 10 commands, 2 failed\n")
+
+    result = runner.invoke(get_cldls(), ["network", "get", "batch"])
+    assert result.exit_code == 1
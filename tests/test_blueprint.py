@@ -3,7 +3,7 @@ Tests for blueprint reader.
 """
 import os
 import pytest
-from cloudless.util.blueprint import ServiceBlueprint
+from cloudless.util.blueprint import ServiceBlueprint, get_template_environment
 from cloudless.util.exceptions import BlueprintException
 
 
@@ -43,3 +43,34 @@ def test_blueprint():
         pytest.fail("Expected missing value exception")
     sbp = ServiceBlueprint.from_file(NOVARS_BLUEPRINT)
     sbp.runtime_scripts({})
+
+def test_blueprint_caching(tmpdir):
+    """
+    Test that blueprints and startup scripts are only parsed once, but changes to scripts are still
+    picked up.
+    """
+    first = ServiceBlueprint.from_file(INSTANCES_BLUEPRINT)
+    second = ServiceBlueprint.from_file(INSTANCES_BLUEPRINT)
+    assert first.blueprint == second.blueprint
+    first.blueprint["network"]["subnetwork_max_instance_count"] = 1000
+    assert first.blueprint != second.blueprint
+
+    script = tmpdir.join("script.sh")
+    script.write("echo {{ message }}")
+    blueprint = tmpdir.join("blueprint.yml")
+    blueprint.write("initialization:\n"
+                    "  - path: script.sh\n"
+                    "    vars:\n"
+                    "      message:\n"
+                    "        required: true\n")
+    sbp = ServiceBlueprint.from_file(str(blueprint))
+    environment = get_template_environment()
+    assert sbp.runtime_scripts({"message": "hello"}) == "echo hello"
+    template = environment.get_template(str(script))
+    assert sbp.runtime_scripts({"message": "again"}) == "echo again"
+    assert environment.get_template(str(script)) is template
+
+    script.write("echo changed {{ message }}")
+    os.utime(str(script), (0, 0))
+    assert sbp.runtime_scripts({"message": "hello"}) == "echo changed hello"
+    assert environment.get_template(str(script)) is not template
@@ -0,0 +1,97 @@
+"""
+Tests for running the blueprint test framework over a matrix of configurations.
+"""
+import io
+import os
+import sys
+import xml.etree.ElementTree as ElementTree
+import pytest
+
+from cloudless.testutils.blueprint_matrix import get_matrix, run_blueprint_matrix, write_junit_xml
+from cloudless.testutils.blueprint_matrix import MatrixConfiguration, run_configuration
+
+# Get the blueprint locations relative to the test script
+BLUEPRINT_DIR = os.path.join(os.path.dirname(__file__), "blueprint_tester_fixture")
+BLUEPRINT_TEST_CONFIGURATION = os.path.join(BLUEPRINT_DIR, "blueprint-test-configuration.yml")
+MOCK_PROFILES = {"mock": {"provider": "mock-aws", "credentials": {}}}
+
+
+def test_get_matrix():
+    """
+    Test that every configuration is paired with every profile, each with its own state directory.
+    """
+    matrix = get_matrix(["a/test.yml", "b/test.yml"],
+                        {"aws": {"provider": "aws", "credentials": {}},
+                         "gce": {"provider": "gce", "credentials": {"key": "value"}}},
+                        "/state")
+    assert [(entry.config, entry.profile) for entry in matrix] == [
+        ("a/test.yml", "aws"), ("a/test.yml", "gce"), ("b/test.yml", "aws"), ("b/test.yml", "gce")]
+    assert matrix[1].credentials == {"key": "value"}
+    assert len({entry.state_dir for entry in matrix}) == 4
+    assert all(entry.state_dir.startswith("/state/") for entry in matrix)
+
+
+@pytest.mark.mock_aws
+def test_blueprint_matrix_mock(tmpdir):
+    """
+    Test running a passing and a failing configuration at the same time against moto (mock aws).
+    """
+    broken_configuration = tmpdir.join("broken", "blueprint-test-configuration.yml")
+    broken_configuration.write("create:\n"
+                               "  blueprint: %s\n"
+                               "  fixture_options:\n"
+                               "    module_name: missing_fixture\n" % (
+                                   os.path.join(BLUEPRINT_DIR, "blueprint.yml")),
+                               ensure=True)
+    state_dir = tmpdir.join("state")
+    finished = []
+    results = run_blueprint_matrix([BLUEPRINT_TEST_CONFIGURATION, str(broken_configuration)],
+                                   MOCK_PROFILES, jobs=2, state_dir=str(state_dir),
+                                   on_result=finished.append)
+    assert len(finished) == 2
+    assert [result.config for result in results] == [BLUEPRINT_TEST_CONFIGURATION,
+                                                     str(broken_configuration)]
+    assert results[0].passed
+    assert not results[1].passed
+    assert "missing_fixture" in results[1].error
+
+    # The tests kept their state out of the blueprint directory.
+    assert not os.path.exists(os.path.join(BLUEPRINT_DIR, ".cloudless"))
+    assert len(state_dir.listdir()) == 2
+
+    report = io.StringIO()
+    write_junit_xml(results, report)
+    testsuites = ElementTree.fromstring(report.getvalue())
+    assert testsuites.get("tests") == "2"
+    assert testsuites.get("failures") == "1"
+    testcases = testsuites.findall("testsuite/testcase")
+    assert [testcase.get("name") for testcase in testcases] == [
+        BLUEPRINT_TEST_CONFIGURATION, str(broken_configuration)]
+    assert testcases[0].find("failure") is None
+    assert "missing_fixture" in testcases[1].find("failure").get("message")
+
+
+@pytest.mark.mock_aws
+def test_run_configuration_unloads_only_fixture(tmpdir):
+    """
+    Test that a run only unloads modules from the blueprint directory, and leaves everything else
+    it imported loaded for the next run in the same worker.
+    """
+    blueprint_dir = tmpdir.mkdir("unloading")
+    blueprint_dir.join("blueprint-test-configuration.yml").write(
+        "create:\n"
+        "  blueprint: %s\n"
+        "  fixture_options:\n"
+        "    module_name: unloading_fixture\n" % os.path.join(BLUEPRINT_DIR, "blueprint.yml"))
+    blueprint_dir.join("unloading_fixture.py").write(
+        "import xml.dom.minidom\n"
+        "class BlueprintTest:\n"
+        "    def __init__(self, client):\n"
+        "        raise Exception('Fixture imported')\n")
+    sys.modules.pop("xml.dom.minidom", None)
+    result = run_configuration(MatrixConfiguration(
+        config=str(blueprint_dir.join("blueprint-test-configuration.yml")), profile="mock",
+        provider="mock-aws", credentials={}, state_dir=str(tmpdir.join("state"))))
+    assert "Fixture imported" in result.error
+    assert "unloading_fixture" not in sys.modules
+    assert "xml.dom.minidom" in sys.modules
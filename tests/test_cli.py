@@ -1,12 +1,16 @@
 """
 Test the cloudless command line interface.
 """
+import json
 import os
 import shutil
 import re
 from unittest.mock import patch
+import yaml
+import click
 from click.testing import CliRunner
 from cloudless.cli.cldls import get_cldls
+from cloudless.cli.output import write_items
 import cloudless.profile
 
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
@@ -501,3 +505,93 @@ def test_image_build_subcommand(mock_config_source):
                              'Deleted image: my-image\n')
     assert result.exception is None
     assert result.exit_code == 0
+
+def test_lazy_subcommand_help():
+    """
+    Test that the help shown for subcommands before they're loaded matches their own help.
+    """
+    cldls = get_cldls()
+    for name, (_, _, short_help) in cldls.lazy_subcommands.items():
+        command = cldls.get_command(None, name)
+        assert command.name == name
+        assert command.get_short_help_str(limit=len(short_help)) == short_help
+
+# Need to patch this so the test doesn't mess up our real configuration.
+# pylint:disable=unused-argument
+@patch('cloudless.profile.FileConfigSource')
+def test_list_output_formats(mock_config_source):
+    """
+    Test that list commands can print machine readable output with selected fields.
+    """
+    mock_config_source = mock_config_source.return_value
+    mock_config_source.load.return_value = {"default": {"provider": "mock-aws", "credentials": {}}}
+
+    # Keep standard error separate, to check that it's only the listing on standard output.
+    runner = CliRunner(mix_stderr=False)
+
+    result = runner.invoke(get_cldls(), ['network', 'create', 'output', NETWORK_BLUEPRINT])
+    assert result.exit_code == 0
+    result = runner.invoke(get_cldls(), ['service', 'create', 'output', 'web',
+                                         AWS_SERVICE_BLUEPRINT])
+    assert result.exit_code == 0
+
+    result = runner.invoke(get_cldls(), ['network', 'list', '--output', 'json'])
+    assert result.exit_code == 0
+    assert result.stderr == 'Network group with provider: mock-aws\n'
+    assert "output" in [network["name"] for network in json.loads(result.output)]
+
+    result = runner.invoke(get_cldls(), ['network', 'list', '-o', 'jsonl', '--fields', 'name'])
+    assert result.exit_code == 0
+    assert {"name": "output"} in [json.loads(line) for line in result.output.splitlines()]
+
+    result = runner.invoke(get_cldls(), ['service', 'list', '-o', 'yaml',
+                                         '--fields', 'network,name'])
+    assert result.exit_code == 0
+    assert {"network": "output", "name": "web"} in yaml.safe_load(result.output)
+
+    result = runner.invoke(get_cldls(), ['service', 'list', '--fields', 'network,name'])
+    assert result.exit_code == 0
+    assert 'output\tweb' in result.output.splitlines()
+
+    result = runner.invoke(get_cldls(), ['service', 'list', '--fields', 'bogus'])
+    assert result.exit_code == 2
+
+    # Bad fields are caught before anything is written, rather than after the opening bracket.
+    result = runner.invoke(get_cldls(), ['network', 'list', '-o', 'json', '--fields', 'bogus'])
+    assert result.exit_code == 2
+    assert result.output == ""
+
+    result = runner.invoke(get_cldls(), ['paths', 'list', '-o', 'json'])
+    assert result.exit_code == 0
+    assert isinstance(json.loads(result.output), list)
+
+    result = runner.invoke(get_cldls(), ['service', 'destroy', 'output', 'web'])
+    assert result.exit_code == 0
+    result = runner.invoke(get_cldls(), ['network', 'destroy', 'output'])
+    assert result.exit_code == 0
+
+
+def test_write_items_streams():
+    """
+    Test that each item is written as soon as it's read, before the next one is fetched.
+    """
+    written_before = []
+
+    def items():
+        for name in ["first", "second", "third"]:
+            yield {"name": name}
+            written_before.append(click.get_text_stream("stdout").buffer.getvalue().decode())
+
+    @click.command()
+    def stream():
+        """
+        Write the items as JSON.
+        """
+        assert write_items(items(), "json", "name", ["name"], dict, str,
+                           to_key=lambda item: item["name"]) == ["first", "second", "third"]
+
+    result = CliRunner().invoke(stream)
+    assert result.exit_code == 0
+    assert written_before[0] == '[\n  {"name": "first"}'
+    assert written_before[1] == '[\n  {"name": "first"},\n  {"name": "second"}'
+    assert json.loads(result.output) == [{"name": "first"}, {"name": "second"}, {"name": "third"}]
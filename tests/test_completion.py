@@ -0,0 +1,41 @@
+"""
+Test shell completion of network and service names.
+"""
+import os
+from unittest.mock import patch
+from click._bashcomplete import get_choices
+from cloudless.cli.cldls import get_cldls
+from cloudless.cli.completion import save_index, load_index
+
+
+def complete(args, incomplete):
+    """
+    Returns the completions for "incomplete" after the command line "args".
+    """
+    return [choice for choice, _ in get_choices(get_cldls(), "cldls", args, incomplete)]
+
+
+# Need to patch this so the test doesn't mess up our real configuration.
+# pylint:disable=unused-argument
+@patch('cloudless.profile.FileConfigSource')
+def test_completion(mock_config_source, tmpdir):
+    """
+    Test that network and service names are completed from the index.
+    """
+    mock_config_source.return_value.load.return_value = {
+        "default": {"provider": "mock-aws", "credentials": {}},
+        "other": {"provider": "mock-aws", "credentials": {}}}
+    with patch.dict(os.environ, {"CLOUDLESS_COMPLETION_DIR": str(tmpdir)}):
+        assert load_index("default") == {"networks": [], "services": {}}
+        save_index("default", networks=["prod", "dev"])
+        save_index("default", services={"dev": ["web", "db"], "prod": ["web-lb"]})
+        assert load_index("default") == {"networks": ["dev", "prod"],
+                                         "services": {"dev": ["db", "web"], "prod": ["web-lb"]}}
+
+        assert complete(["network", "get"], "") == ["dev", "prod"]
+        assert complete(["network", "destroy"], "p") == ["prod"]
+        assert complete(["service", "get"], "d") == ["dev"]
+        assert complete(["service", "get", "dev"], "") == ["db", "web"]
+        assert complete(["service", "get", "prod"], "w") == ["web-lb"]
+        assert complete(["paths", "allow_service", "dev", "web"], "") == ["db", "web"]
+        assert complete(["--profile", "other", "network", "get"], "") == []
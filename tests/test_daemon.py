@@ -0,0 +1,120 @@
+"""
+Test the cldls daemon.
+"""
+import os
+import stat
+import threading
+from unittest.mock import patch
+import pytest
+from cloudless.cli.client_cache import CachedClient, ResultCache
+from cloudless.cli.daemon import DaemonServer
+from cloudless.cli.daemon_client import run_in_daemon, send_request, should_forward
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
+NETWORK_BLUEPRINT = os.path.join(EXAMPLES_DIR, "network", "blueprint.yml")
+
+
+class FakeNetworkClient:
+    """
+    Network client that counts how many times it's called.
+    """
+    def __init__(self):
+        self.list_calls = 0
+
+    def list(self):
+        """
+        Count and return nothing.
+        """
+        self.list_calls += 1
+        return []
+
+    # pylint: disable=no-self-use
+    def create(self, name):
+        """
+        Return the name.
+        """
+        return name
+
+
+class FakeClient:
+    """
+    Client with only a network client.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.network = FakeNetworkClient()
+        self.service = None
+        self.paths = None
+        self.provider = "fake"
+
+
+def test_cached_client():
+    """
+    Test that reads are cached until something changes or they expire.
+    """
+    fake_client = FakeClient()
+    client = CachedClient(fake_client, ResultCache(ttl=60))
+    assert client.provider == "fake"
+    client.network.list()
+    client.network.list()
+    assert fake_client.network.list_calls == 1
+    assert client.network.create("network") == "network"
+    client.network.list()
+    assert fake_client.network.list_calls == 2
+
+    client = CachedClient(fake_client, ResultCache(ttl=0))
+    client.network.list()
+    client.network.list()
+    assert fake_client.network.list_calls == 4
+
+
+def test_should_forward():
+    """
+    Test that commands that prompt or manage the daemon always run locally.
+    """
+    assert should_forward(["network", "list"])
+    assert should_forward(["--profile", "dev", "service", "ls"])
+    assert not should_forward([])
+    assert not should_forward(["--help"])
+    assert not should_forward(["init", "--provider", "aws"])
+    assert not should_forward(["--profile", "network", "daemon", "stop"])
+    assert not should_forward(["--debug", "network", "list"])
+    with patch.dict(os.environ, {"CLOUDLESS_NO_DAEMON": "1"}):
+        assert not should_forward(["network", "list"])
+
+
+# Need to patch this so the test doesn't mess up our real configuration.
+# pylint:disable=unused-argument
+@pytest.mark.mock_aws
+@patch('cloudless.profile.FileConfigSource')
+def test_daemon(mock_config_source, tmpdir, capsys):
+    """
+    Test running commands through the daemon with the mock provider.
+    """
+    mock_config_source = mock_config_source.return_value
+    mock_config_source.load.return_value = {"default": {"provider": "mock-aws", "credentials": {}}}
+
+    socket_path = str(tmpdir.join("cldls.sock"))
+    assert run_in_daemon(["network", "list"], socket_path) is None
+
+    server = DaemonServer(socket_path)
+    # Only the owner can connect.
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.start()
+    try:
+        assert run_in_daemon(["network", "create", "daemon", NETWORK_BLUEPRINT], socket_path) == 0
+        assert capsys.readouterr().out == "Created network: daemon\n"
+        assert run_in_daemon(["network", "get", "daemon"], socket_path) == 0
+        assert "Name: daemon\n" in capsys.readouterr().out
+        assert run_in_daemon(["network", "get", "missing"], socket_path) == 1
+        assert capsys.readouterr().out == "Could not find network: missing\n"
+        assert send_request({"command": "status"}, socket_path)["clients"] == 1
+        assert run_in_daemon(["network", "destroy", "daemon"], socket_path) == 0
+        assert capsys.readouterr().out == "Destroyed network: daemon\n"
+        assert run_in_daemon(["network", "get", "daemon"], socket_path) == 1
+    finally:
+        send_request({"command": "stop"}, socket_path)
+        server_thread.join()
+        server.server_close()
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,70 @@
+"""
+Test the frozen versions of the common types.
+"""
+from cloudless.providers.aws.impl.paths import _get_cidr_paths
+from cloudless.types.common import Network, Service, Subnetwork, Instance, Path
+from cloudless.types.frozen import freeze, thaw
+from cloudless.types.networking import CidrBlock
+
+
+def make_service(network, name, instance_ids):
+    """
+    Create a service with a single subnetwork containing the given instances.
+    """
+    instances = [Instance(instance_id, None, "10.0.0.1", "running", "us-east-1a")
+                 for instance_id in instance_ids]
+    subnetwork = Subnetwork("%s-subnet" % name, name, "10.0.0.0/24", "us-east-1", "us-east-1a",
+                            instances)
+    return Service(network, name, [subnetwork])
+
+
+def test_freeze_and_thaw():
+    """
+    Test that frozen objects share networks, compare by key, and thaw back to the originals.
+    """
+    web = make_service(Network("network", "vpc-1"), "web", ["i-1", "i-2"])
+    web_again = make_service(Network("network", "vpc-1"), "web", ["i-1"])
+    load_balancer = make_service(Network("network", "vpc-1"), "lb", ["i-3"])
+    paths = [Path(web.network, load_balancer, web, "tcp", 80),
+             Path(web.network, CidrBlock("0.0.0.0/0"), load_balancer, "tcp", 443)]
+
+    networks = {}
+    frozen_services = freeze([web, web_again, load_balancer], networks)
+    frozen_paths = freeze(paths, networks)
+    assert len(networks) == 1
+    assert all(service.network is networks["network"] for service in frozen_services)
+    assert frozen_paths[0].network is networks["network"]
+
+    # Services are the same if they have the same key, even if their instances differ
+    assert len(set(frozen_services)) == 2
+    assert frozen_services[0] == frozen_services[1]
+    assert frozen_paths[0].destination == frozen_services[0]
+    assert len(set(frozen_paths + freeze(paths, networks))) == 2
+    assert CidrBlock("0.0.0.0/0") == CidrBlock("0.0.0.0/0")
+    assert paths[0].source_key == ("network", "lb")
+    assert paths[1].source_key == "0.0.0.0/0"
+    assert frozen_paths[0].destination_key == paths[0].destination_key == ("network", "web")
+
+    assert thaw(frozen_services[0]) == web
+    assert thaw(frozen_paths) == paths
+    assert isinstance(thaw(frozen_services[0]).subnetworks[0].instances, list)
+
+
+def test_path_without_port():
+    """
+    Test that paths from AWS rules with no port, like ones that allow all traffic, can be frozen,
+    hashed and compared.
+    """
+    web = make_service(Network("network", "vpc-1"), "web", ["i-1"])
+    all_traffic = {"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}],
+                   "UserIdGroupPairs": []}
+    paths = _get_cidr_paths(web, all_traffic)
+    assert paths[0].port == "N/A"
+    frozen_paths = freeze(paths)
+    assert frozen_paths == freeze(_get_cidr_paths(web, all_traffic))
+    assert len({frozen_paths[0], freeze(Path(web.network, CidrBlock("0.0.0.0/0"), web, "-1",
+                                             80))}) == 2
+
+    # Ports given as numbers and strings are the same.
+    assert Path(web.network, web, web, "tcp", 80).key == Path(web.network, web, web, "tcp",
+                                                               "80").key
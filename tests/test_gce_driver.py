@@ -0,0 +1,44 @@
+"""
+Test the pool of GCE drivers.
+"""
+import threading
+from unittest.mock import patch
+
+from cloudless.providers.gce import driver
+from cloudless.providers.gce.network import NetworkClient
+
+
+@patch('cloudless.providers.gce.driver.get_driver')
+def test_gce_driver_pool(get_driver):
+    """
+    Test that drivers are reused per thread and per project, but never shared between threads.
+    """
+    get_driver.return_value = lambda **kwargs: object()
+    first = {"user_id": "user", "key": "key", "project": "first-pool-test"}
+    second = {"user_id": "user", "key": "key", "project": "second-pool-test"}
+    first_driver = driver.get_gce_driver(first)
+    assert driver.get_gce_driver(first) is first_driver
+    assert driver.get_gce_driver(second) is not first_driver
+
+    thread_drivers = []
+    thread = threading.Thread(target=lambda: thread_drivers.append(driver.get_gce_driver(first)))
+    thread.start()
+    thread.join()
+    assert thread_drivers[0] is not first_driver
+
+
+@patch('cloudless.providers.gce.driver.get_driver')
+def test_gce_client_uses_thread_driver(get_driver):
+    """
+    Test that a client created on one thread uses the driver of whichever thread calls it.
+    """
+    get_driver.return_value = lambda **kwargs: object()
+    credentials = {"user_id": "user", "key": "key", "project": "client-pool-test"}
+    client = NetworkClient(credentials)
+    assert client.driver is driver.get_gce_driver(credentials)
+
+    thread_drivers = []
+    thread = threading.Thread(target=lambda: thread_drivers.append(client.driver))
+    thread.start()
+    thread.join()
+    assert thread_drivers[0] is not client.driver
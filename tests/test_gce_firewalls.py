@@ -0,0 +1,135 @@
+"""
+Test deleting GCE firewalls by tag, with the raw API stubbed out.
+"""
+from unittest.mock import patch
+import pytest
+
+from cloudless.providers.gce.impl.firewalls import Firewalls
+from cloudless.util.exceptions import BadEnvironmentStateException
+
+FIREWALLS = [
+    {"name": "web-from-lb", "sourceTags": ["net-lb"], "targetTags": ["net-web"]},
+    {"name": "lb-from-internet", "sourceRanges": ["0.0.0.0/0"], "targetTags": ["net-lb"]},
+    {"name": "db-from-web", "sourceTags": ["net-web"], "targetTags": ["net-db"]},
+    {"name": "other", "sourceTags": ["other-a"], "targetTags": ["other-b"]},
+]
+
+
+class FakeResponse:
+    """
+    A libcloud response, which just has the parsed body.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, body):
+        self.object = body
+
+
+class FakeConnection:
+    """
+    Fake libcloud GCE connection that lists "firewalls" in pages of two, and deletes them with
+    operations that are done on the second poll.  Operations on firewalls named in "failing" fail.
+    """
+    def __init__(self, firewalls, failing=()):
+        self.firewalls = list(firewalls)
+        self.failing = failing
+        self.requests = []
+        self.polls = {}
+
+    def request(self, path, method="GET", params=None):
+        """
+        Handle a list, delete, or operation poll.
+        """
+        self.requests.append((method, path))
+        if path == "/global/firewalls" and method == "GET":
+            start = int((params or {}).get("pageToken", 0))
+            body = {"items": self.firewalls[start:start + 2]}
+            if start + 2 < len(self.firewalls):
+                body["nextPageToken"] = str(start + 2)
+            return FakeResponse(body)
+        if method == "DELETE":
+            name = path.split("/")[-1]
+            self.firewalls = [firewall for firewall in self.firewalls if firewall["name"] != name]
+            return FakeResponse({"selfLink": "/operations/%s" % name, "status": "RUNNING",
+                                 "targetLink": path})
+        assert path.startswith("/operations/") and method == "GET"
+        self.polls[path] = self.polls.get(path, 0) + 1
+        body = {"selfLink": path, "targetLink": path, "status": "RUNNING"}
+        if self.polls[path] > 1:
+            body["status"] = "DONE"
+            if path.split("/")[-1] in self.failing:
+                body["error"] = {"errors": [{"message": "Failed"}]}
+        return FakeResponse(body)
+
+
+class FakeDriver:
+    """
+    Fake libcloud GCE driver, which only has the raw connection.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, connection):
+        self.connection = connection
+
+
+def get_firewalls(get_gce_driver, connection):
+    """
+    Returns a `Firewalls` that makes its calls on "connection", given the patched
+    "get_gce_driver".
+    """
+    get_gce_driver.return_value = FakeDriver(connection)
+    return Firewalls({"user_id": "user", "key": "key", "project": "firewalls-test"})
+
+
+@patch('cloudless.providers.gce.driver.get_gce_driver')
+def test_firewalls_by_tag(get_gce_driver):
+    """
+    Test that the index has every firewall under each of its source and target tags, across pages.
+    """
+    firewalls = get_firewalls(get_gce_driver, FakeConnection(FIREWALLS))
+    index = firewalls.firewalls_by_tag()
+    assert [firewall["name"] for firewall in index["net-web"]] == ["web-from-lb", "db-from-web"]
+    assert [firewall["name"] for firewall in index["net-lb"]] == ["web-from-lb",
+                                                                  "lb-from-internet"]
+    assert [firewall["name"] for firewall in index["net-db"]] == ["db-from-web"]
+    assert "0.0.0.0/0" not in index
+
+
+# Don't wait between polls of the fake operations.
+# pylint:disable=unused-argument
+@patch('cloudless.providers.gce.driver.get_gce_driver')
+@patch('cloudless.providers.gce.impl.api.time.sleep')
+def test_delete_firewalls_by_tag(sleep, get_gce_driver):
+    """
+    Test that every firewall referencing the tags is deleted exactly once, with one listing, and
+    that the index is kept up to date for the next call.
+    """
+    connection = FakeConnection(FIREWALLS)
+    firewalls = get_firewalls(get_gce_driver, connection)
+    index = firewalls.firewalls_by_tag()
+    listing_requests = len(connection.requests)
+
+    deleted = firewalls.delete_firewalls(["net-lb", "net-web"], index)
+    assert sorted(deleted) == ["db-from-web", "lb-from-internet", "web-from-lb"]
+    deletes = [path for method, path in connection.requests if method == "DELETE"]
+    assert sorted(deletes) == ["/global/firewalls/db-from-web",
+                               "/global/firewalls/lb-from-internet",
+                               "/global/firewalls/web-from-lb"]
+    # The index was reused rather than listing firewalls again.
+    assert ("GET", "/global/firewalls") not in connection.requests[listing_requests:]
+    assert all(connection.polls[path] == 2 for path in connection.polls)
+    assert [firewall["name"] for firewall in connection.firewalls] == ["other"]
+    assert not index["net-db"]
+
+    assert firewalls.delete_firewalls(["net-db"], index) == []
+    firewalls.delete_firewall("other", "a")
+    assert not connection.firewalls
+
+
+@patch('cloudless.providers.gce.driver.get_gce_driver')
+@patch('cloudless.providers.gce.impl.api.time.sleep')
+def test_delete_firewalls_failure(sleep, get_gce_driver):
+    """
+    Test that a failed delete operation raises an exception.
+    """
+    firewalls = get_firewalls(get_gce_driver, FakeConnection(FIREWALLS, failing=["db-from-web"]))
+    with pytest.raises(BadEnvironmentStateException, match="db-from-web"):
+        firewalls.delete_firewalls(["net-db"])
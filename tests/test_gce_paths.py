@@ -0,0 +1,102 @@
+"""
+Test listing the paths for a single GCE service, with the raw API stubbed out.
+"""
+from unittest.mock import patch
+
+from cloudless.providers.gce.paths import PathsClient
+from cloudless.types.common import Network, Service, Subnetwork
+from cloudless.types.networking import CidrBlock
+
+NETWORK_URL = "https://www.googleapis.com/compute/v1/projects/paths-test/global/networks/dev"
+REGION_URL = "https://www.googleapis.com/compute/v1/projects/paths-test/regions/us-east1"
+
+FIREWALLS = [
+    {"name": "web-from-lb", "sourceTags": ["dev-lb"], "targetTags": ["dev-web"],
+     "allowed": [{"IPProtocol": "tcp", "ports": ["80"]}]},
+    {"name": "db-from-web", "sourceTags": ["dev-web"], "targetTags": ["dev-db"],
+     "allowed": [{"IPProtocol": "tcp", "ports": ["5432"]}]},
+    {"name": "web-from-office", "sourceRanges": ["203.0.113.0/24"], "targetTags": ["dev-web"],
+     "allowed": [{"IPProtocol": "tcp", "ports": ["22"]}]},
+    {"name": "other", "sourceTags": ["dev-lb"], "targetTags": ["dev-db"],
+     "allowed": [{"IPProtocol": "tcp", "ports": ["5432"]}]},
+]
+
+SUBNETWORKS = [
+    {"id": "1", "name": "dev-lb", "ipCidrRange": "10.0.1.0/28", "network": NETWORK_URL,
+     "region": REGION_URL},
+    {"id": "2", "name": "dev-web", "ipCidrRange": "10.0.2.0/28", "network": NETWORK_URL,
+     "region": REGION_URL},
+    {"id": "3", "name": "dev-db", "ipCidrRange": "10.0.3.0/28", "network": NETWORK_URL,
+     "region": REGION_URL},
+]
+
+
+class FakeResponse:
+    """
+    A libcloud response, which just has the parsed body.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, body):
+        self.object = body
+
+
+class FakeConnection:
+    """
+    Fake libcloud GCE connection that lists the firewalls and subnetworks of one network.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        self.requests = []
+
+    def request(self, path, method="GET", params=None):
+        """
+        Handle a firewall or aggregated subnetwork list.
+        """
+        self.requests.append((method, path, (params or {}).get("filter")))
+        if path == "/global/firewalls":
+            return FakeResponse({"items": FIREWALLS})
+        assert path == "/aggregated/subnetworks"
+        return FakeResponse({"items": {"regions/us-east1": {"subnetworks": SUBNETWORKS}}})
+
+
+class FakeDriver:
+    """
+    Fake libcloud GCE driver, which only has the raw connection.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, connection):
+        self.connection = connection
+
+
+@patch('cloudless.providers.gce.driver.get_gce_driver')
+def test_list_for(get_gce_driver):
+    """
+    Test that the services on the other end of each path have their subnetworks, so CIDR blocks
+    inside them are matched the same way as with a full listing, and that the subnetworks are
+    only listed once.
+    """
+    connection = FakeConnection()
+    get_gce_driver.return_value = FakeDriver(connection)
+    paths = PathsClient({"user_id": "user", "key": "key", "project": "paths-test"})
+    dev = Network(name="dev", network_id="dev-id")
+    web = Service(network=dev, name="web", subnetworks=[
+        Subnetwork(subnetwork_id="2", name="dev-web", cidr_block="10.0.2.0/28",
+                   region="us-east1", availability_zone=None, instances=[])])
+
+    found = {(path.source.name, path.destination.name, path.port): path
+             for path in paths.list_for(web)}
+    assert sorted(found, key=str) == sorted([("lb", "web", "80"), ("web", "db", "5432"),
+                                             (None, "web", "22")], key=str)
+    assert found[("web", "db", "5432")].source is web
+    assert [subnetwork.cidr_block for subnetwork in found[("lb", "web", "80")].source.subnetworks] \
+        == ["10.0.1.0/28"]
+    assert [subnetwork.cidr_block
+            for subnetwork in found[("web", "db", "5432")].destination.subnetworks] \
+        == ["10.0.3.0/28"]
+    assert [request[1] for request in connection.requests] == ["/global/firewalls",
+                                                                "/aggregated/subnetworks"]
+    assert all("dev" in request[2] for request in connection.requests)
+
+    assert paths.has_access(CidrBlock("10.0.1.0/28"), web, 80)
+    assert paths.has_access(CidrBlock("203.0.113.5/32"), web, 22)
+    assert not paths.has_access(CidrBlock("10.0.3.0/28"), web, 80)
@@ -0,0 +1,85 @@
+"""
+Test exporting networks, services and paths as a graph.
+"""
+import io
+import json
+from cloudless.types.common import Network, Service, Subnetwork, Path
+from cloudless.util import graph_export
+
+EXPECTED_DOT = """digraph services {
+
+subgraph cluster_0 {
+    label = "dev";
+    "web-lb (dev)";
+    "web (dev)";
+
+}
+"web-lb (dev)" -> "web (dev)" [ label="(tcp:80)" ];
+"0.0.0.0/0 (external)" -> "web-lb (dev)" [ label="(tcp:443)" ];
+subgraph cluster_1 {
+    label = "empty";
+    "Empty Network (empty)";
+
+}
+
+}
+"""
+
+
+def make_inventory():
+    """
+    Returns networks, services and paths for a network with a load balancer in front of a web
+    service, and an empty network.
+    """
+    dev = Network(name="dev", network_id="dev-id")
+    empty = Network(name="empty", network_id="empty-id")
+    unnamed = Network(name=None, network_id="unnamed-id")
+    web_lb = Service(network=dev, name="web-lb", subnetworks=[])
+    web = Service(network=dev, name="web", subnetworks=[])
+    internet = Service(network=None, name=None, subnetworks=[
+        Subnetwork(subnetwork_id=None, name=None, cidr_block="0.0.0.0/0", region=None,
+                   availability_zone=None, instances=[])])
+    paths = [Path(dev, web_lb, web, "tcp", 80), Path(dev, internet, web_lb, "tcp", 443)]
+    return [dev, unnamed, empty], [web_lb, web], paths
+
+
+def test_write_dot():
+    """
+    Test that the DOT output has a cluster per network and an edge per path.
+    """
+    out = io.StringIO()
+    graph_export.write_dot(out, *make_inventory())
+    assert out.getvalue() == EXPECTED_DOT
+
+
+def test_write_json():
+    """
+    Test that the JSON output has every node and the paths leaving each node.
+    """
+    out = io.StringIO()
+    graph_export.write_json(out, *make_inventory())
+    graph = json.loads(out.getvalue())
+    assert graph["networks"] == ["dev", "empty"]
+    assert graph["nodes"] == [{"id": "web-lb (dev)", "name": "web-lb", "network": "dev"},
+                              {"id": "web (dev)", "name": "web", "network": "dev"}]
+    assert graph["adjacency"] == {
+        "web-lb (dev)": [{"destination": "web (dev)", "protocol": "tcp", "port": 80}],
+        "0.0.0.0/0 (external)": [{"destination": "web-lb (dev)", "protocol": "tcp", "port": 443}]}
+
+    out = io.StringIO()
+    graph_export.write_json(out, [], [], [])
+    assert json.loads(out.getvalue()) == {"networks": [], "nodes": [], "adjacency": {}}
+
+
+def test_write_from_iterators():
+    """
+    Test that the networks and paths can be iterators that are only read once, like the ones the
+    provider clients return.
+    """
+    networks, services, paths = make_inventory()
+    for write_graph in [graph_export.write_dot, graph_export.write_json]:
+        expected = io.StringIO()
+        write_graph(expected, networks, services, paths)
+        out = io.StringIO()
+        write_graph(out, iter(networks), services, iter(paths))
+        assert out.getvalue() == expected.getvalue()
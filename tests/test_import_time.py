@@ -0,0 +1,118 @@
+"""
+Regression tests for how long it takes to import cloudless.
+
+Each import runs in a fresh interpreter, since modules imported by other tests would otherwise
+already be cached.
+"""
+import os
+import subprocess
+import sys
+import time
+
+# In seconds.  These are generous so they aren't flaky on slow machines, but they're still low
+# enough to catch an expensive import being added to the startup path.
+IMPORT_TIME_BUDGET = 0.5
+CLI_IMPORT_TIME_BUDGET = 3.0
+CLI_HELP_TIME_BUDGET = 1.5
+CLI_NETWORK_LIST_TIME_BUDGET = 5.0
+
+
+def import_time(module):
+    """
+    Returns the best of three times to import "module" in a new interpreter.
+    """
+    code = ("import time; start = time.perf_counter(); import %s; "
+            "print(time.perf_counter() - start)" % module)
+    return min(float(subprocess.check_output([sys.executable, "-c", code]))
+               for _ in range(3))
+
+
+def loaded_modules(statement):
+    """
+    Returns the names of all the modules loaded after running "statement" in a new interpreter.
+    """
+    code = "import sys; %s; print(' '.join(sys.modules))" % statement
+    return set(subprocess.check_output([sys.executable, "-c", code]).decode().split())
+
+
+def cli_time(args, env=None):
+    """
+    Returns the best of three times to run the command line with "args" in a new interpreter.
+    """
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.check_output([sys.executable, "-m", "cloudless.cli.main"] + args, env=env)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_import_time():
+    """
+    Test that importing the library and the command line entry point stays under budget.
+    """
+    assert import_time("cloudless") < IMPORT_TIME_BUDGET
+    assert import_time("cloudless.cli.main") < CLI_IMPORT_TIME_BUDGET
+
+
+def test_providers_load_lazily():
+    """
+    Test that provider libraries are only loaded for the provider that's actually used.
+    """
+    modules = loaded_modules("import cloudless")
+    assert "boto3" not in modules
+    assert "moto" not in modules
+    assert "libcloud" not in modules
+    modules = loaded_modules("from cloudless.providers import get_provider; "
+                             "get_provider('mock-aws')")
+    assert "moto" in modules
+    assert "libcloud" not in modules
+
+
+def test_schemas_load_lazily():
+    """
+    Test that resource schemas and the libraries to read them aren't loaded until they're used.
+    """
+    modules = loaded_modules("import cloudless.types.common")
+    assert "jsonref" not in modules
+    assert "jsonschema" not in modules
+    modules = loaded_modules("from cloudless.types.common import NetworkModel; "
+                             "NetworkModel.fromdict({'name': 'network', 'version': '0.0.0'})")
+    assert "jsonref" in modules
+    assert "jsonschema" in modules
+
+
+def test_cli_startup_time(tmpdir):
+    """
+    Test that the command line only loads the subcommand that's used, and stays under budget.
+    """
+    assert cli_time(["--help"]) < CLI_HELP_TIME_BUDGET
+    modules = loaded_modules("from cloudless.cli.cldls import get_cldls; "
+                             "from click.testing import CliRunner; "
+                             "CliRunner().invoke(get_cldls(), ['--help'])")
+    assert "cloudless.cli.service_test" not in modules
+    assert "paramiko" not in modules
+    assert "click_repl" not in modules
+
+    # Completing a subcommand name lists every subcommand without importing them.
+    completion = ("from cloudless.cli.cldls import get_cldls; "
+                  "from click._bashcomplete import get_choices; "
+                  "choices = [choice for choice, _ in get_choices(get_cldls(), 'cldls', %s, '')]; "
+                  "assert %s in choices, choices")
+    modules = loaded_modules(completion % ([], "'service-test'"))
+    assert "cloudless.cli.service_test" not in modules
+    assert "paramiko" not in modules
+    assert "boto3" not in modules
+    assert "libcloud" not in modules
+    modules = loaded_modules(completion % (["network"], "'list'"))
+    assert "cloudless.cli.network" in modules
+    assert "cloudless.cli.service_test" not in modules
+
+    # Use a temporary home directory with a profile for the mock provider.
+    config_dir = tmpdir.mkdir(".cloudless")
+    config_dir.join("config.yml").write(
+        "default:\n  provider: mock-aws\n  credentials: {}\n")
+    env = dict(os.environ, HOME=str(tmpdir))
+    env.pop("CLOUDLESS_PROFILE", None)
+    env.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    assert cli_time(["network", "list"], env) < CLI_NETWORK_LIST_TIME_BUDGET
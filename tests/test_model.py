@@ -2,7 +2,10 @@
 Tests for model management.
 """
 import pytest
+from jsonschema.exceptions import ValidationError
 import cloudless
+from cloudless.providers import get_provider
+from cloudless.model import PLAN_CREATE, PLAN_DELETE, PLAN_NOOP, PLAN_CONFLICT, PLAN_UPDATE
 from cloudless.testutils.blueprint_tester import generate_unique_name
 from cloudless.types.common import Firewall, NetworkModel, ImageModel, SubnetModel
 
@@ -121,6 +124,93 @@ def run_subnet_model_test(profile=None, provider=None, credentials=None):
     network_get = client.model.get("Network", network)
     assert not network_get
 
+def run_plan_model_test(profile=None, provider=None, credentials=None):
+    """
+    Test planning model operations on the given provider.
+    """
+    client = cloudless.Client(profile, provider, credentials)
+
+    # Get a unique "namespace" for testing
+    network_name = generate_unique_name("network")
+
+    # Create our models
+    network_dict = {"name": network_name, "version": "0.0.0"}
+    network = NetworkModel.fromdict(network_dict)
+    firewall = Firewall.fromdict({"name": network_name, "version": "0.0.0",
+                                  "network": {"name": network.name}})
+
+    # Count the reads that go to the provider, to make sure planning shares them
+    network_driver = client.model.resource_types["Network"]
+    original_get = network_driver.get
+    reads = []
+    def counting_get(resource_definition):
+        reads.append(resource_definition)
+        return original_get(resource_definition)
+    network_driver.get = counting_get
+
+    try:
+        # Nothing exists yet, so everything would be created
+        plan = client.model.plan([("create", "Network", network),
+                                  ("apply", "Firewall", firewall),
+                                  ("delete", "Network", network)])
+        assert [item.action for item in plan.items] == [PLAN_CREATE, PLAN_CREATE, PLAN_NOOP]
+        assert plan.has_changes()
+        assert plan.summary() == {PLAN_CREATE: 2, PLAN_NOOP: 1}
+        assert client.model.create("Network", network, plan=True).action == PLAN_CREATE
+        assert not client.model.get("Network", network, plan=True)
+        assert len(reads) == 1
+        assert not client.model.get("Network", network)
+
+        # Now create it and make sure the plan sees the new state
+        client.model.create("Network", network)
+        assert client.model.create("Network", network, plan=True).action == PLAN_CONFLICT
+        assert client.model.apply("Network", network, plan=True).action == PLAN_NOOP
+        update = client.model.apply("Network", NetworkModel.fromdict(
+            {"name": network_name, "version": "0.0.0", "cidr_block": "192.168.0.0/16"}),
+                                    plan=True)
+        assert update.action == PLAN_UPDATE
+        assert list(update.changes) == ["cidr_block"]
+        assert update.changes["cidr_block"][1] == "192.168.0.0/16"
+        delete = client.model.delete("Network", network, plan=True)
+        assert delete.action == PLAN_DELETE
+        assert delete.current[0].name == network_name
+    finally:
+        network_driver.get = original_get
+
+    # Clean up the network
+    client.model.delete("Network", network)
+    assert client.model.delete("Network", network, plan=True).action == PLAN_NOOP
+
+def test_resource_fromdicts():
+    """
+    Test loading many resources at once, and that invalid resources are rejected.
+    """
+    networks = NetworkModel.fromdicts([{"name": "first", "version": "0.0.0"},
+                                       {"name": "second", "version": "0.0.0",
+                                        "cidr_block": "10.0.0.0/16"}])
+    assert [network.name for network in networks] == ["first", "second"]
+    assert networks[1] == NetworkModel.fromdict({"name": "second", "version": "0.0.0",
+                                                 "cidr_block": "10.0.0.0/16"})
+    assert NetworkModel.validator() is NetworkModel.validator()
+    assert Firewall.validator() is not NetworkModel.validator()
+    with pytest.raises(ValidationError):
+        NetworkModel.fromdicts([{"name": "first", "version": "0.0.0"}, {"name": "second"}])
+    with pytest.raises(ValidationError):
+        NetworkModel.fromdict({"name": "first", "version": "0.0.0", "unknown": "field"})
+
+@pytest.mark.mock_aws
+def test_models_are_independent():
+    """
+    Test that models for different providers don't replace each other's drivers, and that they
+    share parsed schemas.
+    """
+    mock_aws_model = get_provider("mock-aws").model.get_model({})
+    gce_model = get_provider("gce").model.get_model({})
+    assert "Network" in mock_aws_model.resources()
+    assert "Network" not in gce_model.resources()
+    assert mock_aws_model.resource_types["Firewall"] is not gce_model.resource_types["Firewall"]
+    assert mock_aws_model.resource_schemas["Firewall"] is gce_model.resource_schemas["Firewall"]
+
 @pytest.mark.mock_aws
 def test_firewall_model_mock():
     """
@@ -142,6 +232,13 @@ def test_subnet_model_mock():
     """
     run_subnet_model_test(provider="mock-aws", credentials={})
 
+@pytest.mark.mock_aws
+def test_plan_model_mock():
+    """
+    Run tests using the mock aws driver (moto).
+    """
+    run_plan_model_test(provider="mock-aws", credentials={})
+
 # Disabling anything besides mock AWS as this API is still in flux
 #@pytest.mark.aws
 #def test_firewall_model_aws():
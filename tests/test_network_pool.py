@@ -0,0 +1,108 @@
+"""
+Tests for the pool of test networks.
+"""
+import os
+from unittest.mock import patch
+import pytest
+import cloudless
+
+from cloudless.testutils.blueprint_tester import run_all
+from cloudless.testutils.network_pool import NetworkPool
+from cloudless.util.exceptions import DisallowedOperationException
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
+AWS_SERVICE_BLUEPRINT = os.path.join(EXAMPLES_DIR, "base-image", "aws_blueprint.yml")
+BLUEPRINT_DIR = os.path.join(os.path.dirname(__file__), "blueprint_tester_fixture")
+BLUEPRINT_TEST_CONFIGURATION = os.path.join(BLUEPRINT_DIR, "blueprint-test-configuration.yml")
+
+
+@pytest.mark.mock_aws
+def test_network_pool_mock(tmpdir):
+    """
+    Test leasing, releasing, and reclaiming pooled networks against moto (mock aws).
+    """
+    client = cloudless.Client(provider="mock-aws", credentials={})
+    pool = NetworkPool(client, str(tmpdir))
+    pool.fill(2)
+    assert list(pool.list().values()) == [None, None]
+
+    # Free networks are leased before new ones are created.
+    first, first_token = pool.lease()
+    second, second_token = pool.lease()
+    assert {first.name, second.name} == set(pool.list())
+    third, third_token = pool.lease()
+    assert len(pool.list()) == 3
+    assert all(pool.list().values())
+
+    # Releasing removes the services but keeps the network.
+    client.service.create(first, "pooled", AWS_SERVICE_BLUEPRINT)
+    pool.release(first.name, first_token)
+    assert client.network.get(first.name)
+    assert not [service for service in client.service.list()
+                if service.network.name == first.name]
+    assert pool.list()[first.name] is None
+    first_again, first_token = pool.lease()
+    assert first_again.name == first.name
+
+    pool.renew(first.name, first_token)
+
+    # Networks destroyed outside the pool are dropped from it.
+    pool.release(first.name, first_token)
+    client.network.destroy(first)
+    fourth, fourth_token = pool.lease()
+    assert fourth.name != first.name
+    assert first.name not in pool.list()
+
+    # Expired leases are reclaimed, along with anything left in the network.
+    expiring_pool = NetworkPool(client, str(tmpdir), lease_duration=0)
+    for network, token in [(second, second_token), (third, third_token),
+                           (fourth, fourth_token)]:
+        pool.release(network.name, token)
+    leased, stale_token = expiring_pool.lease()
+    client.service.create(leased, "abandoned", AWS_SERVICE_BLUEPRINT)
+    reclaimed, reclaimed_token = pool.lease()
+    assert reclaimed.name == leased.name
+    assert not [service for service in client.service.list()
+                if service.network.name == leased.name]
+
+    # The holder of the expired lease can't renew or release the network out from under its new
+    # holder, and its release doesn't touch the new holder's services.
+    client.service.create(reclaimed, "reclaimed", AWS_SERVICE_BLUEPRINT)
+    with pytest.raises(DisallowedOperationException):
+        pool.renew(leased.name, stale_token)
+    with pytest.raises(DisallowedOperationException):
+        pool.release(leased.name, stale_token)
+    assert [service.name for service in client.service.list()
+            if service.network.name == reclaimed.name] == ["reclaimed"]
+    assert pool.list()[reclaimed.name]
+    pool.release(reclaimed.name, reclaimed_token)
+
+    assert sorted(expiring_pool.drain()) == sorted([second.name, third.name, fourth.name])
+    assert not pool.list()
+    assert not client.network.get(second.name)
+
+    # Expired leases can't be renewed, since someone else may have reclaimed the network.
+    expired, expired_token = expiring_pool.lease()
+    with pytest.raises(DisallowedOperationException):
+        pool.renew(expired.name, expired_token)
+    with pytest.raises(DisallowedOperationException):
+        pool.renew("missing", expired_token)
+    assert pool.drain() == [expired.name]
+
+
+@pytest.mark.mock_aws
+def test_blueprint_tester_network_pool_mock(tmpdir):
+    """
+    Test that the blueprint tester gives its network back to the pool instead of destroying it.
+    """
+    client = cloudless.Client(provider="mock-aws", credentials={})
+    pool = NetworkPool(client, str(tmpdir.join("pool")))
+    pool.fill(1)
+    network_name = list(pool.list())[0]
+    with patch.dict(os.environ, {"CLOUDLESS_TEST_NETWORK_POOL": str(tmpdir.join("pool"))}):
+        run_all(client, BLUEPRINT_TEST_CONFIGURATION, str(tmpdir.join("state")))
+    assert pool.list() == {network_name: None}
+    assert client.network.get(network_name)
+    assert not [service for service in client.service.list()
+                if service.network.name == network_name]
+    pool.drain()
@@ -5,6 +5,7 @@ import os
 import pytest
 import cloudless
 from cloudless.types.common import Path
+from cloudless.types.snapshot import Snapshot
 from cloudless.testutils.blueprint_tester import generate_unique_name
 
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
@@ -46,6 +47,27 @@ def run_paths_test(profile=None, provider=None, credentials=None):
         assert isinstance(path, Path)
     client.graph()
 
+    all_paths = client.paths.list()
+    for service in [lb_service, web_service]:
+        expected_keys = {path.key for path in all_paths
+                         if service.key in (path.source_key, path.destination_key)}
+        assert {path.key for path in client.paths.list_for(service)} == expected_keys
+    assert len(client.paths.list_for(lb_service)) == 2
+
+    # Iterating returns the same things as listing, just without waiting for all of them.
+    assert [path.key for path in client.paths.iterate()] == [path.key for path in all_paths]
+    assert [service.key for service in client.service.iterate()] == [
+        service.key for service in client.service.list()]
+    assert [network.key for network in client.network.iterate()] == [
+        network.key for network in client.network.list()]
+
+    snapshot = client.snapshot()
+    assert client.graph(snapshot=snapshot) == client.graph()
+    assert client.service.get(test_network, "web", snapshot=snapshot).name == "web"
+    assert len(client.paths.list(snapshot=snapshot)) == len(client.paths.list())
+    assert len(snapshot.paths_for(web_service)) == 1
+    assert Snapshot.from_json(snapshot.to_json()) == snapshot
+
     assert client.paths.has_access(lb_service, web_service, 80)
     assert client.paths.internet_accessible(lb_service, 80)
 
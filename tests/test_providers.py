@@ -0,0 +1,36 @@
+"""
+Test the registry of providers.
+"""
+from unittest.mock import patch, MagicMock
+import pytest
+import cloudless.providers
+from cloudless.providers import get_provider, list_providers
+
+
+def test_builtin_providers():
+    """
+    Test that the builtin providers are available and only loaded once.
+    """
+    assert {"aws", "mock-aws", "gce"} <= set(list_providers())
+    assert get_provider("mock-aws") is get_provider("mock-aws")
+    assert get_provider("mock-aws").__name__ == "cloudless.providers.aws_mock"
+
+
+@patch('cloudless.providers._provider_entry_points')
+def test_entry_point_providers(provider_entry_points):
+    """
+    Test that providers registered by other packages are loaded through their entry points.
+    """
+    plugin_provider = MagicMock()
+    entry_point = MagicMock()
+    entry_point.load.return_value = plugin_provider
+    provider_entry_points.return_value = {"test-plugin-provider": entry_point}
+    try:
+        assert "test-plugin-provider" in list_providers()
+        assert get_provider("test-plugin-provider") is plugin_provider
+        assert get_provider("test-plugin-provider") is plugin_provider
+        assert entry_point.load.call_count == 1
+        with pytest.raises(NotImplementedError):
+            get_provider("does-not-exist")
+    finally:
+        cloudless.providers.LOADED_PROVIDERS.pop("test-plugin-provider", None)
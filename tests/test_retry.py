@@ -0,0 +1,114 @@
+"""
+Tests for retrying checks until a deadline.
+"""
+import time
+import pytest
+
+from cloudless.testutils.blueprint_tester import call_with_retries
+from cloudless.testutils.retry import retry_until, RetryReport
+
+
+class FailingCheck:
+    """
+    A check that raises "exception" until it's been called "failures" times.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, failures, exception=AssertionError):
+        self.failures = failures
+        self.exception = exception
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exception("Not yet")
+        return "done"
+
+
+def test_retry_until_backs_off():
+    """
+    Test that retries start fast, back off exponentially, and stop as soon as the check passes.
+    """
+    report = RetryReport()
+    check = FailingCheck(failures=3)
+    assert retry_until(check, timeout=10, initial_delay=0.01, max_delay=0.03, report=report) == (
+        "done")
+    assert report.succeeded
+    assert report.attempts == 4
+    assert report.slept == pytest.approx(0.01 + 0.02 + 0.03)
+    assert report.elapsed < 1.0
+
+
+def test_retry_until_deadline():
+    """
+    Test that the last exception is raised once the deadline has passed, without sleeping past it.
+    """
+    report = RetryReport()
+    start = time.time()
+    with pytest.raises(AssertionError, match="Not yet"):
+        retry_until(FailingCheck(failures=1000), timeout=0.2, initial_delay=0.05, report=report)
+    assert 0.2 <= time.time() - start < 0.5
+    assert not report.succeeded
+    assert report.attempts > 1
+    assert isinstance(report.last_exception, AssertionError)
+
+
+def test_retry_until_classifies_exceptions():
+    """
+    Test that only retryable exceptions are retried.
+    """
+    check = FailingCheck(failures=1, exception=KeyError)
+    with pytest.raises(KeyError):
+        retry_until(check, timeout=10, initial_delay=0.01)
+    assert check.calls == 1
+
+    check = FailingCheck(failures=1, exception=ConnectionError)
+    assert retry_until(check, timeout=10, initial_delay=0.01) == "done"
+
+    check = FailingCheck(failures=1, exception=KeyError)
+    assert retry_until(check, timeout=10, initial_delay=0.01,
+                       retryable=lambda exception: isinstance(exception, KeyError)) == "done"
+
+
+def test_call_with_retries():
+    """
+    Test that the fixture helper returns as soon as the check passes, rather than after a full
+    retry delay.
+    """
+    check = FailingCheck(failures=1, exception=KeyError)
+    start = time.time()
+    assert call_with_retries(check, 6, 10.0) == "done"
+    assert time.time() - start < 2.0
+    with pytest.raises(AssertionError):
+        call_with_retries(FailingCheck(failures=1000), 2, 0.1)
+
+
+class SlowCheck(FailingCheck):
+    """
+    A failing check that takes "duration" seconds to run, like a request that hangs until it times
+    out.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, failures, duration):
+        FailingCheck.__init__(self, failures)
+        self.duration = duration
+
+    def __call__(self):
+        time.sleep(self.duration)
+        return FailingCheck.__call__(self)
+
+
+def test_call_with_retries_slow_check():
+    """
+    Test that a check that uses up the whole deadline in one call still gets "retry_count" + 1
+    attempts.
+    """
+    check = SlowCheck(failures=2, duration=0.3)
+    assert call_with_retries(check, 2, 0.1) == "done"
+    assert check.calls == 3
+
+    report = RetryReport()
+    with pytest.raises(AssertionError):
+        retry_until(SlowCheck(failures=1000, duration=0.1), timeout=0.05, initial_delay=0.01,
+                    min_attempts=4, report=report)
+    assert report.attempts == 4
@@ -164,6 +164,37 @@ def run_instances_test(profile=None, provider=None, credentials=None):
     # Clean up the VPC
     client.network.destroy(test_network)
 
+def run_destroy_many_test(profile=None, provider=None, credentials=None):
+    """
+    Test that destroying several services at once destroys all of them and nothing else.
+    """
+    client = cloudless.Client(profile, provider, credentials)
+    network_name = generate_unique_name("unittest")
+    test_network = client.network.create(network_name, blueprint=NETWORK_BLUEPRINT)
+    if client.provider in ["aws", "mock-aws"]:
+        service_blueprint = AWS_SERVICE_BLUEPRINT
+    else:
+        assert client.provider == "gce"
+        service_blueprint = GCE_SERVICE_BLUEPRINT
+    services = [client.service.create(test_network, name, service_blueprint, {})
+                for name in ["web-lb", "web", "db"]]
+    client.paths.add(services[0], services[1], 80)
+
+    assert len(client.service.destroy_many(services[:2])) == 2
+    assert not client.service.get(test_network, "web-lb")
+    assert not client.service.get(test_network, "web")
+    assert client.service.get(test_network, "db")
+
+    if client.provider in ["mock-aws"]:
+        autoscaling = boto3.client("autoscaling")
+        asgs = autoscaling.describe_auto_scaling_groups(
+            AutoScalingGroupNames=["%s.web" % network_name, "%s.web-lb" % network_name])
+        assert not asgs["AutoScalingGroups"]
+
+    assert len(client.service.destroy_many(services[2:])) == 1
+    assert not client.service.get(test_network, "db")
+    client.network.destroy(test_network)
+
 # Despite the fact that the mock-aws provider uses moto, we must also annotate it here since the
 # test uses the AWS client directly to verify that things were created as expected.
 @mock_ec2
@@ -190,3 +221,28 @@ def test_instances_gce():
     Run tests against real GCE (environment variables below must be set).
     """
     run_instances_test(profile="gce-cloudless-test")
+
+@mock_ec2
+@mock_elb
+@mock_autoscaling
+@mock_route53
+@pytest.mark.mock_aws
+def test_destroy_many_mock():
+    """
+    Run destroy_many tests using the mock aws driver (moto).
+    """
+    run_destroy_many_test(provider="mock-aws", credentials={})
+
+@pytest.mark.aws
+def test_destroy_many_aws():
+    """
+    Run destroy_many tests against real AWS (using global configuration).
+    """
+    run_destroy_many_test(profile="aws-cloudless-test")
+
+@pytest.mark.gce
+def test_destroy_many_gce():
+    """
+    Run destroy_many tests against real GCE (environment variables below must be set).
+    """
+    run_destroy_many_test(profile="gce-cloudless-test")
@@ -0,0 +1,60 @@
+"""
+Test inventory snapshots.
+"""
+import io
+from cloudless.types.common import Network, Service, Subnetwork, Instance, Path
+from cloudless.types.frozen import FrozenService
+from cloudless.types.snapshot import Snapshot
+
+
+def make_snapshot():
+    """
+    Returns a snapshot of a network with a load balancer in front of a web service.
+    """
+    dev = Network(name="dev", network_id="dev-id", cidr_block="10.0.0.0/16")
+    web_lb = Service(network=dev, name="web-lb", subnetworks=[
+        Subnetwork(subnetwork_id="lb-subnet", name="dev-web-lb", cidr_block="10.0.0.0/24",
+                   region="us-east-1", availability_zone="us-east-1a", instances=[
+                       Instance(instance_id="i-1", public_ip="1.2.3.4", private_ip="10.0.0.4",
+                                state="running", availability_zone="us-east-1a")])])
+    web = Service(network=Network(name="dev", network_id="dev-id", cidr_block="10.0.0.0/16"),
+                  name="web", subnetworks=[])
+    internet = Service(network=None, name=None, subnetworks=[
+        Subnetwork(subnetwork_id=None, name=None, cidr_block="0.0.0.0/0", region=None,
+                   availability_zone=None, instances=[])])
+    paths = [Path(dev, web_lb, web, "tcp", 80), Path(dev, internet, web_lb, "tcp", 443)]
+    return Snapshot.create("mock-aws", [dev], [web_lb, web], paths)
+
+
+def test_snapshot():
+    """
+    Test that a snapshot is frozen, shares networks, and can look up services and paths.
+    """
+    snapshot = make_snapshot()
+    assert all(isinstance(service, FrozenService) for service in snapshot.services)
+    assert snapshot.services[0].network is snapshot.services[1].network
+    assert snapshot.network("dev") is snapshot.networks[0]
+    assert snapshot.network("prod") is None
+    web = snapshot.service("dev", "web")
+    assert web.name == "web"
+    assert snapshot.service("dev", "db") is None
+    assert [path.port for path in snapshot.paths_for(web)] == [80]
+    web_lb = snapshot.service("dev", "web-lb")
+    assert [path.port for path in snapshot.paths_for(web_lb)] == [80, 443]
+
+
+def test_snapshot_serialization():
+    """
+    Test that a snapshot can be saved and loaded as JSON.
+    """
+    snapshot = make_snapshot()
+    loaded = Snapshot.from_json(snapshot.to_json())
+    assert loaded == snapshot
+    assert loaded.to_dict() == snapshot.to_dict()
+    assert loaded.service("dev", "web-lb").subnetworks[0].instances[0].public_ip == "1.2.3.4"
+    assert loaded.paths[0].destination is loaded.service("dev", "web")
+
+    snapshot_file = io.StringIO()
+    snapshot.to_json(snapshot_file)
+    snapshot_file.seek(0)
+    assert Snapshot.from_json(snapshot_file) == snapshot
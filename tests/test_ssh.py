@@ -2,7 +2,8 @@
 Test for temporary SSH key setup.
 """
 import os
-from io import StringIO
+import threading
+from io import BytesIO, StringIO
 import pytest
 from moto import mock_ec2, mock_autoscaling, mock_elb, mock_route53
 import paramiko
@@ -10,7 +11,7 @@ import cloudless
 from cloudless.types.common import Service
 from cloudless.types.networking import CidrBlock
 from cloudless.testutils.blueprint_tester import generate_unique_name, call_with_retries
-from cloudless.testutils.ssh import generate_ssh_keypair
+from cloudless.testutils.ssh import generate_ssh_keypair, SSHExecutor
 
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "examples")
 NETWORK_BLUEPRINT = os.path.join(EXAMPLES_DIR, "network", "blueprint.yml")
@@ -120,3 +121,164 @@ def test_ssh_gce():
     Run tests against real GCE (environment variables below must be set).
     """
     run_ssh_test(profile="gce-cloudless-test")
+
+
+class FakeChannel:
+    """
+    The channel of a fake command, which hands out its output a chunk at a time, alternating
+    between standard output and standard error, and only exits once both have been read.
+    """
+    def __init__(self, exit_status, stdout, stderr):
+        self.exit_status = exit_status
+        self.stdout = BytesIO(stdout)
+        self.stderr = BytesIO(stderr)
+        self.remaining = {"stdout": len(stdout), "stderr": len(stderr)}
+
+    def _read(self, stream, nbytes):
+        data = getattr(self, stream).read(min(nbytes, 1024))
+        self.remaining[stream] -= len(data)
+        return data
+
+    def recv_ready(self):
+        """
+        Whether there's standard output to read.
+        """
+        return self.remaining["stdout"] > 0
+
+    def recv(self, nbytes):
+        """
+        Read a chunk of standard output.
+        """
+        return self._read("stdout", nbytes)
+
+    def recv_stderr_ready(self):
+        """
+        Whether there's standard error to read.
+        """
+        return self.remaining["stderr"] > 0
+
+    def recv_stderr(self, nbytes):
+        """
+        Read a chunk of standard error.
+        """
+        return self._read("stderr", nbytes)
+
+    def exit_status_ready(self):
+        """
+        Like a real command, this can't exit until its output has been read.
+        """
+        return not any(self.remaining.values())
+
+    def recv_exit_status(self):
+        """
+        Return the exit status.
+        """
+        assert self.exit_status_ready()
+        return self.exit_status
+
+    def shutdown_write(self):
+        """
+        Nothing to do.
+        """
+
+
+class FakeFile(BytesIO):
+    """
+    One of the standard streams of a fake command.  Everything is read through the channel.
+    """
+    def __init__(self, channel):
+        BytesIO.__init__(self)
+        self.channel = channel
+
+
+class FakeSSHClient:
+    """
+    Fake paramiko client that "runs" commands by echoing them back.  Commands containing "fail"
+    exit with status 1, and commands containing "noisy" also write a lot to standard error.  If
+    "barrier" is set, every command waits on it, so commands only finish if enough of them are
+    running at the same time.
+    """
+    connections = []
+    barrier = None
+
+    def __init__(self):
+        self.hostname = None
+        self.closed = False
+        FakeSSHClient.connections.append(self)
+
+    def set_missing_host_key_policy(self, policy):
+        """
+        Nothing to do.
+        """
+
+    # pylint: disable=unused-argument
+    def connect(self, hostname, username, pkey, timeout):
+        """
+        Remember the host.
+        """
+        self.hostname = hostname
+
+    def get_transport(self):
+        """
+        Return something that's active while the connection is open.
+        """
+        return None if self.closed else self
+
+    def is_active(self):
+        """
+        Whether the connection is still open.
+        """
+        return not self.closed
+
+    def exec_command(self, command):
+        """
+        Wait for the other commands, then return the command and host as its output.
+        """
+        if FakeSSHClient.barrier:
+            FakeSSHClient.barrier.wait()
+        channel = FakeChannel(1 if "fail" in command else 0,
+                              ("%s on %s" % (command, self.hostname)).encode("utf-8"),
+                              b"e" * 100000 if "noisy" in command else b"")
+        return FakeFile(channel), FakeFile(channel), FakeFile(channel)
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self.closed = True
+
+
+def test_ssh_executor(tmpdir):
+    """
+    Test running commands on many hosts at once, reusing one connection per host.
+    """
+    private_key = tmpdir.join("id_rsa")
+    private_key.write(generate_ssh_keypair().private_key)
+    hosts = ["10.0.0.%s" % index for index in range(10)]
+    FakeSSHClient.connections = []
+    with SSHExecutor("cloudless", str(private_key), client_factory=FakeSSHClient) as ssh:
+        # Every command waits until all ten are running, so this only passes if they ran at the
+        # same time.  If they didn't, the barrier times out and breaks.
+        FakeSSHClient.barrier = threading.Barrier(len(hosts), timeout=30)
+        try:
+            results = ssh.run_all(hosts, "whoami")
+        finally:
+            FakeSSHClient.barrier = None
+        assert [result.stdout for result in results] == ["whoami on %s" % host for host in hosts]
+        assert all(result.succeeded and result.duration >= 0 for result in results)
+
+        # Standard error is read along with standard output, not after it.
+        result = ssh.run(hosts[0], "noisy")
+        assert result.stdout == "noisy on %s" % hosts[0]
+        assert result.stderr == "e" * 100000
+
+        ssh.check_all(hosts, "uptime")
+        with pytest.raises(Exception, match="failed on 10 of 10 hosts"):
+            ssh.check_all(hosts, "fail")
+        assert len(FakeSSHClient.connections) == 10
+
+        script = tmpdir.join("check")
+        script.write("#!/bin/bash\necho ok\n")
+        results = ssh.run_script(hosts[:1], str(script), ["an arg"])
+        assert results[0].command == "bash -s -- 'an arg'"
+    assert all(connection.closed for connection in FakeSSHClient.connections)
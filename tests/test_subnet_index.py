@@ -0,0 +1,32 @@
+"""
+Test index mapping IP addresses to the subnets that contain them.
+"""
+from cloudless.types.common import Subnetwork
+from cloudless.util.subnet_index import SubnetIndex
+
+
+def make_subnetwork(name, cidr_block):
+    """
+    Create a subnetwork with no instances.
+    """
+    return Subnetwork(subnetwork_id=name, name=name, cidr_block=cidr_block, region=None,
+                      availability_zone=None, instances=[])
+
+
+def test_subnet_index():
+    """
+    Test that addresses are mapped to the subnet containing them, and nothing otherwise.
+    """
+    first = make_subnetwork("first", "10.0.0.0/24")
+    second = make_subnetwork("second", "10.0.2.0/23")
+    third = make_subnetwork("third", "10.0.1.0/28")
+    subnet_index = SubnetIndex([first, second, third])
+    assert len(subnet_index) == 3
+    assert subnet_index.find("10.0.0.0") == first
+    assert subnet_index.find("10.0.0.255") == first
+    assert subnet_index.find("10.0.1.15") == third
+    assert subnet_index.find("10.0.1.16") is None
+    assert subnet_index.find("10.0.3.255") == second
+    assert subnet_index.find("10.0.4.0") is None
+    assert subnet_index.find("9.255.255.255") is None
+    assert subnet_index.find(None) is None